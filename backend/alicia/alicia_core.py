@@ -28,12 +28,13 @@ except ImportError:
 class AliciaCore:
     """Alicia의 완전 독립 AI 시스템"""
     
-    def __init__(self, neural_net, knowledge_db, multi_ai_client):
+    def __init__(self, neural_net, knowledge_db, multi_ai_client, persistence=None):
         print("\n🌟 Alicia Core 초기화 (완전 독립 모드)")
         
         self.neural_net = neural_net
         self.knowledge_db = knowledge_db
         self.multi_ai = multi_ai_client
+        self.persistence = persistence  # WriteBehindFlusher (없으면 즉시 저장)
         
         # Alicia 상태
         self.consciousness_level = 0.8
@@ -163,8 +164,7 @@ class AliciaCore:
                 print(f"   ✨ 지식 흡수 완료! {neurons_created}개 뉴런 추가")
                 self.energy -= 15
             
-            model_path = os.getenv('MODEL_PATH', 'data/models/iro_brain.pkl')
-            self.neural_net.save(model_path)
+            self._save_model()
             
         except Exception as e:
             print(f"❌ 무한 학습 오류: {e}")
@@ -248,20 +248,22 @@ class AliciaCore:
         # 📚 즉시 학습 (배운 내용을 뇌에 저장)
         print("📝 [내부 학습] 방금 배운 내용을 기억하는 중...")
         
-        self.neural_net.knowledge_brain.create_neuron(
-            content=f"Q: {user_input}\nA: {teacher_response}",
-            topic="대화학습",
-            source="Alicia_Conversation",
-            confidence=0.9
-        )
-        
-        if len(teacher_response) > 50:
+        # 두 뉴런의 저널 기록을 한 번에 디스크로
+        with self.neural_net.knowledge_brain.batch():
             self.neural_net.knowledge_brain.create_neuron(
-                content=teacher_response,
-                topic=self._extract_topic_from_question(user_input),
-                source="Alicia_Knowledge",
-                confidence=0.8
+                content=f"Q: {user_input}\nA: {teacher_response}",
+                topic="대화학습",
+                source="Alicia_Conversation",
+                confidence=0.9
             )
+            
+            if len(teacher_response) > 50:
+                self.neural_net.knowledge_brain.create_neuron(
+                    content=teacher_response,
+                    topic=self._extract_topic_from_question(user_input),
+                    source="Alicia_Knowledge",
+                    confidence=0.8
+                )
         
         self.stats["online_responses"] += 1
         self.stats["learned_conversations"] += 1
@@ -270,8 +272,7 @@ class AliciaCore:
             user_input, features, category, neural_confidence, teacher_response
         )
         
-        model_path = os.getenv('MODEL_PATH', 'data/models/iro_brain.pkl')
-        self.neural_net.save(model_path)
+        self._save_model()
         
         return {
             "response": teacher_response,
@@ -283,6 +284,14 @@ class AliciaCore:
             "stats": self.stats
         }
     
+    def _save_model(self):
+        """신경망 저장 - 지연 저장이 있으면 dirty 표시만 하고 바로 반환"""
+        if self.persistence is not None:
+            self.persistence.mark_dirty('model')
+        else:
+            model_path = os.getenv('MODEL_PATH', 'data/models/iro_brain.pkl')
+            self.neural_net.save(model_path)
+    
     def _extract_topic_from_question(self, question: str) -> str:
         """질문에서 주제 추출"""
         keywords = {
@@ -2,11 +2,24 @@
 Alicia 압축 뉴런 시스템 - 지식의 압축 저장 및 연결
 """
 
-import numpy as np
 from typing import Dict, List, Set, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 import hashlib
+import os
+import time
+
+import numpy as np
+
+# 망각 곡선 - DECAY_TICK_SECONDS가 지날 때마다 기억 강도 ×DECAY_RATE
+DECAY_RATE = 0.998
+DECAY_TICK_SECONDS = float(os.getenv('CORTEX_DECAY_TICK', '3600'))
+
+
+def decayed_strength(strength, epoch, now: float):
+    """epoch에 strength였던 기억 강도의 now 시점 값 (스칼라/배열 모두)"""
+    return strength * np.power(DECAY_RATE, np.maximum(now - epoch, 0.0) / DECAY_TICK_SECONDS)
+
 
 @dataclass
 class CompressedNeuron:
@@ -19,12 +32,13 @@ class CompressedNeuron:
     
     # 연결 및 강도
     synapses: Dict[int, float] = field(default_factory=dict)  # {뉴런ID: 연결강도}
-    activation_strength: float = 1.0  # 기억 강도 (사용할수록 강해짐)
+    activation_strength: float = 1.0  # 기억 강도 (사용할수록 강해짐) - strength_epoch 시점 값
+    strength_epoch: float = field(default_factory=time.time)  # 이후 감퇴는 읽을 때 계산
     
     # 압축 정보
     source_count: int = 1  # 몇 개 정보가 압축되었는지
     compression_ratio: float = 1.0
-    knowledge_vector: np.ndarray = field(default_factory=lambda: np.zeros(64))
+    # 지식 벡터는 NeuralCortex.vectors 행렬의 neuron_id 행에 있음
     
     # 메타데이터
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
@@ -33,17 +47,24 @@ class CompressedNeuron:
     
     def activate(self):
         """뉴런 활성화 - 사용할 때마다 호출"""
+        now = time.time()
         self.access_count += 1
-        self.activation_strength = min(2.0, self.activation_strength + 0.1)
+        self.activation_strength = min(2.0, self.effective_strength(now) + 0.1)
+        self.strength_epoch = now
         self.last_accessed = datetime.now().isoformat()
     
+    def effective_strength(self, now: Optional[float] = None) -> float:
+        """시간 경과에 따른 감퇴를 반영한 현재 기억 강도"""
+        return float(decayed_strength(self.activation_strength, self.strength_epoch,
+                                      time.time() if now is None else now))
+    
     def connect_to(self, other_id: int, weight: float):
         """다른 뉴런과 시냅스 연결"""
         self.synapses[other_id] = max(0.0, min(1.0, weight))
     
-    def decay(self):
-        """시간에 따른 기억 감퇴 (망각 곡선)"""
-        self.activation_strength *= 0.998
+    def decay(self, ticks: float = 1.0):
+        """추가 망각 (시간에 따른 감퇴는 effective_strength가 이미 반영)"""
+        self.activation_strength *= DECAY_RATE ** ticks
     
     def to_dict(self) -> Dict:
         """직렬화"""
@@ -54,9 +75,9 @@ class CompressedNeuron:
             'topic': self.topic,
             'synapses': self.synapses,
             'activation_strength': self.activation_strength,
+            'strength_epoch': self.strength_epoch,
             'source_count': self.source_count,
             'compression_ratio': self.compression_ratio,
-            'knowledge_vector': self.knowledge_vector.tolist(),
             'created_at': self.created_at,
             'last_accessed': self.last_accessed,
             'access_count': self.access_count
@@ -71,11 +92,13 @@ class CompressedNeuron:
             essence=data['essence'],
             topic=data['topic']
         )
-        neuron.synapses = data.get('synapses', {})
+        # JSON 키는 문자열이라 뉴런ID(int)로 되돌림
+        neuron.synapses = {int(target_id): weight for target_id, weight in data.get('synapses', {}).items()}
         neuron.activation_strength = data.get('activation_strength', 1.0)
+        # 예전 파일은 감퇴 기준 시점이 없어 불러온 시점부터 감퇴
+        neuron.strength_epoch = data.get('strength_epoch', time.time())
         neuron.source_count = data.get('source_count', 1)
         neuron.compression_ratio = data.get('compression_ratio', 1.0)
-        neuron.knowledge_vector = np.array(data.get('knowledge_vector', np.zeros(64)))
         neuron.created_at = data.get('created_at', '')
         neuron.last_accessed = data.get('last_accessed')
         neuron.access_count = data.get('access_count', 0)
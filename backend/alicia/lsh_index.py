@@ -0,0 +1,124 @@
+"""
+근사 중복 뉴런 후보 찾기 - LSH (MinHash 밴드 + 랜덤 초평면, NumPy)
+
+    개념 단어 집합 → MinHash 서명을 rows개씩 bands개 밴드로 나눠 해시 테이블에
+    지식 벡터     → 초평면 bits개의 부호를 묶은 키로 tables개 해시 테이블에
+
+한 테이블이라도 같은 버킷에 들어간 쌍만 후보가 되고, 정확한 유사도는 후보에만 계산한다.
+자카드 J인 두 집합이 후보가 될 확률은 1 - (1 - J^rows)^bands
+(기본 16×2: J=0.6 → 99.9%, J=0.5 → 99%, J=0.2 → 48%).
+초평면 테이블은 개념 단어는 달라도 본질 문장이 거의 같은 쌍을 위한 것이라 비트를 넉넉히
+쓴다 (코사인 1.0 → 항상, 0.95 → 80%, 0.5 → 1%).
+해시 함수는 seed로 고정되어 같은 입력이면 항상 같은 후보가 나온다.
+"""
+
+from typing import Dict, Iterable, List, Sequence, Set
+
+import numpy as np
+
+from utils.hashing import stable_hash
+
+_MINHASH_EMPTY = np.uint64(0xFFFFFFFFFFFFFFFF)
+_KEY_MIX = np.uint64(0x9E3779B97F4A7C15)
+_SIGNATURE_CHUNK = 8192  # 서명 계산 시 한 번에 펼치는 뉴런 수 (메모리 상한)
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """splitmix64 마무리 함수 - uint64 곱셈은 2^64에서 접힘"""
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+class LSHTables:
+    """버킷 키를 미리 정렬해 둔 해시 테이블 묶음 (행 = 뉴런ID 오름차순 위치)"""
+
+    def __init__(self, keys: List[np.ndarray], hashed: List[np.ndarray]):
+        self._tables = []
+        for key, mask in zip(keys, hashed):
+            rows = np.flatnonzero(mask)
+            order = np.argsort(key[rows], kind='stable')
+            self._tables.append((rows[order], key[rows][order]))
+
+    def candidates(self, limit: int, new_from: int, alive: np.ndarray) -> Dict[int, Set[int]]:
+        """행 limit 미만의 살아 있는 뉴런 중 한쪽이라도 new_from 이상인 후보 쌍
+        → {작은 행: {큰 행, ...}} (양쪽 다 new_from 미만인 쌍은 이미 확인한 것으로 봄)"""
+        neighbors: Dict[int, Set[int]] = {}
+        for sorted_rows, sorted_keys in self._tables:
+            keep = sorted_rows < limit
+            keep[keep] = alive[sorted_rows[keep]]
+            rows, keys = sorted_rows[keep], sorted_keys[keep]
+            if len(rows) < 2:
+                continue
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            ends = np.r_[starts[1:], len(keys)]
+            has_new = np.maximum.reduceat(rows, starts) >= new_from
+            for start, end in zip(starts[has_new], ends[has_new]):
+                if end - start < 2:
+                    continue
+                members = np.sort(rows[start:end]).tolist()
+                first_new = int(np.searchsorted(members, new_from))
+                for i, row in enumerate(members[:-1]):
+                    later = members[max(i + 1, first_new):]
+                    if later:
+                        neighbors.setdefault(row, set()).update(later)
+        return neighbors
+
+
+class NearDuplicateLSH:
+    """MinHash(개념 단어) + 랜덤 초평면(지식 벡터) 후보 생성기"""
+
+    def __init__(self, dim: int, bands: int = 16, rows: int = 2,
+                 tables: int = 8, bits: int = 16, seed: int = 42):
+        self.dim = dim
+        self.bands = bands
+        self.rows = rows
+        self.tables = tables
+        self.bits = bits
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        # 해시 함수 i = splitmix64(x + salt_i) - 순서가 서로 독립적인 치환
+        self._salts = rng.integers(0, np.iinfo(np.uint64).max, size=bands * rows, dtype=np.uint64, endpoint=True)
+        self._planes = rng.standard_normal((dim, tables * bits)).astype(np.float32)
+        self._bit_weights = (1 << np.arange(bits, dtype=np.int64))
+
+    def minhash_signatures(self, token_sets: Sequence[Iterable[str]]) -> np.ndarray:
+        """(뉴런 수, bands*rows) uint64 - 단어가 없으면 모든 칸이 2^64-1"""
+        signatures = np.full((len(token_sets), self.bands * self.rows), _MINHASH_EMPTY, dtype=np.uint64)
+        for chunk_start in range(0, len(token_sets), _SIGNATURE_CHUNK):
+            owners, hashes = [], []
+            for row, tokens in enumerate(token_sets[chunk_start:chunk_start + _SIGNATURE_CHUNK], chunk_start):
+                for token in tokens:
+                    owners.append(row)
+                    hashes.append(stable_hash(token))
+            if not hashes:
+                continue
+            owners = np.asarray(owners, dtype=np.int64)
+            values = _mix64(np.asarray(hashes, dtype=np.uint64)[:, None] + self._salts)
+            starts = np.flatnonzero(np.r_[True, owners[1:] != owners[:-1]])
+            signatures[owners[starts]] = np.minimum.reduceat(values, starts, axis=0)
+        return signatures
+
+    def build(self, token_sets: Sequence[Iterable[str]], vectors: np.ndarray) -> LSHTables:
+        """token_sets[i], vectors[i]가 행 i의 뉴런 - 단어 없는/0 벡터 뉴런은 그 테이블에서 뺌"""
+        keys, hashed = [], []
+
+        signatures = self.minhash_signatures(token_sets)
+        has_tokens = np.fromiter((bool(tokens) for tokens in token_sets), dtype=bool, count=len(token_sets))
+        for band in range(self.bands):
+            key = signatures[:, band * self.rows].copy()
+            for column in range(band * self.rows + 1, (band + 1) * self.rows):
+                key = key * _KEY_MIX ^ signatures[:, column]
+            keys.append(key)
+            hashed.append(has_tokens)
+
+        # 지식 벡터는 성분이 모두 0 이상이라 원점을 지나는 초평면이 한쪽으로 몰림 → 평균을 빼고 나눔
+        has_vector = np.any(vectors != 0, axis=1)
+        centered = vectors - (vectors[has_vector].mean(axis=0) if has_vector.any() else 0)
+        signs = (centered @ self._planes > 0).reshape(len(vectors), self.tables, self.bits)
+        plane_keys = signs.astype(np.int64) @ self._bit_weights
+        for table in range(self.tables):
+            keys.append(plane_keys[:, table].astype(np.uint64))
+            hashed.append(has_vector)
+
+        return LSHTables(keys, hashed)
@@ -6,19 +6,47 @@ import json
 import numpy as np
 from typing import Dict, List, Tuple, Optional, Set
 from collections import defaultdict, deque
+from datetime import datetime
+import io
+import itertools
 import os
-from .compressed_neuron import CompressedNeuron
+import time
+import zlib
+from utils.atomic_io import PREVIOUS_SUFFIX, atomic_write, atomic_write_json, load_checkpoint
+from utils.hashing import stable_hash
+from utils.ndjson_stream import StreamReader, write_stream
+from .compressed_neuron import CompressedNeuron, decayed_strength
+from .lsh_index import NearDuplicateLSH
+from .synapse_matrix import SynapseMatrix
+
+# 지식 벡터 해시 방식 - 바뀌면 저장된 벡터를 버리고 다시 계산
+VECTOR_HASH = 'crc32'
+# 뉴런 압축은 새 뉴런 이만큼마다 저장 (중간에 멈추면 다음 호출이 거기서 이어서)
+COMPRESS_CHUNK = 4096
 
 class NeuralCortex:
     """Alicia의 뇌 - 압축 뉴런 네트워크 관리"""
     
-    def __init__(self, storage_path: str = "data/alicia/cortex.json"):
+    def __init__(self, storage_path: str = "data/alicia/cortex.json", vector_dim: Optional[int] = None):
         self.storage_path = storage_path
         self.neurons: Dict[int, CompressedNeuron] = {}
         self.concept_index: Dict[str, int] = {}  # {개념: 뉴런ID}
         self.topic_clusters: Dict[str, Set[int]] = defaultdict(set)
         self.next_id = 1
         
+        # 지식 벡터는 뉴런마다 따로 두지 않고 float32 행렬 한 장에 (행 = 뉴런ID)
+        self.vector_dim = vector_dim or int(os.getenv('CORTEX_VECTOR_DIM', '64'))
+        self.vectors = np.zeros((16, self.vector_dim), dtype=np.float32)
+        self.vectors_path = os.path.splitext(storage_path)[0] + '.vectors.npy'
+        self.compression_path = os.path.splitext(storage_path)[0] + '.compression.json'
+        # 키워드 점수용 역색인 {단어: 뉴런ID 집합} - 개념/본질 문장을 질의마다 다시 나누지 않음
+        self._concept_postings: Dict[str, Set[int]] = defaultdict(set)
+        self._essence_postings: Dict[str, Set[int]] = defaultdict(set)
+        # 시냅스 CSR 스냅샷 - 연결이 바뀌면 None으로 두고 다음 사고 때 다시 만듦
+        self._synapse_matrix: Optional[SynapseMatrix] = None
+        # 뉴런 압축 진행 - checked_upto 이하 ID끼리는 threshold 기준으로 이미 비교함
+        self.compression = {'checked_upto': 0, 'threshold': None}
+        
         self._ensure_directory()
         self._load_cortex()
     
@@ -39,7 +67,7 @@ class NeuralCortex:
             
             # 더 나은 설명이면 업데이트
             if len(essence) > len(neuron.essence) * 0.8 and len(essence) < len(neuron.essence) * 1.5:
-                neuron.essence = essence
+                self._set_essence(neuron, essence)
             
             print(f"🧠 [기억 강화] '{concept}' 개념이 더 선명해졌습니다.")
             return neuron
@@ -49,11 +77,12 @@ class NeuralCortex:
                 neuron_id=self.next_id,
                 concept=concept,
                 essence=essence,
-                topic=topic,
-                knowledge_vector=self._create_knowledge_vector(essence)
+                topic=topic
             )
             
             self.neurons[self.next_id] = neuron
+            self._set_vector(self.next_id, self._create_knowledge_vector(essence))
+            self._index_tokens(neuron)
             self.concept_index[concept_key] = self.next_id
             self.topic_clusters[topic].add(self.next_id)
             self.next_id += 1
@@ -67,22 +96,69 @@ class NeuralCortex:
             return neuron
     
     def _create_knowledge_vector(self, text: str) -> np.ndarray:
-        """텍스트를 64차원 지식 벡터로 변환"""
+        """텍스트를 vector_dim차원 지식 벡터로 변환 (고정 seed 해시라 재시작해도 같은 벡터)"""
         words = text.lower().split()
-        vector = np.zeros(64)
+        vector = np.zeros(self.vector_dim, dtype=np.float32)
         
         for word in words:
             # 단어를 해시하여 차원에 매핑
-            hash_val = hash(word) % 64
-            vector[hash_val] += 1
+            vector[stable_hash(word) % self.vector_dim] += 1
         
         # 정규화
         norm = np.linalg.norm(vector)
         if norm > 0:
-            vector = vector / norm
+            vector /= norm
         
         return vector
     
+    def knowledge_vector(self, neuron_id: int) -> np.ndarray:
+        """뉴런의 지식 벡터 (행렬의 한 행 - 복사 없음)"""
+        return self.vectors[neuron_id]
+    
+    def _set_vector(self, neuron_id: int, vector: np.ndarray):
+        if neuron_id >= len(self.vectors):
+            grown = np.zeros((max(neuron_id + 1, len(self.vectors) * 2), self.vector_dim), dtype=np.float32)
+            grown[:len(self.vectors)] = self.vectors
+            self.vectors = grown
+        self.vectors[neuron_id] = vector
+    
+    def _index_tokens(self, neuron: CompressedNeuron):
+        for word in set(neuron.concept.lower().split()):
+            self._concept_postings[word].add(neuron.neuron_id)
+        for word in set(neuron.essence.lower().split()):
+            self._essence_postings[word].add(neuron.neuron_id)
+    
+    def _unindex_tokens(self, neuron: CompressedNeuron, concept: bool = True):
+        postings = [(self._essence_postings, neuron.essence)]
+        if concept:
+            postings.append((self._concept_postings, neuron.concept))
+        for index, text in postings:
+            for word in set(text.lower().split()):
+                ids = index.get(word)
+                if ids is not None:
+                    ids.discard(neuron.neuron_id)
+                    if not ids:
+                        del index[word]
+    
+    def _set_essence(self, neuron: CompressedNeuron, essence: str):
+        """본질 문장 교체 (키워드 역색인도 함께 - 벡터는 처음 만든 그대로)"""
+        self._unindex_tokens(neuron, concept=False)
+        neuron.essence = essence
+        for word in set(essence.lower().split()):
+            self._essence_postings[word].add(neuron.neuron_id)
+    
+    def _rebuild_token_index(self):
+        self._concept_postings = defaultdict(set)
+        self._essence_postings = defaultdict(set)
+        for neuron in self.neurons.values():
+            self._index_tokens(neuron)
+    
+    def _rebuild_vectors(self):
+        """모든 뉴런의 벡터를 본질 문장에서 다시 계산"""
+        self.vectors = np.zeros((max(16, self.next_id), self.vector_dim), dtype=np.float32)
+        for nid, neuron in self.neurons.items():
+            self._set_vector(nid, self._create_knowledge_vector(neuron.essence))
+    
     def _create_synapses(self, neuron_id: int, related_concepts: List[str]):
         """관련 개념들과 시냅스 연결"""
         for concept in related_concepts:
@@ -94,10 +170,23 @@ class NeuralCortex:
                 self.neurons[neuron_id].connect_to(target_id, 0.6)
                 self.neurons[target_id].connect_to(neuron_id, 0.6)
                 
+                self._synapse_matrix = None
                 print(f"   🔗 시냅스 연결: {self.neurons[neuron_id].concept} <-> {self.neurons[target_id].concept}")
     
-    def think_offline(self, query: str, max_depth: int = 2) -> Tuple[List[CompressedNeuron], List[str]]:
-        """인터넷 없이 연상 사고 (활성화 확산)"""
+    def synapse_matrix(self) -> SynapseMatrix:
+        """현재 시냅스의 CSR 스냅샷 (바뀐 뒤 처음 부를 때만 다시 만듦)"""
+        if self._synapse_matrix is None:
+            self._synapse_matrix = SynapseMatrix.from_neurons(self.neurons.values(), self.next_id)
+        return self._synapse_matrix
+    
+    def think_offline(self, query: str, max_depth: int = 2, mode: str = 'bfs', decay: float = 0.5,
+                      fan_out: Optional[int] = None, top_k: int = 10) -> Tuple[List[CompressedNeuron], List[str]]:
+        """인터넷 없이 연상 사고 (활성화 확산)
+
+        mode='bfs'    시작 뉴런에서 강한 연결 2개씩 max_depth 단계까지 따라감
+        mode='spread' 시작 뉴런의 관련도를 활성값으로 두고 단계마다 연결강도×decay만큼 퍼뜨려
+                      누적 활성값이 큰 top_k개 개념 (fan_out이 있으면 뉴런마다 강한 연결 fan_out개로만)
+        """
         print(f"🤔 [오프라인 사고] '{query}'에 대해 생각 중...")
         
         # 1. 쿼리와 관련된 시작 뉴런들 찾기
@@ -105,7 +194,13 @@ class NeuralCortex:
         if not start_neurons:
             return [], ["관련된 기억이 없어요..."]
         
+        if mode == 'spread':
+            return self._spread_activation(start_neurons[:3], max_depth, decay, fan_out, top_k)
+        if mode != 'bfs':
+            raise ValueError(f"알 수 없는 사고 방식: {mode}")
+        
         # 2. 활성화 확산 (Spreading Activation)
+        synapses = self.synapse_matrix()
         activated = set()
         thought_process = []
         queue = deque([(nid, 0) for nid, _ in start_neurons[:3]])
@@ -122,11 +217,10 @@ class NeuralCortex:
             
             thought_process.append(f"'{neuron.concept}' 떠올림: {neuron.essence}")
             
-            # 연결된 뉴런들 탐색
+            # 연결된 뉴런들 탐색 (CSR 행은 강도 내림차순으로 정렬되어 있음)
             if depth < max_depth:
-                sorted_synapses = sorted(neuron.synapses.items(), 
-                                       key=lambda x: x[1], reverse=True)
-                for connected_id, weight in sorted_synapses[:2]:  # 강한 연결 2개
+                targets, weights = synapses.row(neuron_id)
+                for connected_id, weight in zip(targets[:2].tolist(), weights[:2].tolist()):  # 강한 연결 2개
                     if connected_id in self.neurons and weight > 0.3:
                         queue.append((connected_id, depth + 1))
                         if connected_id not in activated:
@@ -138,61 +232,133 @@ class NeuralCortex:
         
         return activated_neurons, thought_process
     
+    def _spread_activation(self, seeds: List[Tuple[int, float]], max_depth: int, decay: float,
+                           fan_out: Optional[int], top_k: int) -> Tuple[List[CompressedNeuron], List[str]]:
+        """가중 활성화 확산 - 단계마다 희소 행렬×벡터 한 번"""
+        synapses = self.synapse_matrix()
+        # 스냅샷 이후 학습된 뉴런(연결 없음)도 시작점이 될 수 있음
+        size = max(synapses.size, self.next_id)
+        activation = np.zeros(size, dtype=np.float64)
+        for neuron_id, score in seeds:
+            activation[neuron_id] = score
+        total = activation.copy()
+        
+        for _ in range(max_depth):
+            activation = synapses.propagate(activation, fan_out) * decay
+            total += activation
+        
+        # 병합으로 없어진 뉴런에 흘러간 활성값은 버림
+        live = np.zeros(size, dtype=bool)
+        live[list(self.neurons)] = True
+        total[~live] = 0
+        candidates = np.flatnonzero(total > 0)
+        if len(candidates) > top_k:
+            candidates = candidates[np.argpartition(-total[candidates], top_k - 1)[:top_k]]
+        ranked = candidates[np.lexsort((candidates, -total[candidates]))]
+        
+        activated_neurons = []
+        thought_process = []
+        for neuron_id in ranked.tolist():
+            neuron = self.neurons[neuron_id]
+            neuron.activate()
+            activated_neurons.append(neuron)
+            thought_process.append(f"'{neuron.concept}' 떠올림 (활성도 {total[neuron_id]:.2f}): {neuron.essence}")
+        
+        print(f"   💡 {len(activated_neurons)}개 개념 활성화됨 (확산 {max_depth}단계)")
+        return activated_neurons, thought_process
+    
     def _find_relevant_neurons(self, query: str) -> List[Tuple[int, float]]:
-        """쿼리와 관련된 뉴런들 찾기"""
+        """쿼리와 관련된 뉴런들 찾기 (점수 내림차순, 같으면 ID 순)
+
+        벡터 점수는 행렬×벡터 한 번, 키워드 점수(개념 단어 공유 0.8 + 본질 단어 공유 0.6)는
+        질의 단어의 역색인으로 구한다. 없는/병합된 ID의 행은 0이라 후보에서 저절로 빠진다.
+        """
+        if not self.neurons:
+            return []
         query_vector = self._create_knowledge_vector(query)
-        scores = []
+        vector_scores = self.vectors[:self.next_id] @ query_vector
         
-        for neuron_id, neuron in self.neurons.items():
-            # 키워드 매칭
-            keyword_score = 0.0
-            query_words = set(query.lower().split())
-            concept_words = set(neuron.concept.lower().split())
-            essence_words = set(neuron.essence.lower().split())
-            
-            # Jaccard 유사도
-            if query_words & concept_words:
-                keyword_score += 0.8
-            if query_words & essence_words:
-                keyword_score += 0.6
-            
-            # 벡터 유사도
-            vector_score = np.dot(query_vector, neuron.knowledge_vector)
-            
-            total_score = keyword_score + vector_score
-            if total_score > 0.2:
-                scores.append((neuron_id, total_score))
+        query_words = set(query.lower().split())
+        keyword_scores = np.zeros(len(vector_scores), dtype=np.float64)
+        for postings, weight in ((self._concept_postings, 0.8), (self._essence_postings, 0.6)):
+            matched = set()
+            for word in query_words:
+                matched.update(postings.get(word, ()))
+            if matched:
+                keyword_scores[np.fromiter(matched, dtype=np.int64, count=len(matched))] += weight
         
-        scores.sort(key=lambda x: x[1], reverse=True)
-        return scores
+        total_scores = keyword_scores.astype(np.float32) + vector_scores
+        candidates = np.flatnonzero(total_scores > 0.2)
+        order = np.argsort(-total_scores[candidates], kind='stable')
+        return [(int(candidates[i]), float(total_scores[candidates[i]])) for i in order]
     
-    def compress_similar_neurons(self, similarity_threshold: float = 0.8):
-        """유사한 뉴런들을 압축하여 메모리 절약"""
+    def compress_similar_neurons(self, similarity_threshold: float = 0.8, full: bool = False) -> int:
+        """유사한 뉴런들을 압축하여 메모리 절약 → 병합된 뉴런 수
+
+        LSH로 뽑은 후보 쌍에만 정확한 유사도를 계산하고, 지난 압축 이후 학습된 뉴런이 낀 쌍만 본다.
+        ID 순으로 앞 뉴런이 뒤의 유사한 뉴런을 흡수하므로 같은 기억이면 결과가 항상 같다.
+        임계값을 지난번보다 낮추거나 full=True면 처음부터 다시 비교한다.
+        """
         print("🗜️ [뉴런 압축] 유사한 기억들을 통합 중...")
         
+        previous = self.compression.get('threshold')
+        if full or previous is None or similarity_threshold < previous:
+            self.compression = {'checked_upto': 0, 'threshold': similarity_threshold}
+        checked_upto = self.compression['checked_upto']
+        
+        ids = np.array(sorted(self.neurons), dtype=np.int64)
+        new_from = int(np.searchsorted(ids, checked_upto, side='right'))
+        if new_from == len(ids):
+            print("   ✅ 새로 비교할 뉴런 없음")
+            return 0
+        
+        token_sets = [set(self.neurons[nid].concept.lower().split()) for nid in ids.tolist()]
+        tables = NearDuplicateLSH(self.vector_dim).build(token_sets, self.vectors[ids])
+        # 정확한 계산 전 거르기용 상한: 자카드 ≤ 작은 집합 크기 / 큰 집합 크기
+        token_counts = np.array([len(tokens) for tokens in token_sets], dtype=np.float64)
+        topic_codes = {}
+        topics = np.array([topic_codes.setdefault(self.neurons[nid].topic, len(topic_codes))
+                           for nid in ids.tolist()], dtype=np.int64)
+        alive = np.ones(len(ids), dtype=bool)
         compressed_count = 0
-        processed = set()
         
-        for neuron_id, neuron in list(self.neurons.items()):
-            if neuron_id in processed:
-                continue
+        for chunk_start in range(new_from, len(ids), COMPRESS_CHUNK):
+            limit = min(chunk_start + COMPRESS_CHUNK, len(ids))
+            neighbors = tables.candidates(limit, chunk_start, alive)
+            merged = False
             
-            # 유사한 뉴런들 찾기
-            similar_ids = []
-            for other_id, other in self.neurons.items():
-                if other_id != neuron_id and other_id not in processed:
-                    similarity = self._calculate_similarity(neuron, other)
-                    if similarity >= similarity_threshold:
-                        similar_ids.append(other_id)
+            for row in sorted(neighbors):
+                if not alive[row]:
+                    continue
+                others = np.array(sorted(neighbors[row]), dtype=np.int64)
+                others = others[alive[others]]
+                larger = np.maximum(token_counts[others], token_counts[row])
+                upper = (0.5 * np.divide(np.minimum(token_counts[others], token_counts[row]), larger,
+                                         out=np.zeros(len(others)), where=larger > 0)
+                         + 0.3 * (self.vectors[ids[others]] @ self.vectors[ids[row]]).astype(np.float64)
+                         + 0.2 * (topics[others] == topics[row]))
+                others = others[upper >= similarity_threshold - 1e-6]
+                
+                # 유사한 뉴런들 찾기 (상한을 넘은 후보만 정확히)
+                neuron = self.neurons[int(ids[row])]
+                similar_rows = [other for other in others.tolist()
+                                if self._calculate_similarity(neuron, self.neurons[int(ids[other])]) >= similarity_threshold]
+                
+                if similar_rows:
+                    # 유사한 뉴런들과 병합
+                    self._merge_neurons(neuron.neuron_id, [int(ids[other]) for other in similar_rows])
+                    alive[similar_rows] = False
+                    compressed_count += len(similar_rows)
+                    merged = True
             
-            if similar_ids:
-                # 유사한 뉴런들과 병합
-                self._merge_neurons(neuron_id, similar_ids)
-                processed.update(similar_ids)
-                compressed_count += len(similar_ids)
+            # 중간 구간은 병합이 있었을 때만 뇌 전체를 저장하고, 진행 위치는 작은 파일에 따로
+            if merged or limit == len(ids):
+                self._save_cortex()
+            self.compression = {'checked_upto': int(ids[limit - 1]), 'threshold': similarity_threshold}
+            atomic_write_json(self.compression_path, self.compression, keep_previous=False)
         
-        print(f"   ✅ {compressed_count}개 뉴런 압축 완료")
-        self._save_cortex()
+        print(f"   ✅ {compressed_count}개 뉴런 압축 완료 (새 뉴런 {len(ids) - new_from}개 비교)")
+        return compressed_count
     
     def _calculate_similarity(self, neuron1: CompressedNeuron, neuron2: CompressedNeuron) -> float:
         """두 뉴런의 유사도 계산"""
@@ -202,7 +368,7 @@ class NeuralCortex:
         concept_sim = len(concept_words1 & concept_words2) / len(concept_words1 | concept_words2) if concept_words1 | concept_words2 else 0
         
         # 벡터 유사도
-        vector_sim = np.dot(neuron1.knowledge_vector, neuron2.knowledge_vector)
+        vector_sim = np.dot(self.vectors[neuron1.neuron_id], self.vectors[neuron2.neuron_id])
         
         # 주제 유사도
         topic_sim = 1.0 if neuron1.topic == neuron2.topic else 0.0
@@ -223,25 +389,50 @@ class NeuralCortex:
                 else:
                     main_neuron.synapses[syn_id] = weight
             
-            # 활성화 강도 통합
-            main_neuron.activation_strength = max(main_neuron.activation_strength, merge_neuron.activation_strength)
+            # 활성화 강도 통합 (지금 시점의 감퇴된 강도끼리)
+            now = time.time()
+            main_neuron.activation_strength = max(main_neuron.effective_strength(now), merge_neuron.effective_strength(now))
+            main_neuron.strength_epoch = now
             main_neuron.source_count += merge_neuron.source_count
             
             # 더 나은 설명으로 업데이트
             if len(merge_neuron.essence) > len(main_neuron.essence):
-                main_neuron.essence = merge_neuron.essence
+                self._set_essence(main_neuron, merge_neuron.essence)
             
             # 병합된 뉴런 제거
+            self._unindex_tokens(merge_neuron)
+            self._synapse_matrix = None
             del self.neurons[merge_id]
+            self.vectors[merge_id] = 0
             # 인덱스에서도 제거 (개념이 같다면)
             for concept, nid in list(self.concept_index.items()):
                 if nid == merge_id:
                     self.concept_index[concept] = main_id
     
+    def activation_strengths(self, now: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(뉴런ID, 현재 기억 강도) 배열 - 감퇴를 한 번에 계산하고 뉴런은 건드리지 않음"""
+        now = time.time() if now is None else now
+        count = len(self.neurons)
+        ids = np.fromiter(self.neurons, dtype=np.int64, count=count)
+        stored = np.fromiter((n.activation_strength for n in self.neurons.values()), dtype=np.float64, count=count)
+        epochs = np.fromiter((n.strength_epoch for n in self.neurons.values()), dtype=np.float64, count=count)
+        return ids, decayed_strength(stored, epochs, now)
+    
+    def normalize_strengths(self, now: Optional[float] = None) -> int:
+        """감퇴된 강도를 뉴런에 써 넣고 기준 시점을 now로 (저장 파일에 현재 강도를 남길 때)"""
+        now = time.time() if now is None else now
+        ids, strengths = self.activation_strengths(now)
+        for neuron_id, strength in zip(ids.tolist(), strengths.tolist()):
+            neuron = self.neurons[neuron_id]
+            neuron.activation_strength = strength
+            neuron.strength_epoch = now
+        return len(ids)
+    
     def get_cortex_stats(self) -> Dict:
         """뇌 상태 통계"""
         total_synapses = sum(len(n.synapses) for n in self.neurons.values())
         total_memory = sum(len(str(n).encode('utf-8')) for n in self.neurons.values())
+        _, strengths = self.activation_strengths()
         
         return {
             'total_neurons': len(self.neurons),
@@ -249,35 +440,97 @@ class NeuralCortex:
             'total_topics': len(self.topic_clusters),
             'memory_usage_bytes': total_memory,
             'avg_synapses_per_neuron': total_synapses / len(self.neurons) if self.neurons else 0,
+            'avg_activation_strength': float(strengths.mean()) if self.neurons else 0.0,
             'compression_efficiency': sum(n.compression_ratio for n in self.neurons.values()) / len(self.neurons) if self.neurons else 1.0
         }
     
+    def export_ndjson(self, path: str) -> int:
+        """뉴런을 한 줄씩 NDJSON으로 내보내기 (병합으로 생긴 개념 별칭은 alias 레코드로)"""
+        aliases = ((concept, nid) for concept, nid in self.concept_index.items()
+                   if nid in self.neurons and self.neurons[nid].concept.lower().strip() != concept)
+        records = itertools.chain(
+            (('neuron', {**self.neurons[nid].to_dict(), 'knowledge_vector': self.vectors[nid].tolist()})
+             for nid in sorted(self.neurons)),
+            (('alias', {'concept': concept, 'neuron_id': nid}) for concept, nid in aliases))
+        meta = {'next_id': self.next_id, 'neurons': len(self.neurons),
+                'vector_dim': self.vector_dim, 'vector_hash': VECTOR_HASH}
+        count = write_stream(path, 'cortex', meta, records)
+        print(f"📤 Alicia 기억 내보내기: {len(self.neurons)}개 뉴런 → {path}")
+        return count
+    
+    def import_ndjson(self, path: str, replace: bool = False) -> int:
+        """NDJSON 기억 가져오기 - 개념 색인과 주제 클러스터는 뉴런에서 한 번에 재구성"""
+        if self.neurons and not replace:
+            raise ValueError(f"기억이 비어 있지 않음: {len(self.neurons)}개 뉴런 (replace=True로 교체)")
+        neurons: Dict[int, CompressedNeuron] = {}
+        vectors: Dict[int, list] = {}
+        aliases: Dict[str, int] = {}
+        with StreamReader(path, 'cortex') as reader:
+            # 같은 해시 방식/차원으로 내보낸 벡터만 그대로 씀
+            reuse = (reader.meta.get('vector_hash') == VECTOR_HASH
+                     and reader.meta.get('vector_dim') == self.vector_dim)
+            for record_type, data in reader:
+                if record_type == 'neuron':
+                    neuron = CompressedNeuron.from_dict(data)
+                    neurons[neuron.neuron_id] = neuron
+                    if reuse and 'knowledge_vector' in data:
+                        vectors[neuron.neuron_id] = data['knowledge_vector']
+                elif record_type == 'alias':
+                    aliases[data['concept']] = data['neuron_id']
+            meta = reader.meta
+        
+        self.neurons = neurons
+        self.concept_index = {neuron.concept.lower().strip(): nid for nid, neuron in neurons.items()}
+        self.concept_index.update((concept, nid) for concept, nid in aliases.items() if nid in neurons)
+        self.topic_clusters = defaultdict(set)
+        for nid, neuron in neurons.items():
+            self.topic_clusters[neuron.topic].add(nid)
+        self.next_id = max(meta.get('next_id', 1), max(neurons, default=0) + 1)
+        self.vectors = np.zeros((max(16, self.next_id), self.vector_dim), dtype=np.float32)
+        for nid, neuron in neurons.items():
+            self._set_vector(nid, vectors[nid] if nid in vectors else self._create_knowledge_vector(neuron.essence))
+        self._rebuild_token_index()
+        self._synapse_matrix = None
+        self.compression = {'checked_upto': 0, 'threshold': None}
+        self._save_cortex()
+        atomic_write_json(self.compression_path, self.compression, keep_previous=False)
+        print(f"📥 Alicia 기억 가져오기: {len(neurons)}개 뉴런 ← {path}")
+        return len(neurons)
+    
     def _save_cortex(self):
-        """뇌 상태 저장"""
+        """뇌 상태 저장 (임시 파일 → fsync → rename, 직전 파일은 .prev)
+
+        벡터 행렬은 <base>.vectors.npy에 따로 쓰고 JSON에는 그 체크섬만 남긴다.
+        """
+        buffer = io.BytesIO()
+        np.save(buffer, self.vectors[:self.next_id])
+        vector_bytes = buffer.getvalue()
+        atomic_write(self.vectors_path, lambda f: f.write(vector_bytes))
+        
         data = {
             'neurons': {nid: neuron.to_dict() for nid, neuron in self.neurons.items()},
             'concept_index': self.concept_index,
             'topic_clusters': {topic: list(ids) for topic, ids in self.topic_clusters.items()},
             'next_id': self.next_id,
+            'vectors': {'file': os.path.basename(self.vectors_path), 'dim': self.vector_dim,
+                        'hash': VECTOR_HASH, 'crc32': zlib.crc32(vector_bytes)},
             'saved_at': datetime.now().isoformat()
         }
         
-        with open(self.storage_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        atomic_write_json(self.storage_path, data)
     
     def _load_cortex(self):
-        """저장된 뇌 상태 로드"""
-        if not os.path.exists(self.storage_path):
-            return
-        
+        """저장된 뇌 상태 로드 (최신 파일이 손상됐으면 직전 저장본)"""
         try:
-            with open(self.storage_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            checkpoint, _ = load_checkpoint([self.storage_path], self._read_cortex)
+            if checkpoint is None:
+                return
+            data, neurons, vectors = checkpoint
             
             # 뉴런 복원
-            for nid_str, neuron_data in data.get('neurons', {}).items():
-                neuron = CompressedNeuron.from_dict(neuron_data)
-                self.neurons[int(nid_str)] = neuron
+            self.neurons.update(neurons)
+            self._rebuild_token_index()
+            self._synapse_matrix = None
             
             self.concept_index = data.get('concept_index', {})
             
@@ -286,8 +539,51 @@ class NeuralCortex:
                 self.topic_clusters[topic] = set(ids)
             
             self.next_id = data.get('next_id', 1)
+            self.compression = self._read_compression()
+            
+            if vectors is not None and len(vectors) >= self.next_id:
+                self.vectors = vectors
+            else:
+                # 예전 파일(실행마다 달라지는 hash()로 만든 벡터)이거나 차원/벡터 파일이 맞지 않음
+                self._rebuild_vectors()
+                print(f"🔢 지식 벡터 다시 계산: {len(self.neurons)}개 ({self.vector_dim}차원)")
             
             print(f"🧠 Alicia의 기억 복원: {len(self.neurons)}개 뉴런")
             
         except Exception as e:
             print(f"⚠️ 뇌 로드 실패: {e}")
+    
+    def _read_compression(self) -> Dict:
+        """뉴런 압축 진행 위치 (없거나 못 읽거나 뇌가 그보다 예전 저장본이면 처음부터)"""
+        try:
+            with open(self.compression_path, 'r', encoding='utf-8') as f:
+                compression = json.load(f)
+        except (OSError, ValueError):
+            compression = None
+        if not compression or compression.get('checked_upto', 0) >= self.next_id:
+            return {'checked_upto': 0, 'threshold': None}
+        return compression
+    
+    def _read_cortex(self, path: str) -> Tuple[Dict, Dict[int, CompressedNeuron], Optional[np.ndarray]]:
+        """저장 파일 하나 읽기 - 뉴런 복원까지 끝나야 성공 (벡터는 못 쓰면 None)"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        neurons = {int(nid_str): CompressedNeuron.from_dict(neuron_data)
+                   for nid_str, neuron_data in data.get('neurons', {}).items()}
+        return data, neurons, self._read_vectors(path, data.get('vectors'))
+    
+    def _read_vectors(self, path: str, info: Optional[Dict]) -> Optional[np.ndarray]:
+        """JSON과 짝이 맞는 벡터 파일 (.prev에서 복구하면 벡터도 .prev)"""
+        if not info or info.get('hash') != VECTOR_HASH or info.get('dim') != self.vector_dim:
+            return None
+        vectors_path = self.vectors_path + (PREVIOUS_SUFFIX if path.endswith(PREVIOUS_SUFFIX) else '')
+        try:
+            with open(vectors_path, 'rb') as f:
+                raw = f.read()
+            if zlib.crc32(raw) != info.get('crc32'):
+                raise ValueError("체크섬 불일치")
+            vectors = np.load(io.BytesIO(raw), allow_pickle=False)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 지식 벡터 파일을 쓸 수 없음: {vectors_path} ({e})")
+            return None
+        return vectors.astype(np.float32, copy=False)
@@ -0,0 +1,69 @@
+"""
+대뇌피질 시냅스 CSR 스냅샷 - 행 = 출발 뉴런ID, 행 안은 연결강도 내림차순
+
+    indptr[i]:indptr[i+1]  뉴런 i의 시냅스 구간
+    targets / weights      도착 뉴런ID / 연결강도 (같은 강도는 연결한 순서)
+    ranks                  행 안에서의 순위 (0 = 가장 강한 연결)
+
+행마다 미리 정렬해 두므로 "가장 강한 연결 k개"는 앞에서 k개를 자르는 것으로 끝나고,
+활성화 확산 한 단계는 bincount 한 번(희소 행렬×벡터)이다.
+"""
+
+import itertools
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+
+class SynapseMatrix:
+    """뉴런들의 synapses 딕셔너리를 CSR로 묶은 읽기 전용 스냅샷"""
+
+    def __init__(self, synapses: Dict[int, Dict[int, float]], size: int):
+        rows = sorted(synapses)
+        total = sum(len(synapses[nid]) for nid in rows)
+        targets = np.fromiter(itertools.chain.from_iterable(synapses[nid] for nid in rows),
+                              dtype=np.int64, count=total)
+        weights = np.fromiter(itertools.chain.from_iterable(synapses[nid].values() for nid in rows),
+                              dtype=np.float64, count=total)
+        # 없어진(병합된) 뉴런을 가리키는 연결도 남겨 둠 - 걸러내기는 쓰는 쪽에서
+        self.size = max(size, int(targets.max()) + 1 if total else 0)
+
+        lengths = np.zeros(self.size, dtype=np.int64)
+        for neuron_id in rows:
+            lengths[neuron_id] = len(synapses[neuron_id])
+        self.indptr = np.zeros(self.size + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.indptr[1:])
+        self.sources = np.repeat(np.arange(self.size, dtype=np.int64), lengths)
+        # 행 순서는 그대로 두고 행 안에서만 강도 내림차순 (lexsort는 안정 정렬)
+        order = np.lexsort((-weights, self.sources))
+        self.targets = targets[order]
+        self.weights = weights[order]
+        self.ranks = np.arange(total, dtype=np.int64) - self.indptr[self.sources]
+
+    @classmethod
+    def from_neurons(cls, neurons: Iterable, size: int) -> 'SynapseMatrix':
+        return cls({neuron.neuron_id: neuron.synapses for neuron in neurons}, size)
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def row(self, neuron_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(도착 뉴런ID, 연결강도) - 강한 연결부터"""
+        if neuron_id >= self.size:
+            return self.targets[:0], self.weights[:0]
+        start, end = self.indptr[neuron_id], self.indptr[neuron_id + 1]
+        return self.targets[start:end], self.weights[start:end]
+
+    def propagate(self, activation: np.ndarray, fan_out: Optional[int] = None,
+                  min_weight: float = 0.0) -> np.ndarray:
+        """한 단계 확산: out[j] = Σ_i activation[i] · w(i→j) (activation은 size 이상, 같은 길이로 반환)
+
+        fan_out이 있으면 뉴런마다 가장 강한 연결 fan_out개로만, min_weight 이하 연결은 건너뜀.
+        """
+        mask = activation[self.sources] != 0
+        if fan_out is not None:
+            mask &= self.ranks < fan_out
+        if min_weight > 0:
+            mask &= self.weights > min_weight
+        return np.bincount(self.targets[mask], weights=activation[self.sources[mask]] * self.weights[mask],
+                           minlength=len(activation))
@@ -44,7 +44,8 @@ def register_routes(app):
             )
             
             # 5. 신경망 대화 카운터 증가
-            neural_net.training_history['total_conversations'] += 1
+            with neural_net.model_lock:
+                neural_net.training_history['total_conversations'] += 1
             
             return jsonify({
                 'response': response_text,
@@ -87,20 +88,21 @@ def register_routes(app):
                     'message': '최소 3개의 피드백이 필요합니다.'
                 }), 400
             
-            # 학습 실행
-            accuracy = neural_net.train(X, y, epochs=30)
-            
-            # 자동 성장 판단
-            should_grow, reason = neural_net.should_grow(
-                accuracy, 
-                knowledge_db.get_statistics()['total_feedback']
-            )
-            
-            grown = False
-            if should_grow:
-                neural_net.grow_network()
-                accuracy = neural_net.train(X, y, epochs=15)  # 재학습
-                grown = True
+            # 학습 실행 - 학습/성장/재학습 사이에 저장 스레드가 끼어들지 않도록 한 번에
+            with neural_net.model_lock:
+                accuracy = neural_net.train(X, y, epochs=30)
+                
+                # 자동 성장 판단
+                should_grow, reason = neural_net.should_grow(
+                    accuracy, 
+                    knowledge_db.get_statistics()['total_feedback']
+                )
+                
+                grown = False
+                if should_grow:
+                    neural_net.grow_network()
+                    accuracy = neural_net.train(X, y, epochs=15)  # 재학습
+                    grown = True
             
             # 모델 저장
             neural_net.save(os.getenv('MODEL_PATH', '../data/models/iro_brain.pkl'))
@@ -144,13 +146,13 @@ def init_system():
         # 모듈 임포트
         from neural_network.growing_network import SelfGrowingNeuralNetwork
         from neural_network.feature_extractor import IRORobotFeatureExtractor
-        from knowledge_base.database import KnowledgeDatabase
+        from knowledge_base.database import create_database
         from api_integration.openai_client import OpenAIClient
         
         # 신경망 로드 또는 생성
         model_path = os.getenv('MODEL_PATH', '../data/models/iro_brain.pkl')
-        if os.path.exists(model_path):
-            neural_net = SelfGrowingNeuralNetwork.load(model_path)
+        neural_net = SelfGrowingNeuralNetwork.load(model_path)
+        if neural_net:
             print(f"📂 저장된 신경망 로드: {neural_net.hidden_size}개 뉴런")
         else:
             neural_net = SelfGrowingNeuralNetwork()
@@ -158,7 +160,7 @@ def init_system():
         
         # 다른 구성 요소들
         extractor = IRORobotFeatureExtractor()
-        knowledge_db = KnowledgeDatabase()
+        knowledge_db = create_database()
         openai_client = OpenAIClient()
         
         print("✅ 시스템 구성 요소 초기화 완료!")
@@ -2,10 +2,15 @@
 지식 데이터베이스 - 대화 기록 및 피드백 저장
 """
 
+import itertools
 import json
 import os
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
+
+from utils.atomic_io import atomic_write_json, load_checkpoint
+from utils.ndjson_stream import StreamReader, write_stream
 
 class KnowledgeDatabase:
     """대화 기록 및 피드백 관리"""
@@ -22,6 +27,10 @@ class KnowledgeDatabase:
             }
         }
         
+        # 설정되면 파일을 바로 쓰지 않고 이 콜백으로 지연 저장에 맡김
+        self.on_dirty: Optional[Callable[[], None]] = None
+        self._lock = threading.RLock()
+        
         self._ensure_directory()
         self._load_data()
     
@@ -30,50 +39,67 @@ class KnowledgeDatabase:
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
     
     def _load_data(self):
-        """데이터 로드"""
-        if os.path.exists(self.db_path):
-            try:
-                with open(self.db_path, 'r', encoding='utf-8') as f:
-                    loaded_data = json.load(f)
-                    # statistics 키가 없으면 기본값 생성
-                    if 'statistics' not in loaded_data:
-                        loaded_data['statistics'] = {
-                            "total_conversations": len(loaded_data.get('conversations', [])),
-                            "total_feedbacks": len(loaded_data.get('feedbacks', [])),
-                            "created_at": datetime.now().isoformat()
-                        }
-                    self.data = loaded_data
-                print(f"📂 데이터베이스 로드: {len(self.data.get('conversations', []))}개 대화, {len(self.data.get('feedbacks', []))}개 피드백")
-            except Exception as e:
-                print(f"⚠️ 데이터베이스 로드 실패: {e}")
+        """데이터 로드 (최신 파일이 손상됐으면 직전 저장본)"""
+        try:
+            loaded_data, path = load_checkpoint([self.db_path], self._read_data)
+            if loaded_data is None:
+                return
+            # statistics 키가 없으면 기본값 생성
+            if 'statistics' not in loaded_data:
+                loaded_data['statistics'] = {
+                    "total_conversations": len(loaded_data.get('conversations', [])),
+                    "total_feedbacks": len(loaded_data.get('feedbacks', [])),
+                    "created_at": datetime.now().isoformat()
+                }
+            self.data = loaded_data
+            print(f"📂 데이터베이스 로드: {len(self.data.get('conversations', []))}개 대화, {len(self.data.get('feedbacks', []))}개 피드백"
+                  + (f" ({os.path.basename(path)}에서 복구)" if path != self.db_path else ""))
+        except Exception as e:
+            print(f"⚠️ 데이터베이스 로드 실패: {e}")
+    
+    @staticmethod
+    def _read_data(path: str) -> Dict:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError("데이터베이스 형식이 아님")
+        return data
     
     def _save_data(self):
-        """데이터 저장"""
+        """데이터 저장 (임시 파일 → fsync → rename, 직전 파일은 .prev)"""
         try:
-            with open(self.db_path, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=2)
+            with self._lock:
+                atomic_write_json(self.db_path, self.data)
         except Exception as e:
             print(f"❌ 데이터베이스 저장 실패: {e}")
     
+    def _changed(self):
+        """변경 후 저장 (지연 저장이 연결돼 있으면 dirty 표시만)"""
+        if self.on_dirty is not None:
+            self.on_dirty()
+        else:
+            self._save_data()
+    
     def add_conversation(self, user_input: str, features: any, category: int, 
                         confidence: float, ai_response: str) -> int:
         """대화 기록 추가"""
-        conv_id = len(self.data["conversations"]) + 1
-        
-        conversation = {
-            "id": conv_id,
-            "user_input": user_input,
-            "ai_response": ai_response,
-            "category": category,
-            "confidence": confidence,
-            "features": features.tolist() if hasattr(features, 'tolist') else features,
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        self.data["conversations"].append(conversation)
-        self.data["statistics"]["total_conversations"] += 1
+        with self._lock:
+            conv_id = len(self.data["conversations"]) + 1
+            
+            conversation = {
+                "id": conv_id,
+                "user_input": user_input,
+                "ai_response": ai_response,
+                "category": category,
+                "confidence": confidence,
+                "features": features.tolist() if hasattr(features, 'tolist') else features,
+                "timestamp": datetime.now().isoformat()
+            }
+            
+            self.data["conversations"].append(conversation)
+            self.data["statistics"]["total_conversations"] += 1
         
-        self._save_data()
+        self._changed()
         return conv_id
     
     def add_feedback(self, conversation_id: int, correct_category: int, rating: int = 5) -> bool:
@@ -86,10 +112,11 @@ class KnowledgeDatabase:
                 "timestamp": datetime.now().isoformat()
             }
             
-            self.data["feedbacks"].append(feedback)
-            self.data["statistics"]["total_feedbacks"] += 1
+            with self._lock:
+                self.data["feedbacks"].append(feedback)
+                self.data["statistics"]["total_feedbacks"] += 1
             
-            self._save_data()
+            self._changed()
             return True
         except Exception as e:
             print(f"❌ 피드백 저장 실패: {e}")
@@ -102,4 +129,68 @@ class KnowledgeDatabase:
             "total_feedbacks": len(self.data.get("feedbacks", [])),
             "recent_conversations": self.data.get("conversations", [])[-5:],
             "database_size": f"{os.path.getsize(self.db_path) / 1024:.1f}KB" if os.path.exists(self.db_path) else "0KB"
-        }
\ No newline at end of file
+        }
+    
+    def export_ndjson(self, path: str) -> int:
+        """대화/피드백을 한 줄씩 NDJSON으로 내보내기"""
+        with self._lock:
+            conversations = list(self.data.get("conversations", []))
+            feedbacks = list(self.data.get("feedbacks", []))
+            created_at = self.data.get("statistics", {}).get("created_at")
+        records = itertools.chain((("conversation", c) for c in conversations),
+                                  (("feedback", f) for f in feedbacks))
+        count = write_stream(path, "conversations", {"created_at": created_at, "conversations": len(conversations),
+                                                     "feedbacks": len(feedbacks)}, records)
+        print(f"📤 대화 기록 내보내기: {len(conversations)}개 대화, {len(feedbacks)}개 피드백 → {path}")
+        return count
+    
+    def import_ndjson(self, path: str) -> int:
+        """NDJSON 대화/피드백을 뒤에 추가 (겹치는 대화 ID는 새 ID로, 피드백 참조도 따라감)
+
+        파일이 끝까지 온전할 때만 반영한다.
+        """
+        conversations, feedbacks = [], []
+        with StreamReader(path, "conversations") as reader:
+            for record_type, data in reader:
+                if record_type == "conversation":
+                    conversations.append(data)
+                elif record_type == "feedback":
+                    feedbacks.append(data)
+        
+        with self._lock:
+            existing = self.data.setdefault("conversations", [])
+            used = {c.get("id") for c in existing}
+            next_id = max((i for i in used if isinstance(i, int)), default=0) + 1
+            remap = {}
+            for conversation in conversations:
+                conv_id = conversation.get("id")
+                if not isinstance(conv_id, int) or conv_id in used:
+                    conversation["id"] = next_id
+                    if isinstance(conv_id, int):
+                        remap[conv_id] = next_id
+                used.add(conversation["id"])
+                next_id = max(next_id, conversation["id"] + 1)
+            for feedback in feedbacks:
+                if feedback.get("conversation_id") in remap:
+                    feedback["conversation_id"] = remap[feedback["conversation_id"]]
+            existing.extend(conversations)
+            self.data.setdefault("feedbacks", []).extend(feedbacks)
+            self.data["statistics"]["total_conversations"] = len(existing)
+            self.data["statistics"]["total_feedbacks"] = len(self.data["feedbacks"])
+        self._save_data()
+        print(f"📥 대화 기록 가져오기: {len(conversations)}개 대화, {len(feedbacks)}개 피드백 ← {path}")
+        return len(conversations) + len(feedbacks)
+
+
+def create_database(backend: Optional[str] = None):
+    """KNOWLEDGE_DB_BACKEND 설정(sqlite / jsonl / json)에 맞는 지식 데이터베이스 생성"""
+    backend = backend or os.getenv('KNOWLEDGE_DB_BACKEND', 'sqlite')
+    if backend == 'sqlite':
+        from .sqlite_database import SQLiteKnowledgeDatabase
+        return SQLiteKnowledgeDatabase()
+    if backend == 'jsonl':
+        from .jsonl_database import JSONLKnowledgeDatabase
+        return JSONLKnowledgeDatabase()
+    if backend == 'json':
+        return KnowledgeDatabase()
+    raise ValueError(f"알 수 없는 데이터베이스 백엔드: {backend} (sqlite / jsonl / json)")
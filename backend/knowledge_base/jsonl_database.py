@@ -0,0 +1,354 @@
+"""
+지식 데이터베이스 (JSONL 세그먼트) - 대화 기록을 덧붙이기 전용 파일에 한 줄씩 저장
+
+    data/knowledge/log/conversations-0000000001.jsonl   대화 한 건 = JSON 한 줄
+    data/knowledge/log/conversations-0000000001.idx     (ID, 시작 위치, 길이) 고정 폭 레코드
+
+세그먼트가 일정 크기를 넘으면 다음 파일로 넘어간다. 시작할 때는 파일 목록과
+마지막 세그먼트 꼬리만 확인하므로 기록이 몇 달 치 쌓여도 시작 시간과
+메모리가 같다. 통계는 색인 크기와 꼬리 몇 줄로 만들고, 옛 세그먼트는
+get_conversation / iter_conversations로 필요할 때만 읽는다.
+"""
+
+import bisect
+import itertools
+import json
+import os
+import struct
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from utils.atomic_io import atomic_write_json
+from utils.ndjson_stream import StreamReader, write_stream
+
+_ENTRY = struct.Struct("<qQI")  # (레코드 ID, 세그먼트 안 시작 위치, 바이트 길이)
+
+
+class SegmentedLog:
+    """<prefix>-<첫 순번>.jsonl + .idx 세그먼트 묶음 (ID는 오름차순)"""
+
+    def __init__(self, directory: str, prefix: str, segment_bytes: int):
+        self.directory = directory
+        self.prefix = prefix
+        self.segment_bytes = segment_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        # 세그먼트별 첫 순번(1부터)과 첫 ID - 파일 이름과 색인 첫 항목에서 읽음
+        self._starts: List[int] = []
+        self._first_ids: List[int] = []
+        for name in sorted(os.listdir(directory)):
+            if name.startswith(prefix + "-") and name.endswith(".jsonl"):
+                self._starts.append(int(name[len(prefix) + 1:-len(".jsonl")]))
+        self._last_count = 0
+        self.last_id = -1  # 기록이 없으면 -1 (예전 database.json에는 ID 0이 있음)
+        self.size_bytes = 0
+        if self._starts:
+            self._recover_tail()
+            for start in self._starts:
+                self.size_bytes += os.path.getsize(self._path(start, ".jsonl"))
+                first = self._read_entries(start, 0, 1)
+                self._first_ids.append(first[0][0] if first else self.last_id + 1)
+
+    def _path(self, start: int, suffix: str) -> str:
+        return os.path.join(self.directory, f"{self.prefix}-{start:010d}{suffix}")
+
+    def _read_entries(self, start: int, first: int, count: int) -> List[tuple]:
+        with open(self._path(start, ".idx"), "rb") as f:
+            f.seek(first * _ENTRY.size)
+            data = f.read(count * _ENTRY.size)
+        return [_ENTRY.unpack_from(data, i) for i in range(0, len(data) - _ENTRY.size + 1, _ENTRY.size)]
+
+    def _recover_tail(self):
+        """마지막 세그먼트의 색인과 본문을 맞춤 (줄 추가 후 색인 기록 전에 종료된 경우)"""
+        start = self._starts[-1]
+        log_path, idx_path = self._path(start, ".jsonl"), self._path(start, ".idx")
+        if not os.path.exists(idx_path):
+            open(idx_path, "wb").close()
+        idx_size = os.path.getsize(idx_path)
+        count = idx_size // _ENTRY.size
+        log_size = os.path.getsize(log_path)
+        entries = self._read_entries(start, max(0, count - 1), 1) if count else []
+        # 본문보다 앞서 나간 색인 항목은 버림
+        while entries and entries[0][1] + entries[0][2] > log_size:
+            count -= 1
+            entries = self._read_entries(start, count - 1, 1) if count else []
+        if count * _ENTRY.size != idx_size:
+            os.truncate(idx_path, count * _ENTRY.size)
+        end = entries[0][1] + entries[0][2] if entries else 0
+        last_id = entries[0][0] if entries else -1
+        if not entries and len(self._starts) > 1:
+            previous = self._starts[-2]
+            last_id = self._read_entries(previous, start - previous - 1, 1)[0][0]
+
+        if log_size > end:
+            # 색인에 없는 완전한 줄은 색인에 추가, 끊긴 마지막 줄은 잘라냄
+            with open(log_path, "rb") as f:
+                f.seek(end)
+                pending = f.read()
+            recovered = []
+            position = end
+            for line in pending.split(b"\n")[:-1]:
+                try:
+                    record_id = json.loads(line)["_id"]
+                except (ValueError, KeyError, TypeError):
+                    break
+                recovered.append(_ENTRY.pack(record_id, position, len(line) + 1))
+                position += len(line) + 1
+                last_id = record_id
+            with open(idx_path, "ab") as f:
+                f.write(b"".join(recovered))
+            if position < log_size:
+                os.truncate(log_path, position)
+                print(f"⚠️ {os.path.basename(log_path)} 끝의 끊긴 기록 {log_size - position}바이트 제거")
+            count += len(recovered)
+        self._last_count = count
+        self.last_id = last_id
+
+    def __len__(self) -> int:
+        return self._starts[-1] - 1 + self._last_count if self._starts else 0
+
+    def clear(self):
+        """세그먼트 파일을 모두 지우고 빈 로그로 (중단된 마이그레이션을 다시 할 때)"""
+        with self._lock:
+            for start in self._starts:
+                for suffix in (".jsonl", ".idx"):
+                    if os.path.exists(self._path(start, suffix)):
+                        os.remove(self._path(start, suffix))
+            self._starts, self._first_ids = [], []
+            self._last_count = 0
+            self.last_id = -1
+            self.size_bytes = 0
+
+    def append(self, record: Dict, record_id: int) -> int:
+        """한 줄 추가 - 본문을 먼저 쓰고 색인을 나중에 써서 중간에 끊겨도 복구 가능"""
+        if record_id <= self.last_id:
+            raise ValueError(f"ID는 증가해야 함: {record_id} <= {self.last_id}")
+        line = (json.dumps({"_id": record_id, **record}, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            if not self._starts or os.path.getsize(self._path(self._starts[-1], ".jsonl")) >= self.segment_bytes:
+                self._starts.append(len(self) + 1)
+                self._first_ids.append(record_id)
+                self._last_count = 0
+            start = self._starts[-1]
+            with open(self._path(start, ".jsonl"), "ab") as f:
+                offset = f.tell()
+                f.write(line)
+            with open(self._path(start, ".idx"), "ab") as f:
+                f.write(_ENTRY.pack(record_id, offset, len(line)))
+            self._last_count += 1
+            self.last_id = record_id
+            self.size_bytes += len(line)
+        return record_id
+
+    def _read_record(self, start: int, offset: int, length: int) -> Dict:
+        with open(self._path(start, ".jsonl"), "rb") as f:
+            f.seek(offset)
+            record = json.loads(f.read(length))
+        record.pop("_id", None)
+        return record
+
+    def _segment_count(self, position: int) -> int:
+        if position == len(self._starts) - 1:
+            return self._last_count
+        return self._starts[position + 1] - self._starts[position]
+
+    def get(self, record_id: int) -> Optional[Dict]:
+        """ID로 한 건 - 해당 세그먼트 색인을 이진 탐색"""
+        position = bisect.bisect_right(self._first_ids, record_id) - 1
+        if position < 0:
+            return None
+        start = self._starts[position]
+        low, high = 0, self._segment_count(position)
+        while low < high:
+            middle = (low + high) // 2
+            entry = self._read_entries(start, middle, 1)[0]
+            if entry[0] < record_id:
+                low = middle + 1
+            elif entry[0] > record_id:
+                high = middle
+            else:
+                return self._read_record(start, entry[1], entry[2])
+        return None
+
+    def tail(self, count: int) -> List[Dict]:
+        """마지막 count건 (오래된 것부터)"""
+        records: List[Dict] = []
+        position = len(self._starts) - 1
+        while position >= 0 and len(records) < count:
+            start = self._starts[position]
+            available = self._segment_count(position)
+            take = min(available, count - len(records))
+            entries = self._read_entries(start, available - take, take)
+            records[:0] = [self._read_record(start, offset, length) for _, offset, length in entries]
+            position -= 1
+        return records
+
+    def __iter__(self) -> Iterator[Dict]:
+        """오래된 것부터 한 세그먼트씩 스트리밍"""
+        for start in list(self._starts):
+            with open(self._path(start, ".jsonl"), "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.endswith("\n"):
+                        record = json.loads(line)
+                        record.pop("_id", None)
+                        yield record
+
+
+class JSONLKnowledgeDatabase:
+    """대화 기록 및 피드백 관리 (JSONL 세그먼트 + 오프셋 색인)"""
+
+    def __init__(self, log_dir: str = "data/knowledge/log",
+                 json_path: str = "data/knowledge/database.json",
+                 segment_bytes: Optional[int] = None):
+        self.log_dir = log_dir
+        self.json_path = json_path
+        segment_bytes = segment_bytes or int(os.getenv('KNOWLEDGE_LOG_SEGMENT_BYTES', str(8 * 1024 * 1024)))
+        self.conversations = SegmentedLog(log_dir, "conversations", segment_bytes)
+        self.feedbacks = SegmentedLog(log_dir, "feedbacks", segment_bytes)
+        self._lock = threading.Lock()
+
+        self.meta_path = os.path.join(log_dir, "meta.json")
+        self.migrating_path = os.path.join(log_dir, "migrating.json")
+        if os.path.exists(self.migrating_path):
+            # 마이그레이션 도중 종료 - 반쯤 옮긴 기록을 버리고 처음부터 다시
+            print(f"⚠️ 중단된 마이그레이션 발견: {len(self.conversations)}개 대화 버리고 다시 가져옴")
+            self.conversations.clear()
+            self.feedbacks.clear()
+            self._migrate_json()
+        elif not os.path.exists(self.meta_path):
+            self._migrate_json()
+
+        print(f"📂 데이터베이스 로드 (JSONL): {len(self.conversations)}개 대화, {len(self.feedbacks)}개 피드백")
+
+    def _migrate_json(self):
+        """기존 database.json을 한 번만 가져옴 (원본 파일은 그대로 둔다)
+
+        가져오는 동안 migrating.json 표시를 두고 meta.json을 쓴 뒤에야 지운다.
+        표시가 남아 있으면 시작할 때 로그를 비우고 다시 가져온다 (전부 아니면 전무).
+        """
+        meta = {"created_at": datetime.now().isoformat()}
+        if self.json_path and os.path.exists(self.json_path) and not len(self.conversations):
+            try:
+                with open(self.json_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"⚠️ JSON 데이터베이스 마이그레이션 실패: {e}")
+                return
+            conversations = data.get("conversations", [])
+            feedbacks = data.get("feedbacks", [])
+            atomic_write_json(self.migrating_path, {"source": os.path.abspath(self.json_path),
+                                                    "started_at": meta["created_at"]}, keep_previous=False)
+            for conversation in conversations:
+                record = dict(conversation)
+                record_id = record.get("id")
+                if not isinstance(record_id, int) or record_id <= self.conversations.last_id:
+                    record_id = max(self.conversations.last_id, 0) + 1  # 중복/역순 ID는 새 ID로
+                record["id"] = record_id
+                self.conversations.append(record, record_id)
+            for feedback in feedbacks:
+                self.feedbacks.append(feedback, max(self.feedbacks.last_id, 0) + 1)
+            meta["created_at"] = data.get("statistics", {}).get("created_at") or meta["created_at"]
+            meta["migrated_from"] = os.path.abspath(self.json_path)
+            print(f"🔄 JSON → JSONL 마이그레이션: {len(conversations)}개 대화, {len(feedbacks)}개 피드백")
+        atomic_write_json(self.meta_path, meta, keep_previous=False)
+        if os.path.exists(self.migrating_path):
+            os.remove(self.migrating_path)
+
+    def add_conversation(self, user_input: str, features: any, category: int,
+                        confidence: float, ai_response: str) -> int:
+        """대화 기록 추가"""
+        try:
+            with self._lock:
+                conv_id = max(self.conversations.last_id, 0) + 1
+                conversation = {
+                    "id": conv_id,
+                    "user_input": user_input,
+                    "ai_response": ai_response,
+                    "category": category,
+                    "confidence": confidence,
+                    "features": features.tolist() if hasattr(features, 'tolist') else features,
+                    "timestamp": datetime.now().isoformat()
+                }
+                return self.conversations.append(conversation, conv_id)
+        except Exception as e:
+            print(f"❌ 데이터베이스 저장 실패: {e}")
+            return 0
+
+    def add_feedback(self, conversation_id: int, correct_category: int, rating: int = 5) -> bool:
+        """피드백 추가"""
+        try:
+            feedback = {
+                "conversation_id": conversation_id,
+                "correct_category": correct_category,
+                "rating": rating,
+                "timestamp": datetime.now().isoformat()
+            }
+            with self._lock:
+                self.feedbacks.append(feedback, max(self.feedbacks.last_id, 0) + 1)
+            return True
+        except Exception as e:
+            print(f"❌ 피드백 저장 실패: {e}")
+            return False
+
+    def get_conversation(self, conversation_id: int) -> Optional[Dict]:
+        """ID로 대화 한 건 (해당 세그먼트만 읽음)"""
+        return self.conversations.get(conversation_id)
+
+    def iter_conversations(self) -> Iterator[Dict]:
+        """전체 대화를 오래된 것부터 스트리밍"""
+        return iter(self.conversations)
+
+    def export_ndjson(self, path: str) -> int:
+        """대화/피드백을 세그먼트에서 한 줄씩 읽어 NDJSON으로 내보내기"""
+        created_at = None
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                created_at = json.load(f).get("created_at")
+        records = itertools.chain((("conversation", c) for c in self.conversations),
+                                  (("feedback", f) for f in self.feedbacks))
+        count = write_stream(path, "conversations", {"created_at": created_at,
+                                                     "conversations": len(self.conversations),
+                                                     "feedbacks": len(self.feedbacks)}, records)
+        print(f"📤 대화 기록 내보내기: {count}개 레코드 → {path}")
+        return count
+
+    def import_ndjson(self, path: str) -> int:
+        """NDJSON 대화/피드백을 뒤에 추가 (겹치거나 역순인 대화 ID는 새 ID로, 피드백 참조도 따라감)
+
+        덧붙인 줄은 되돌릴 수 없으므로 먼저 파일 끝까지 온전한지 확인한 뒤 다시 읽으며 추가한다.
+        """
+        with StreamReader(path, "conversations") as reader:
+            reader.verify()
+        remap: Dict[int, int] = {}
+        count = 0
+        with StreamReader(path, "conversations") as reader, self._lock:
+            for record_type, data in reader:
+                if record_type == "conversation":
+                    record_id = data.get("id")
+                    if not isinstance(record_id, int) or record_id <= self.conversations.last_id:
+                        new_id = max(self.conversations.last_id, 0) + 1
+                        if isinstance(record_id, int):
+                            remap[record_id] = new_id
+                        data["id"] = record_id = new_id
+                    self.conversations.append(data, record_id)
+                elif record_type == "feedback":
+                    if data.get("conversation_id") in remap:
+                        data["conversation_id"] = remap[data["conversation_id"]]
+                    self.feedbacks.append(data, max(self.feedbacks.last_id, 0) + 1)
+                else:
+                    continue
+                count += 1
+        print(f"📥 대화 기록 가져오기: {count}개 레코드 ← {path}")
+        return count
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """통계 정보 - 색인 크기와 마지막 몇 줄만 읽음"""
+        size = self.conversations.size_bytes + self.feedbacks.size_bytes
+        return {
+            "total_conversations": len(self.conversations),
+            "total_feedbacks": len(self.feedbacks),
+            "recent_conversations": self.conversations.tail(5),
+            "database_size": f"{size / 1024:.1f}KB"
+        }
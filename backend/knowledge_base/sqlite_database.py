@@ -0,0 +1,231 @@
+"""
+지식 데이터베이스 (SQLite) - 대화 기록 및 피드백을 행 단위로 저장
+
+KnowledgeDatabase와 같은 공개 메서드를 제공하지만 대화 한 건 추가가
+파일 전체 재작성이 아니라 INSERT 한 번이라 기록이 쌓여도 비용이 같다.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Any, Tuple
+
+from utils.ndjson_stream import StreamReader, write_stream
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_input TEXT NOT NULL,
+    ai_response TEXT,
+    category INTEGER,
+    confidence REAL,
+    features TEXT,
+    timestamp TEXT NOT NULL,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_conversations_timestamp ON conversations(timestamp);
+
+CREATE TABLE IF NOT EXISTS feedbacks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    conversation_id INTEGER NOT NULL,
+    correct_category INTEGER,
+    rating INTEGER,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_feedbacks_conversation ON feedbacks(conversation_id);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# 초기 버전 database.json의 대화 필드명 → 현재 필드명
+_LEGACY_FIELDS = {"predicted_category": "category", "response": "ai_response"}
+_CONVERSATION_FIELDS = ("id", "user_input", "ai_response", "category", "confidence", "features", "timestamp")
+
+
+class SQLiteKnowledgeDatabase:
+    """대화 기록 및 피드백 관리 (SQLite, WAL 모드)"""
+
+    def __init__(self, db_path: str = "data/knowledge/database.sqlite3",
+                 json_path: str = "data/knowledge/database.json"):
+        self.db_path = db_path
+        self.json_path = json_path
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+
+        # Flask 스레드들이 연결 하나를 공유하므로 잠금으로 직렬화
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('created_at', ?)",
+                           (datetime.now().isoformat(),))
+        self._conn.commit()
+
+        self._migrate_json()
+        stats = self.get_statistics()
+        print(f"📂 데이터베이스 로드 (SQLite): {stats['total_conversations']}개 대화, {stats['total_feedbacks']}개 피드백")
+
+    def _migrate_json(self):
+        """기존 database.json을 한 번만 가져옴 (원본 파일은 그대로 둔다)"""
+        if not self.json_path or not os.path.exists(self.json_path):
+            return
+        if self._conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_from'").fetchone():
+            return
+        try:
+            with open(self.json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"⚠️ JSON 데이터베이스 마이그레이션 실패: {e}")
+            return
+
+        conversations = data.get("conversations", [])
+        feedbacks = data.get("feedbacks", [])
+        with self._lock, self._conn:
+            for conversation in conversations:
+                self._insert_conversation(self._normalize_legacy(conversation))
+            for feedback in feedbacks:
+                self._conn.execute(
+                    "INSERT INTO feedbacks (conversation_id, correct_category, rating, timestamp) "
+                    "VALUES (?, ?, ?, ?)",
+                    (feedback.get("conversation_id"), feedback.get("correct_category"),
+                     feedback.get("rating", 5), feedback.get("timestamp") or datetime.now().isoformat()))
+            created_at = data.get("statistics", {}).get("created_at")
+            if created_at:
+                self._conn.execute("UPDATE meta SET value = ? WHERE key = 'created_at'", (created_at,))
+            self._conn.execute("INSERT INTO meta (key, value) VALUES ('migrated_from', ?)",
+                               (os.path.abspath(self.json_path),))
+        print(f"🔄 JSON → SQLite 마이그레이션: {len(conversations)}개 대화, {len(feedbacks)}개 피드백")
+
+    @staticmethod
+    def _normalize_legacy(conversation: Dict) -> Dict:
+        record = dict(conversation)
+        for old, new in _LEGACY_FIELDS.items():
+            if old in record and new not in record:
+                record[new] = record.pop(old)
+        return record
+
+    def _insert_conversation(self, record: Dict) -> int:
+        """대화 한 건 INSERT (잠금/트랜잭션은 호출자가 잡음)"""
+        extra = {k: v for k, v in record.items() if k not in _CONVERSATION_FIELDS}
+        values = (record.get("user_input", ""), record.get("ai_response"), record.get("category"),
+                  record.get("confidence"), json.dumps(record.get("features"), ensure_ascii=False),
+                  record.get("timestamp") or datetime.now().isoformat(),
+                  json.dumps(extra, ensure_ascii=False) if extra else None)
+        columns = "user_input, ai_response, category, confidence, features, timestamp, extra"
+        if record.get("id") is not None:
+            try:
+                self._conn.execute(f"INSERT INTO conversations (id, {columns}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                   (record["id"],) + values)
+                return record["id"]
+            except sqlite3.IntegrityError:
+                pass  # 중복 ID는 새 ID로
+        cursor = self._conn.execute(f"INSERT INTO conversations ({columns}) VALUES (?, ?, ?, ?, ?, ?, ?)", values)
+        return cursor.lastrowid
+
+    @staticmethod
+    def _row_to_conversation(row: sqlite3.Row) -> Dict:
+        conversation = {field: row[field] for field in _CONVERSATION_FIELDS}
+        conversation["features"] = json.loads(row["features"]) if row["features"] else None
+        if row["extra"]:
+            conversation.update(json.loads(row["extra"]))
+        return conversation
+
+    def add_conversation(self, user_input: str, features: any, category: int,
+                        confidence: float, ai_response: str) -> int:
+        """대화 기록 추가"""
+        record = {
+            "user_input": user_input,
+            "ai_response": ai_response,
+            "category": int(category) if category is not None else None,
+            "confidence": float(confidence) if confidence is not None else None,
+            "features": features.tolist() if hasattr(features, 'tolist') else features,
+            "timestamp": datetime.now().isoformat()
+        }
+        try:
+            with self._lock, self._conn:
+                return self._insert_conversation(record)
+        except Exception as e:
+            print(f"❌ 데이터베이스 저장 실패: {e}")
+            return 0
+
+    def add_feedback(self, conversation_id: int, correct_category: int, rating: int = 5) -> bool:
+        """피드백 추가"""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT INTO feedbacks (conversation_id, correct_category, rating, timestamp) "
+                    "VALUES (?, ?, ?, ?)",
+                    (conversation_id, correct_category, rating, datetime.now().isoformat()))
+            return True
+        except Exception as e:
+            print(f"❌ 피드백 저장 실패: {e}")
+            return False
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """통계 정보"""
+        with self._lock:
+            total_conversations = self._conn.execute("SELECT COUNT(*) FROM conversations").fetchone()[0]
+            total_feedbacks = self._conn.execute("SELECT COUNT(*) FROM feedbacks").fetchone()[0]
+            rows = self._conn.execute("SELECT * FROM conversations ORDER BY id DESC LIMIT 5").fetchall()
+        recent: List[Dict] = [self._row_to_conversation(row) for row in reversed(rows)]
+        size = sum(os.path.getsize(path) for path in (self.db_path, self.db_path + "-wal")
+                   if os.path.exists(path))
+        return {
+            "total_conversations": total_conversations,
+            "total_feedbacks": total_feedbacks,
+            "recent_conversations": recent,
+            "database_size": f"{size / 1024:.1f}KB"
+        }
+
+    def _export_records(self) -> Iterator[Tuple[str, Dict]]:
+        """커서에서 한 행씩 (잠금은 호출자가 잡음)"""
+        for row in self._conn.execute("SELECT * FROM conversations ORDER BY id"):
+            yield "conversation", self._row_to_conversation(row)
+        for row in self._conn.execute("SELECT conversation_id, correct_category, rating, timestamp "
+                                      "FROM feedbacks ORDER BY id"):
+            yield "feedback", dict(row)
+
+    def export_ndjson(self, path: str) -> int:
+        """대화/피드백을 한 줄씩 NDJSON으로 내보내기 (행을 메모리에 모으지 않음)"""
+        with self._lock:
+            created_at = self._conn.execute("SELECT value FROM meta WHERE key = 'created_at'").fetchone()
+            count = write_stream(path, "conversations", {"created_at": created_at[0] if created_at else None},
+                                 self._export_records())
+        print(f"📤 대화 기록 내보내기: {count}개 레코드 → {path}")
+        return count
+
+    def import_ndjson(self, path: str) -> int:
+        """NDJSON 대화/피드백을 한 트랜잭션으로 추가 (겹치는 대화 ID는 새 ID로, 피드백 참조도 따라감)
+
+        파일이 중간에 끊겼으면 롤백되어 아무것도 반영되지 않는다.
+        """
+        remap: Dict[int, int] = {}
+        count = 0
+        with StreamReader(path, "conversations") as reader, self._lock, self._conn:
+            for record_type, data in reader:
+                if record_type == "conversation":
+                    new_id = self._insert_conversation(self._normalize_legacy(data))
+                    if data.get("id") is not None and data["id"] != new_id:
+                        remap[data["id"]] = new_id
+                elif record_type == "feedback":
+                    conversation_id = data.get("conversation_id")
+                    self._conn.execute(
+                        "INSERT INTO feedbacks (conversation_id, correct_category, rating, timestamp) "
+                        "VALUES (?, ?, ?, ?)",
+                        (remap.get(conversation_id, conversation_id), data.get("correct_category"),
+                         data.get("rating", 5), data.get("timestamp") or datetime.now().isoformat()))
+                else:
+                    continue
+                count += 1
+        print(f"📥 대화 기록 가져오기: {count}개 레코드 ← {path}")
+        return count
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -25,31 +25,23 @@ extractor = None
 knowledge_db = None
 multi_ai_client = None
 alicia_core = None
+persistence = None
 
 def graceful_shutdown(signum, frame):
     """Ctrl+C 안전 종료 핸들러"""
     print("\n🛑 Ctrl+C 감지: Alicia 상태 저장 중...")
     if alicia_core and neural_net:
         try:
-            model_path = os.getenv('MODEL_PATH', 'data/models/iro_brain.pkl')
-            neural_net.save(model_path)
-            if hasattr(neural_net, "knowledge_brain"):
-                neural_net.knowledge_brain._save_neurons()
-            print("💾 신경망 및 기억 저장 완료")
-        except Exception as e:
-            print(f"⚠️ 저장 중 오류: {e}")
-    print("👋 Alicia: 안전하게 잠들어요. 다음에 또 만나요!")
-    os._exit(0)
-
-def graceful_shutdown(signum, frame):
-    """Ctrl+C 안전 종료 핸들러"""
-    print("\n🛑 Ctrl+C 감지: Alicia 상태 저장 중...")
-    if alicia_core and neural_net:
-        try:
-            model_path = os.getenv('MODEL_PATH', 'data/models/iro_brain.pkl')
-            neural_net.save(model_path)
-            if hasattr(neural_net, "knowledge_brain"):
-                neural_net.knowledge_brain._save_neurons()
+            if persistence is not None:
+                # 모델/기억은 무조건 저장하고 밀려 있던 지연 저장도 여기서 동기 처리
+                persistence.mark_dirty('model')
+                persistence.mark_dirty('brain')
+                persistence.stop()
+            else:
+                model_path = os.getenv('MODEL_PATH', 'data/models/iro_brain.pkl')
+                neural_net.save(model_path)
+                if hasattr(neural_net, "knowledge_brain"):
+                    neural_net.knowledge_brain._save_neurons()
             print("💾 신경망 및 기억 저장 완료")
         except Exception as e:
             print(f"⚠️ 저장 중 오류: {e}")
@@ -57,7 +49,7 @@ def graceful_shutdown(signum, frame):
     os._exit(0)
 def init_system():
     """시스템 초기화 (Alicia 통합)"""
-    global neural_net, extractor, knowledge_db, multi_ai_client, alicia_core
+    global neural_net, extractor, knowledge_db, multi_ai_client, alicia_core, persistence
     
     print("=" * 70)
     print("🔧 Alicia 독립 AI 시스템 초기화 중...")
@@ -66,9 +58,10 @@ def init_system():
     try:
         from neural_network.growing_network import SelfGrowingNeuralNetwork
         from neural_network.feature_extractor import IRORobotFeatureExtractor
-        from knowledge_base.database import KnowledgeDatabase
+        from knowledge_base.database import KnowledgeDatabase, create_database
         from api_integration.multi_ai_client import MultiAIClient
         from alicia.alicia_core import AliciaCore
+        from utils.write_behind import WriteBehindFlusher
         
         # 시그널 핸들러 등록 (Ctrl+C 안전 저장)
         signal.signal(signal.SIGINT, graceful_shutdown)
@@ -81,11 +74,21 @@ def init_system():
             print("🧠 새로운 신경망 생성")
         
         extractor = IRORobotFeatureExtractor()
-        knowledge_db = KnowledgeDatabase()
+        knowledge_db = create_database()
         multi_ai_client = MultiAIClient()
         
+        # 지연 저장: 요청 경로에서는 dirty 표시만, 디스크 쓰기는 백그라운드에서
+        persistence = WriteBehindFlusher()
+        persistence.register('model', lambda: neural_net.save(model_path))
+        persistence.register('brain', neural_net.knowledge_brain._save_neurons)
+        neural_net.knowledge_brain.on_dirty = lambda: persistence.mark_dirty('brain')
+        if isinstance(knowledge_db, KnowledgeDatabase):
+            persistence.register('database', knowledge_db._save_data)
+            knowledge_db.on_dirty = lambda: persistence.mark_dirty('database')
+        persistence.start()
+        
         # Alicia Core 초기화
-        alicia_core = AliciaCore(neural_net, knowledge_db, multi_ai_client)
+        alicia_core = AliciaCore(neural_net, knowledge_db, multi_ai_client, persistence)
         
         print("=" * 70)
         print("✅ 통합 시스템 초기화 완료!")
@@ -289,8 +292,7 @@ def learn_topic():
         if temp_enabled:
             neural_net.knowledge_brain.toggle_learning_mode(False)
 
-        model_path = os.getenv('MODEL_PATH', 'data/models/iro_brain.pkl')
-        neural_net.save(model_path)
+        persistence.mark_dirty('model')
 
         return jsonify({
             "success": result.get("success", False),
@@ -317,6 +319,7 @@ def status():
             'neural_network': brain_status,
             'knowledge_base': db_stats,
             'alicia': alicia_stat,
+            'persistence': persistence.get_status() if persistence else {},
             'system_ready': True
         })
         
@@ -0,0 +1,58 @@
+"""
+뉴런 활성화 장부 - 검색 경로에서 뉴런 객체를 건드리지 않도록 활성화를 모아둠
+"""
+
+import threading
+import time
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable
+
+
+class ActivationLedger:
+    """뉴런ID로 인덱싱한 정수 카운터 배열 + 마지막 접근 epoch 배열
+
+    검색은 record()로 숫자만 올리고, 실제 KnowledgeNeuron의
+    activation_count / last_accessed 반영은 저장 직전에 flush()로 한꺼번에 한다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = array('q')
+        self.epochs = array('d')
+        self._dirty: set = set()
+
+    def _grow(self, size: int):
+        missing = size - len(self.counts)
+        if missing > 0:
+            self.counts.extend([0] * missing)
+            self.epochs.extend([0.0] * missing)
+
+    def record(self, neuron_ids: Iterable[int]):
+        """반환된 뉴런들의 활성화를 기록 (O(결과 수))"""
+        neuron_ids = list(neuron_ids)
+        if not neuron_ids:
+            return
+        now = time.time()
+        with self._lock:
+            self._grow(max(neuron_ids) + 1)
+            for neuron_id in neuron_ids:
+                self.counts[neuron_id] += 1
+                self.epochs[neuron_id] = now
+                self._dirty.add(neuron_id)
+
+    def pending(self) -> int:
+        """아직 뉴런에 반영되지 않은 활성화 수"""
+        with self._lock:
+            return sum(self.counts[neuron_id] for neuron_id in self._dirty)
+
+    def flush(self, neurons: Dict):
+        """모아둔 활성화를 뉴런 객체에 반영하고 카운터 초기화"""
+        with self._lock:
+            for neuron_id in self._dirty:
+                neuron = neurons.get(neuron_id)
+                if neuron is not None:
+                    neuron.activation_count += self.counts[neuron_id]
+                    neuron.last_accessed = datetime.fromtimestamp(self.epochs[neuron_id]).isoformat()
+                self.counts[neuron_id] = 0
+            self._dirty.clear()
@@ -0,0 +1,209 @@
+"""
+지식 뉴런 근사 최근접 이웃 색인 - HNSW (순수 Python + NumPy, CPU 전용)
+"""
+
+import heapq
+import json
+import math
+import os
+import random
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.atomic_io import atomic_write
+from utils.hashing import stable_hash
+
+from .knowledge_index import char_ngrams
+
+
+def hashed_vector(text: str, dim: int = 256) -> np.ndarray:
+    """문자 n-gram feature hashing → L2 정규화된 고정 길이 벡터
+
+    해시 값의 한 비트를 부호로 써서 충돌로 인한 편향을 상쇄한다.
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    for gram in char_ngrams(text):
+        hashed = stable_hash(gram)
+        vector[hashed % dim] += 1.0 if (hashed >> 31) & 1 else -1.0
+    norm = float(np.linalg.norm(vector))
+    if norm > 0:
+        vector /= norm
+    return vector
+
+
+class HNSWIndex:
+    """계층형 작은 세계 그래프 (Hierarchical Navigable Small World)
+
+    벡터는 L2 정규화되어 있다고 보고 내적(코사인)이 클수록 가깝다.
+    ef_search를 키우면 재현율이 오르고 검색이 느려진다.
+    """
+
+    def __init__(self, dim: int = 256, m: int = 16, ef_construction: int = 100,
+                 ef_search: int = 64, seed: int = 42):
+        self.dim = dim
+        self.m = m
+        self.max_links0 = m * 2  # 0층은 이웃을 두 배까지 허용
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.seed = seed
+        self._level_scale = 1.0 / math.log(m)
+        self._rng = random.Random(seed)
+
+        self.vectors = np.zeros((16, dim), dtype=np.float32)
+        self.neuron_ids: List[int] = []
+        self.links: List[List[List[int]]] = []  # links[행][층] = 이웃 행 번호
+        self.row_of: Dict[int, int] = {}
+        self.entry_point: Optional[int] = None
+        self.max_level = -1
+
+    def __len__(self) -> int:
+        return len(self.neuron_ids)
+
+    def __contains__(self, neuron_id: int) -> bool:
+        return neuron_id in self.row_of
+
+    def _random_level(self) -> int:
+        return int(-math.log(1.0 - self._rng.random()) * self._level_scale)
+
+    def _search_layer(self, query: np.ndarray, entry_rows: List[int], ef: int,
+                      level: int) -> List[Tuple[float, int]]:
+        """한 층에서 ef개 근접 후보 탐색 → (유사도, 행) 최소 힙"""
+        visited = set(entry_rows)
+        similarities = (self.vectors[entry_rows] @ query).tolist()
+        candidates = [(-sim, row) for sim, row in zip(similarities, entry_rows)]
+        heapq.heapify(candidates)
+        results = [(sim, row) for sim, row in zip(similarities, entry_rows)]
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+
+        while candidates:
+            neg_sim, row = heapq.heappop(candidates)
+            if len(results) >= ef and -neg_sim < results[0][0]:
+                break
+            neighbors = [n for n in self.links[row][level] if n not in visited]
+            if not neighbors:
+                continue
+            visited.update(neighbors)
+            for sim, neighbor in zip((self.vectors[neighbors] @ query).tolist(), neighbors):
+                if len(results) < ef or sim > results[0][0]:
+                    heapq.heappush(candidates, (-sim, neighbor))
+                    heapq.heappush(results, (sim, neighbor))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+        return results
+
+    def _shrink_links(self, row: int, level: int):
+        """이웃이 상한을 넘으면 가까운 것만 남김"""
+        limit = self.max_links0 if level == 0 else self.m
+        neighbors = self.links[row][level]
+        if len(neighbors) <= limit:
+            return
+        similarities = self.vectors[neighbors] @ self.vectors[row]
+        keep = np.argsort(-similarities, kind='stable')[:limit]
+        self.links[row][level] = [neighbors[i] for i in keep]
+
+    def add(self, neuron_id: int, vector: np.ndarray):
+        """뉴런 벡터 증분 삽입"""
+        if neuron_id in self.row_of:
+            return
+        row = len(self.neuron_ids)
+        if row >= len(self.vectors):
+            grown = np.zeros((len(self.vectors) * 2, self.dim), dtype=np.float32)
+            grown[:row] = self.vectors[:row]
+            self.vectors = grown
+        self.vectors[row] = vector
+        self.neuron_ids.append(neuron_id)
+        self.row_of[neuron_id] = row
+        level = self._random_level()
+        self.links.append([[] for _ in range(level + 1)])
+
+        if self.entry_point is None:
+            self.entry_point, self.max_level = row, level
+            return
+
+        query = self.vectors[row]
+        entry = [self.entry_point]
+        for layer in range(self.max_level, level, -1):
+            best = max(self._search_layer(query, entry, 1, layer))
+            entry = [best[1]]
+        for layer in range(min(level, self.max_level), -1, -1):
+            found = self._search_layer(query, entry, self.ef_construction, layer)
+            nearest = [r for _, r in heapq.nlargest(self.m, found)]
+            self.links[row][layer] = nearest
+            for neighbor in nearest:
+                self.links[neighbor][layer].append(row)
+                self._shrink_links(neighbor, layer)
+            entry = [r for _, r in found]
+
+        if level > self.max_level:
+            self.entry_point, self.max_level = row, level
+
+    def search(self, query: np.ndarray, k: int, ef: Optional[int] = None) -> List[Tuple[int, float]]:
+        """근사 상위 k개 (뉴런ID, 코사인 유사도)"""
+        if self.entry_point is None or k <= 0:
+            return []
+        ef = max(ef or self.ef_search, k)
+        entry = [self.entry_point]
+        for layer in range(self.max_level, 0, -1):
+            best = max(self._search_layer(query, entry, 1, layer))
+            entry = [best[1]]
+        found = heapq.nlargest(k, self._search_layer(query, entry, ef, 0))
+        return [(self.neuron_ids[row], sim) for sim, row in found]
+
+    def save(self, path: str):
+        """그래프를 .npz로 저장 (층별 이웃은 평탄화한 배열 + 개수)"""
+        counts, flat = [], []
+        for row_links in self.links:
+            for neighbors in row_links:
+                counts.append(len(neighbors))
+                flat.extend(neighbors)
+        config = {'dim': self.dim, 'm': self.m, 'ef_construction': self.ef_construction,
+                  'ef_search': self.ef_search, 'seed': self.seed,
+                  'entry_point': self.entry_point, 'max_level': self.max_level}
+        # 색인은 스냅샷에서 다시 만들 수 있으므로 직전 파일은 남기지 않음
+        atomic_write(path, lambda f: np.savez(
+            f, config=np.array(json.dumps(config)),
+            vectors=self.vectors[:len(self.neuron_ids)],
+            neuron_ids=np.array(self.neuron_ids, dtype=np.int64),
+            levels=np.array([len(l) - 1 for l in self.links], dtype=np.int32),
+            link_counts=np.array(counts, dtype=np.int32),
+            links=np.array(flat, dtype=np.int32)), keep_previous=False)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['HNSWIndex']:
+        """저장된 그래프 로드 (파일이 없거나 깨졌으면 None)"""
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                config = json.loads(str(data['config']))
+                index = cls(dim=config['dim'], m=config['m'],
+                            ef_construction=config['ef_construction'],
+                            ef_search=config['ef_search'], seed=config['seed'])
+                vectors = data['vectors']
+                index.vectors = np.zeros((max(16, len(vectors)), index.dim), dtype=np.float32)
+                index.vectors[:len(vectors)] = vectors
+                index.neuron_ids = data['neuron_ids'].tolist()
+                counts = data['link_counts'].tolist()
+                flat = data['links'].tolist()
+                levels = data['levels'].tolist()
+            index.row_of = {neuron_id: row for row, neuron_id in enumerate(index.neuron_ids)}
+            position = slot = 0
+            for level in levels:
+                row_links = []
+                for _ in range(level + 1):
+                    row_links.append(flat[position:position + counts[slot]])
+                    position += counts[slot]
+                    slot += 1
+                index.links.append(row_links)
+            index.entry_point = config['entry_point']
+            index.max_level = config['max_level']
+            # 이어서 삽입할 때 층 배정이 처음부터 반복되지 않도록 상태를 진행시킨다
+            for _ in range(len(index.neuron_ids)):
+                index._random_level()
+            return index
+        except Exception as e:
+            print(f"⚠️ ANN 색인 로드 실패: {e}")
+            return None
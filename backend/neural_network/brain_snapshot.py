@@ -0,0 +1,301 @@
+"""
+지식 브레인 바이너리 스냅샷 - 열(column) 배열 + CSR 연결 + 문자열 블롭
+
+    MAGIC(8) | version(uint32) | CRC32(uint32) | 헤더 길이(uint64) | 헤더 JSON | 배열들(64바이트 정렬)
+
+헤더에는 메타데이터와 배열 목록(dtype, shape, 시작 위치)이 들어 있다.
+역색인 포스팅도 함께 저장해 로드할 때 뉴런 내용을 다시 토큰화하지 않는다.
+버전 2부터 본문은 ContentStore 파일에 두고 (시작 위치, 길이)만 기록하고,
+버전 3은 레코드별 압축 코덱과 압축 사전 식별값을 더한다.
+버전 1(본문 블롭 내장)과 2도 읽을 수 있다.
+CRC32는 접두부 뒤 전체의 체크섬이다 (0이면 검사하지 않음 - 예전에 저장한 파일).
+"""
+
+import itertools
+import json
+import os
+import struct
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.atomic_io import atomic_write
+
+MAGIC = b"NBRAIN\x00\x00"
+VERSION = 3
+_READABLE_VERSIONS = (1, 2, 3)
+_PREFIX = struct.Struct("<8sIIQ")
+_ALIGN = 64
+
+
+class SnapshotFormatError(ValueError):
+    """바이너리 스냅샷이 아니거나 지원하지 않는 버전, 또는 손상된 파일"""
+
+
+def _id_dtype(max_value: int):
+    return np.int32 if max_value < 2 ** 31 else np.int64
+
+
+def _narrow(values: np.ndarray) -> np.ndarray:
+    """0 이상 정수 배열을 값이 들어가면 int32로 (위치/길이 배열용)"""
+    if values.dtype == np.int64 and (not len(values) or values.max() < 2 ** 31):
+        return values.astype(np.int32)
+    return values
+
+
+def _encode_times(values: Sequence[Optional[str]]) -> Tuple[np.ndarray, Dict[str, Optional[str]]]:
+    """ISO 시각 문자열 → epoch 마이크로초 int64 (None은 NaT)
+
+    정확히 같은 문자열로 되돌아오지 않는 값은 {행 번호: 원문}으로 따로 돌려준다.
+    """
+    text = ["NaT" if value is None else value for value in values]
+    try:
+        moments = np.array(text, dtype="datetime64[us]")
+    except ValueError:
+        moments = np.empty(len(text), dtype="datetime64[us]")
+        for row, value in enumerate(text):
+            try:
+                moments[row] = np.datetime64(value, "us")
+            except ValueError:
+                moments[row] = np.datetime64("NaT")
+    micros = moments.astype(np.int64)
+    restored = _decode_times(micros)
+    raw = {str(row): value for row, (value, back) in enumerate(zip(values, restored)) if value != back}
+    return micros, raw
+
+
+def _decode_times(micros: np.ndarray) -> List[Optional[str]]:
+    """epoch 마이크로초 → datetime.isoformat()과 같은 문자열 (마이크로초 0이면 생략)"""
+    text = np.datetime_as_string(micros.astype("datetime64[us]"), unit="us").tolist()
+    return [None if value == "NaT" else value[:-7] if value.endswith(".000000") else value
+            for value in text]
+
+
+def _pack_strings(values: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """문자열 목록 → (UTF-8 블롭, 바이트 시작 위치 N+1개, 글자 시작 위치 N+1개)"""
+    encoded = [value.encode("utf-8") for value in values]
+    byte_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(item) for item in encoded], out=byte_offsets[1:])
+    char_offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in values], out=char_offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), _narrow(byte_offsets), _narrow(char_offsets)
+
+
+def _unpack_strings(blob: np.ndarray, char_offsets: np.ndarray) -> List[str]:
+    """블롭을 한 번에 디코딩한 뒤 글자 위치로 자름"""
+    text = blob.tobytes().decode("utf-8")
+    bounds = char_offsets.tolist()
+    return [text[bounds[i]:bounds[i + 1]] for i in range(len(bounds) - 1)]
+
+
+def _encode_categories(values: Sequence[str]) -> Tuple[np.ndarray, List[str]]:
+    """반복이 많은 문자열(주제, 출처) → (코드 배열, 고유값 목록)"""
+    table: Dict[str, int] = {}
+    codes = np.fromiter((table.setdefault(value, len(table)) for value in values),
+                        dtype=np.int32, count=len(values))
+    return codes, list(table)
+
+
+def _encode_postings(postings: Dict[str, List[int]], id_dtype) -> Dict[str, np.ndarray]:
+    terms, _, term_offsets = _pack_strings(list(postings))
+    indptr = np.zeros(len(postings) + 1, dtype=np.int64)
+    np.cumsum([len(posting) for posting in postings.values()], out=indptr[1:])
+    ids = np.fromiter(itertools.chain.from_iterable(postings.values()),
+                      dtype=id_dtype, count=int(indptr[-1]))
+    return {"terms": terms, "term_offsets": term_offsets, "indptr": _narrow(indptr), "ids": ids}
+
+
+def _decode_postings(arrays: Dict[str, np.ndarray], prefix: str, id_objects: List) -> Dict[str, List[int]]:
+    """포스팅 복원 - 뉴런 ID int 객체를 공유해 항목당 포인터 하나만 쓰게 함"""
+    terms = _unpack_strings(arrays[prefix + "terms"], arrays[prefix + "term_offsets"])
+    ids = list(map(id_objects.__getitem__, arrays[prefix + "ids"].tolist()))
+    bounds = arrays[prefix + "indptr"].tolist()
+    return {term: ids[bounds[i]:bounds[i + 1]] for i, term in enumerate(terms)}
+
+
+def write_snapshot(path: str, neurons: Iterable, meta: Dict, content_index, topic_index, store):
+    """뉴런들(ID 오름차순)과 역색인을 바이너리 스냅샷으로 저장 (임시 파일 → rename, 기존 파일은 .prev)
+
+    모든 뉴런 본문은 미리 store로 옮겨져 있어야 한다 (content_ref가 있어야 함).
+    """
+    neurons = list(neurons)
+    count = len(neurons)
+    id_dtype = _id_dtype(neurons[-1].id if neurons else 0)
+    arrays: Dict[str, np.ndarray] = {
+        "ids": np.fromiter((n.id for n in neurons), dtype=id_dtype, count=count),
+        "confidence": np.fromiter((n.confidence for n in neurons), dtype=np.float64, count=count),
+        "activation_count": np.fromiter((n.activation_count for n in neurons), dtype=np.int64, count=count),
+    }
+
+    # 시각은 int64 마이크로초, 정확히 되돌릴 수 없는 문자열만 헤더에 원문 보관
+    arrays["created_at"], raw_created = _encode_times([n.created_at for n in neurons])
+    arrays["last_accessed"], raw_accessed = _encode_times([n.last_accessed for n in neurons])
+
+    # 연결: CSR (행 = 뉴런 순서, 값 = 대상 ID/가중치, 원래 dict 순서 유지)
+    indptr = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum([len(n.connections) for n in neurons], out=indptr[1:])
+    arrays["conn_indptr"] = _narrow(indptr)
+    arrays["conn_targets"] = np.fromiter(
+        map(int, itertools.chain.from_iterable(n.connections for n in neurons)),
+        dtype=id_dtype, count=int(indptr[-1]))
+    arrays["conn_weights"] = np.fromiter(
+        itertools.chain.from_iterable(n.connections.values() for n in neurons),
+        dtype=np.float64, count=int(indptr[-1]))
+
+    refs = [n.content_ref for n in neurons]
+    if None in refs:
+        raise ValueError("본문이 저장소로 옮겨지지 않은 뉴런이 있음")
+    arrays["content_offsets"] = _narrow(np.fromiter((ref[0] for ref in refs), dtype=np.int64, count=count))
+    arrays["content_lengths"] = _narrow(np.fromiter((ref[1] for ref in refs), dtype=np.int64, count=count))
+    arrays["content_codecs"] = np.fromiter((ref[2] for ref in refs), dtype=np.uint8, count=count)
+    compressed = bool(arrays["content_codecs"].any())
+    for name, index in (("content_token_counts", content_index), ("topic_token_counts", topic_index)):
+        arrays[name] = np.fromiter((index.sizes.get(n.id, 0) for n in neurons), dtype=np.int32, count=count)
+    arrays["topic_codes"], topics = _encode_categories([n.topic for n in neurons])
+    arrays["source_codes"], sources = _encode_categories([n.source for n in neurons])
+
+    for prefix, index in (("content_", content_index), ("topic_", topic_index)):
+        for name, array in _encode_postings(index.postings, id_dtype).items():
+            arrays[prefix + name] = array
+
+    table, position = {}, 0
+    for name, array in arrays.items():
+        table[name] = [array.dtype.str, list(array.shape), position]
+        position += -(-array.nbytes // _ALIGN) * _ALIGN
+    header = json.dumps({"meta": meta, "topics": topics, "sources": sources,
+                         "raw_created_at": raw_created, "raw_last_accessed": raw_accessed,
+                         "content_file": os.path.basename(store.path), "content_size": store.size,
+                         "content_dict_id": store.dictionary_id if compressed else 0,
+                         "arrays": table}, ensure_ascii=False).encode("utf-8")
+    data_start = -(-(_PREFIX.size + len(header)) // _ALIGN) * _ALIGN
+
+    def write(f):
+        # 체크섬은 쓰면서 계산하고 마지막에 접두부를 다시 씀
+        f.write(_PREFIX.pack(MAGIC, VERSION, 0, len(header)))
+        crc = 0
+        for chunk in _chunks(header, data_start - _PREFIX.size - len(header), arrays):
+            f.write(chunk)
+            crc = zlib.crc32(chunk, crc)
+        f.seek(0)
+        f.write(_PREFIX.pack(MAGIC, VERSION, crc, len(header)))
+
+    atomic_write(path, write)
+
+
+def _chunks(header: bytes, padding: int, arrays: Dict[str, np.ndarray]):
+    yield header
+    yield b"\x00" * padding
+    for array in arrays.values():
+        yield np.ascontiguousarray(array).tobytes()
+        yield b"\x00" * (-array.nbytes % _ALIGN)
+
+
+def read_header(buffer) -> Tuple[Dict, int]:
+    """(헤더 dict, 배열 영역 시작 위치)"""
+    if len(buffer) < _PREFIX.size:
+        raise SnapshotFormatError("스냅샷이 너무 짧음")
+    magic, version, checksum, header_length = _PREFIX.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise SnapshotFormatError("브레인 스냅샷 파일이 아님")
+    if version not in _READABLE_VERSIONS:
+        raise SnapshotFormatError(f"지원하지 않는 스냅샷 버전: {version}")
+    if checksum and zlib.crc32(memoryview(buffer)[_PREFIX.size:]) != checksum:
+        raise SnapshotFormatError("스냅샷 체크섬 불일치 (저장 중 끊겼거나 손상됨)")
+    header = json.loads(bytes(buffer[_PREFIX.size:_PREFIX.size + header_length]).decode("utf-8"))
+    header["version"] = version
+    return header, -(-(_PREFIX.size + header_length) // _ALIGN) * _ALIGN
+
+
+def read_content_file(path: str) -> Optional[str]:
+    """헤더에 적힌 본문 저장소 파일 이름만 읽음 (체크섬 검사 없음, 버전 1이나 읽을 수 없으면 None)"""
+    with open(path, "rb") as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            return None
+        magic, _, _, header_length = _PREFIX.unpack(prefix)
+        if magic != MAGIC:
+            return None
+        try:
+            return json.loads(f.read(header_length).decode("utf-8")).get("content_file")
+        except ValueError:
+            return None
+
+
+def read_arrays(buffer, header: Dict, data_start: int) -> Dict[str, np.ndarray]:
+    """헤더의 배열 목록대로 버퍼 위의 numpy 뷰 생성 (복사 없음)"""
+    arrays = {}
+    for name, (dtype, shape, position) in header["arrays"].items():
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape)) if shape else 1
+        arrays[name] = np.frombuffer(buffer, dtype=dtype, count=count,
+                                     offset=data_start + position).reshape(shape)
+    return arrays
+
+
+IndexData = Tuple[Dict[str, List[int]], Optional[Dict[int, int]]]
+
+
+def read_snapshot(path: str, neuron_cls, store) -> Tuple[List, Dict, IndexData, IndexData]:
+    """스냅샷 로드 → (뉴런 목록, 메타, (내용 포스팅, 토큰 수), (주제 포스팅, 토큰 수))
+
+    버전 2는 본문을 읽지 않고 뉴런에 store 위치만 연결한다.
+    버전 1은 토큰 수가 없어 None을 돌려준다.
+    """
+    with open(path, "rb") as f:
+        buffer = f.read()
+    header, data_start = read_header(buffer)
+    arrays = read_arrays(buffer, header, data_start)
+    external = header["version"] >= 2
+    if external and store.size < header["content_size"]:
+        raise SnapshotFormatError(f"본문 저장소가 스냅샷보다 짧음: {store.path}")
+    if header.get("content_dict_id") and header["content_dict_id"] != store.dictionary_id:
+        raise SnapshotFormatError(f"본문 압축 사전이 스냅샷과 맞지 않음: {store.dict_path}")
+
+    ids = arrays["ids"].tolist()
+    confidence = arrays["confidence"].tolist()
+    activation_count = arrays["activation_count"].tolist()
+    created = _decode_times(arrays["created_at"])
+    for row, value in header["raw_created_at"].items():
+        created[int(row)] = value
+    accessed = _decode_times(arrays["last_accessed"])
+    for row, value in header["raw_last_accessed"].items():
+        accessed[int(row)] = value
+    if external:
+        contents = [None] * len(ids)
+        content_offsets = arrays["content_offsets"].tolist()
+        content_lengths = arrays["content_lengths"].tolist()
+        content_codecs = (arrays["content_codecs"].tolist() if "content_codecs" in arrays
+                          else [0] * len(ids))
+    else:
+        contents = _unpack_strings(arrays["content"], arrays["content_char_offsets"])
+    topics = header["topics"]
+    topic_codes = arrays["topic_codes"].tolist()
+    sources = header["sources"]
+    source_codes = arrays["source_codes"].tolist()
+    bounds = arrays["conn_indptr"].tolist()
+    targets = list(map(str, arrays["conn_targets"].tolist()))
+    weights = arrays["conn_weights"].tolist()
+
+    neurons = []
+    for row, neuron_id in enumerate(ids):
+        neuron = neuron_cls(neuron_id, contents[row], topics[topic_codes[row]],
+                            sources[source_codes[row]], confidence[row])
+        start, end = bounds[row], bounds[row + 1]
+        neuron.connections = dict(zip(targets[start:end], weights[start:end]))
+        neuron.activation_count = activation_count[row]
+        neuron.created_at = created[row]
+        neuron.last_accessed = accessed[row]
+        if external:
+            neuron.attach_content(store, content_offsets[row], content_lengths[row], content_codecs[row])
+        neurons.append(neuron)
+
+    id_objects: List[Optional[int]] = [None] * (ids[-1] + 1 if ids else 0)
+    for neuron_id in ids:
+        id_objects[neuron_id] = neuron_id
+    content_sizes = topic_sizes = None
+    if external:
+        content_sizes = dict(zip(ids, arrays["content_token_counts"].tolist()))
+        topic_sizes = dict(zip(ids, arrays["topic_token_counts"].tolist()))
+    return (neurons, header["meta"], (_decode_postings(arrays, "content_", id_objects), content_sizes),
+            (_decode_postings(arrays, "topic_", id_objects), topic_sizes))
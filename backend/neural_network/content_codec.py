@@ -0,0 +1,129 @@
+"""
+뉴런 본문 압축 - 본문들에서 학습한 공유 사전으로 레코드 단위 압축
+
+뉴런 본문은 "[주제: ...]", "[분석 A]", "**핵심 개념:**" 같은 틀과 비슷한
+설명 문구가 반복되므로, 자주 나오는 구절을 미리 사전에 넣어 두면 짧은
+레코드 하나만 압축해도 잘 줄어든다. zlib 프리셋 사전을 기본으로 쓰고
+zstandard 패키지가 있으면 zstd 사전도 쓸 수 있다.
+"""
+
+import zlib
+from collections import Counter
+from typing import List, Sequence
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+# 레코드별 코덱 번호 (스냅샷에 uint8로 저장)
+RAW, ZLIB, ZSTD = 0, 1, 2
+METHODS = {'zlib': ZLIB, 'zstd': ZSTD}
+
+ZLIB_DICT_SIZE = 32 * 1024  # deflate 창 크기 - 이보다 앞쪽 사전은 참조되지 않음
+ZSTD_DICT_SIZE = 64 * 1024
+_MAX_SAMPLES = 2000
+_MAX_SAMPLE_CHARS = 4000
+_MAX_SEGMENT_BYTES = 256
+
+
+def _samples(texts: Sequence[str]) -> List[str]:
+    """학습용 표본 - 고르게 골라 앞부분만"""
+    step = max(1, len(texts) // _MAX_SAMPLES)
+    return [text[:_MAX_SAMPLE_CHARS] for text in texts[::step]]
+
+
+def train_dictionary(texts: Sequence[str], size: int = ZLIB_DICT_SIZE) -> bytes:
+    """여러 본문에 반복되는 줄/단어 n-gram으로 프리셋 사전 구성
+
+    (등장 문서 수 - 1) * 바이트 길이가 큰 구절부터 고르고, 이미 고른 구절에
+    포함되는 것은 뺀다. deflate는 가까운 거리를 싸게 부호화하므로
+    가장 쓸모 있는 구절이 사전 끝에 오도록 역순으로 붙인다.
+    """
+    doc_freq: Counter = Counter()
+    for text in _samples(texts):
+        segments = set()
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            segments.add(line)
+            words = line.split()
+            for n in (2, 3, 4):
+                for start in range(len(words) - n + 1):
+                    segments.add(" ".join(words[start:start + n]))
+        doc_freq.update(segments)
+
+    candidates = []
+    for segment, count in doc_freq.items():
+        length = len(segment.encode("utf-8"))
+        if count >= 2 and length <= _MAX_SEGMENT_BYTES:
+            candidates.append(((count - 1) * length, segment))
+    candidates.sort(key=lambda item: (-item[0], item[1]))
+
+    chosen: List[str] = []
+    joined, used = "", 0
+    for _, segment in candidates:
+        if used >= size:
+            break
+        length = len(segment.encode("utf-8")) + 1
+        if used + length > size or segment in joined:
+            continue
+        chosen.append(segment)
+        joined += segment + "\n"
+        used += length
+    return "\n".join(reversed(chosen)).encode("utf-8")
+
+
+class ContentCodec:
+    """한 사전으로 레코드를 압축/해제 (사전은 한 번 정하면 바꾸지 않음)"""
+
+    def __init__(self, method: str, dictionary: bytes):
+        if method not in METHODS:
+            raise ValueError(f"알 수 없는 압축 방식: {method} (zlib / zstd)")
+        if method == 'zstd' and not ZSTD_AVAILABLE:
+            raise ValueError("zstd 압축에는 'pip install zstandard'가 필요합니다")
+        self.method = method
+        self.codec_id = METHODS[method]
+        self.dictionary = dictionary
+        if method == 'zstd':
+            zdict = zstandard.ZstdCompressionDict(dictionary)
+            self._compressor = zstandard.ZstdCompressor(level=19, dict_data=zdict)
+            self._decompressor = zstandard.ZstdDecompressor(dict_data=zdict)
+
+    @classmethod
+    def train(cls, method: str, texts: Sequence[str]) -> 'ContentCodec':
+        """본문들로 사전 학습 - zstd 학습기가 표본 부족으로 실패하면 zlib식 사전을 그대로 씀"""
+        dictionary = train_dictionary(texts)
+        if method == 'zstd' and ZSTD_AVAILABLE:
+            samples = [text.encode("utf-8") for text in _samples(texts)]
+            try:
+                dictionary = zstandard.train_dictionary(ZSTD_DICT_SIZE, samples).as_bytes()
+            except zstandard.ZstdError:
+                pass
+        return cls(method, dictionary)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.codec_id == ZSTD:
+            return self._compressor.compress(data)
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -15, zdict=self.dictionary)
+        return compressor.compress(data) + compressor.flush()
+
+    def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+        """레코드 해제 - max_length > 0이면 앞부분만 풀고 멈춤"""
+        if self.codec_id == ZSTD:
+            if max_length > 0:
+                return self._decompressor.stream_reader(data).read(max_length)
+            return self._decompressor.decompress(data)
+        decompressor = zlib.decompressobj(-15, zdict=self.dictionary)
+        return decompressor.decompress(data, max_length)
+
+    def to_bytes(self) -> bytes:
+        return self.method.encode("ascii") + b"\n" + self.dictionary
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'ContentCodec':
+        method, _, dictionary = data.partition(b"\n")
+        return cls(method.decode("ascii"), dictionary)
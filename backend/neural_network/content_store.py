@@ -0,0 +1,206 @@
+"""
+뉴런 본문 저장소 - 추가 전용 UTF-8 블롭 파일 + 읽기 전용 mmap
+
+검색 채점은 역색인 통계만 쓰므로 본문은 답변을 만들 때만 필요하다.
+본문을 메모리에 두지 않고 (시작 위치, 바이트 길이, 코덱)만 들고 있다가
+읽을 때 mmap에서 잘라 (압축돼 있으면 풀어서) 디코딩한다. 여러 서버
+프로세스가 같은 파일을 열면 페이지 캐시를 공유한다 (쓰기는 한 프로세스만).
+
+교체되거나 지워진 뉴런의 본문은 파일에 그대로 남으므로, 살아 있는 레코드만
+다음 세대 파일(<base>.content.<n>.bin)로 옮겨 적는다 (compact). 한 번 쓴 파일은
+바뀌지 않아 직전 스냅샷(.prev)은 자기가 가리키는 세대 파일로 계속 읽을 수 있다.
+"""
+
+import mmap
+import os
+import threading
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.atomic_io import atomic_write
+
+from .content_codec import RAW, ContentCodec
+
+ContentRef = Tuple[int, int, int]  # (시작 위치, 바이트 길이, 코덱 번호)
+
+# 사전은 한 번 정하면 못 바꾸므로 본문이 이만큼 모인 뒤에 학습
+MIN_TRAINING_TEXTS = 32
+
+
+class ContentStore:
+    """<base>.content.bin (또는 세대 파일) - 한 번 쓴 본문은 바뀌지 않고 뒤에 덧붙이기만 함
+
+    base_path는 세대 0 파일이자 세대 파일 이름과 압축 사전 경로의 기준이다.
+    """
+
+    def __init__(self, path: str, compression: str = 'off', base_path: Optional[str] = None):
+        if compression not in ('off', 'zlib', 'zstd'):
+            raise ValueError(f"알 수 없는 본문 압축 방식: {compression} (off / zlib / zstd)")
+        self.path = path
+        self.base_path = base_path or path
+        self.compression = compression
+        self.dict_path = os.path.splitext(self.base_path)[0] + '.dict'
+        self._lock = threading.Lock()
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        # 사전 파일이 있으면 압축 설정과 무관하게 읽기용으로 로드
+        self.codec: Optional[ContentCodec] = None
+        if os.path.exists(self.dict_path):
+            try:
+                with open(self.dict_path, 'rb') as f:
+                    self.codec = ContentCodec.from_bytes(f.read())
+            except ValueError as e:
+                # 압축된 레코드가 있는 스냅샷은 사전 식별값이 안 맞아 로드 단계에서 걸러짐
+                print(f"⚠️ 본문 압축 사전 로드 실패: {e}")
+
+    @property
+    def size(self) -> int:
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    @property
+    def dictionary_id(self) -> int:
+        """사전 식별값 (CRC32, 사전 없으면 0) - 스냅샷과 짝이 맞는지 확인용"""
+        return zlib.crc32(self.codec.to_bytes()) if self.codec is not None else 0
+
+    def needs_dictionary(self, available: int) -> bool:
+        return self.compression != 'off' and self.codec is None and available >= MIN_TRAINING_TEXTS
+
+    def train(self, texts: Sequence[str]):
+        """공유 사전 학습 후 저장 (이후 추가되는 레코드부터 압축)"""
+        codec = ContentCodec.train(self.compression, texts)
+        atomic_write(self.dict_path, lambda f: f.write(codec.to_bytes()), keep_previous=False)
+        self.codec = codec
+        print(f"🗜️ 본문 압축 사전 학습: {codec.method}, {len(codec.dictionary) / 1024:.1f}KB")
+
+    def _encode(self, text: str) -> Tuple[bytes, int]:
+        raw = text.encode("utf-8")
+        if self.codec is not None and self.compression != 'off':
+            packed = self.codec.compress(raw)
+            if len(packed) < len(raw):
+                return packed, self.codec.codec_id
+        return raw, RAW
+
+    def append_many(self, texts: Sequence[str]) -> List[ContentRef]:
+        """본문들을 (사전이 있으면 레코드별 압축해) 파일 끝에 이어 쓰고 위치 목록 반환
+
+        스냅샷이 가리키기 전에 디스크에 있어야 하므로 fsync까지 한다.
+        """
+        encoded = [self._encode(text) for text in texts]
+        with open(self.path, "ab") as f:
+            offset = f.tell()
+            f.write(b"".join(data for data, _ in encoded))
+            f.flush()
+            os.fsync(f.fileno())
+        refs = []
+        for data, codec in encoded:
+            refs.append((offset, len(data), codec))
+            offset += len(data)
+        return refs
+
+    def generations(self) -> Dict[int, str]:
+        """디스크에 있는 같은 계열 파일 {세대: 경로} (세대 0 = base_path)"""
+        root, ext = os.path.splitext(self.base_path)
+        directory = os.path.dirname(self.base_path)
+        prefix = os.path.basename(root) + '.'
+        found = {0: self.base_path} if os.path.exists(self.base_path) else {}
+        for name in os.listdir(directory or '.'):
+            number = name[len(prefix):-len(ext)] if name.startswith(prefix) and name.endswith(ext) else ''
+            if number.isdigit():
+                found[int(number)] = os.path.join(directory, name)
+        return found
+
+    def sibling(self, name: str) -> 'ContentStore':
+        """같은 디렉터리의 다른 세대 파일 (스냅샷 헤더의 content_file)"""
+        path = os.path.join(os.path.dirname(self.base_path), name)
+        return self if path == self.path else ContentStore(path, self.compression, self.base_path)
+
+    def successor(self) -> 'ContentStore':
+        """아직 없는 다음 세대의 빈 저장소 (파일은 처음 쓸 때 생김)"""
+        root, ext = os.path.splitext(self.base_path)
+        number = max(self.generations(), default=0) + 1
+        return ContentStore(f"{root}.{number}{ext}", self.compression, self.base_path)
+
+    def compact(self, refs: Sequence[ContentRef]) -> Tuple['ContentStore', List[ContentRef]]:
+        """refs가 가리키는 레코드만 다음 세대 파일로 복사 → (새 저장소, 새 위치 목록)
+
+        압축된 레코드도 바이트 그대로 옮기므로 사전은 그대로 쓴다.
+        """
+        target = self.successor()
+        moved: List[ContentRef] = []
+
+        def write(f):
+            position = 0
+            for offset, length, codec in refs:
+                f.write(self.read_bytes(offset, length))
+                moved.append((position, length, codec))
+                position += length
+
+        atomic_write(target.path, write, keep_previous=False)
+        return target, moved
+
+    def remove_stale(self, keep: Sequence[str]) -> int:
+        """keep(파일 이름)과 지금 쓰는 파일을 뺀 세대 파일 삭제 → 지운 바이트 수
+
+        읽는 중이라 지울 수 없는 파일(Windows)은 남겨 두고 다음 저장 때 다시 시도한다.
+        """
+        keep = set(keep) | {os.path.basename(self.path)}
+        removed = 0
+        for path in self.generations().values():
+            if os.path.basename(path) in keep:
+                continue
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+                removed += size
+            except OSError:
+                pass
+        return removed
+
+    def _remap(self, end: int):
+        """파일이 늘어났으면 다시 매핑 (기존 매핑은 읽는 중일 수 있어 닫지 않고 버림)"""
+        if self._file is None:
+            self._file = open(self.path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < end:
+            raise ValueError(f"본문 저장소가 잘림: {self.path} ({size} < {end})")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def read_bytes(self, offset: int, length: int) -> bytes:
+        end = offset + length
+        data = self._map
+        if data is None or len(data) < end:
+            with self._lock:
+                if self._map is None or len(self._map) < end:
+                    self._remap(end)
+                data = self._map
+        return data[offset:end]
+
+    def _codec(self, codec: int) -> ContentCodec:
+        if self.codec is None or self.codec.codec_id != codec:
+            raise ValueError(f"압축 사전이 없거나 맞지 않음: {self.dict_path} (코덱 {codec})")
+        return self.codec
+
+    def read(self, offset: int, length: int, codec: int = RAW) -> str:
+        data = self.read_bytes(offset, length)
+        if codec != RAW:
+            data = self._codec(codec).decompress(data)
+        return data.decode("utf-8")
+
+    def read_prefix(self, offset: int, length: int, codec: int, chars: int) -> str:
+        """앞 chars글자만 - UTF-8 한 글자는 최대 4바이트라 그만큼만 읽거나 풂"""
+        if codec == RAW:
+            head = self.read_bytes(offset, min(length, chars * 4))
+        else:
+            head = self._codec(codec).decompress(self.read_bytes(offset, length), chars * 4)
+        return head.decode("utf-8", errors="ignore")[:chars]
+
+    def get_status(self) -> Dict:
+        return {'file': os.path.basename(self.path), 'bytes': self.size, 'compression': self.compression,
+                'dictionary': self.codec.method if self.codec is not None else None}
+
+    def close(self):
+        with self._lock:
+            self._map = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
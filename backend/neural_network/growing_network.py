@@ -3,11 +3,28 @@
 """
 
 import numpy as np
+import heapq
 import pickle
 import json
 import os
+import threading
+import time
+import zlib
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Callable, Dict, FrozenSet, List, Tuple, Optional, Any
+
+from utils.atomic_io import (PREVIOUS_SUFFIX, GroupCommitLog, atomic_write, atomic_write_json,
+                             checkpoint_candidates, decode_record, encode_record, load_checkpoint)
+from utils.ndjson_stream import StreamReader, write_stream
+
+from .activation_ledger import ActivationLedger
+from .ann_index import HNSWIndex, hashed_vector
+from .brain_snapshot import MAGIC as SNAPSHOT_MAGIC, read_content_file, read_snapshot, write_snapshot
+from .content_store import ContentRef, ContentStore
+from .knowledge_index import TokenIndex, jaccard, token_set, tokenize
+from .knowledge_scorer import BM25Scorer, JaccardScorer, KnowledgeScorer, NgramScorer
+from .query_cache import QueryCache, normalize_query
 
 class KnowledgeNeuron:
     """개별 지식을 저장하는 뉴런"""
@@ -15,7 +32,10 @@ class KnowledgeNeuron:
     def __init__(self, neuron_id: int, content: str, topic: str, 
                  source: str = "Hybrid", confidence: float = 0.8):
         self.id = neuron_id
-        self.content = content
+        self._content: Optional[str] = content
+        # 본문이 저장소로 옮겨지면 (저장소, (시작 위치, 바이트 길이, 코덱))만 남김
+        # - 저장소 압축으로 위치가 바뀔 때 읽는 쪽이 짝이 안 맞는 값을 보지 않도록 한 속성으로 교체
+        self._location: Optional[Tuple[ContentStore, ContentRef]] = None
         self.topic = topic
         self.source = source
         self.confidence = confidence
@@ -23,6 +43,52 @@ class KnowledgeNeuron:
         self.activation_count = 0
         self.created_at = datetime.now().isoformat()
         self.last_accessed: Optional[str] = None
+        # 유사도 계산용 토큰 집합 (처음 쓸 때 한 번만 토큰화)
+        self._content_tokens: Optional[FrozenSet[str]] = None
+        self._topic_tokens: Optional[FrozenSet[str]] = None
+
+    @property
+    def content(self) -> str:
+        content = self._content
+        if content is not None:
+            return content
+        store, ref = self._location
+        return store.read(*ref)
+
+    @content.setter
+    def content(self, value: str):
+        # 위치는 지우지 않음 - 읽는 쪽이 본문(None)을 본 뒤 위치를 읽어도 항상 값이 있게
+        self._content = value
+
+    @property
+    def content_ref(self) -> Optional[ContentRef]:
+        """저장소 안 (시작 위치, 바이트 길이, 코덱) - 본문이 메모리에 있으면 None"""
+        return None if self._content is not None else self._location[1]
+
+    def attach_content(self, store: ContentStore, offset: int, length: int, codec: int = 0):
+        """본문을 저장소 위치로 대체 (메모리에서 내림) - 위치를 먼저 두고 본문을 내림"""
+        self._location = (store, (offset, length, codec))
+        self._content = None
+
+    def excerpt(self, chars: int) -> str:
+        """본문 앞부분 - 저장소에 있으면 필요한 바이트만 읽거나 풂"""
+        content = self._content
+        if content is not None:
+            return content[:chars]
+        store, ref = self._location
+        return store.read_prefix(*ref, chars)
+
+    @property
+    def content_tokens(self) -> FrozenSet[str]:
+        if self._content_tokens is None:
+            self._content_tokens = token_set(self.content)
+        return self._content_tokens
+
+    @property
+    def topic_tokens(self) -> FrozenSet[str]:
+        if self._topic_tokens is None:
+            self._topic_tokens = token_set(self.topic)
+        return self._topic_tokens
 
     def connect_to(self, other_id: int, weight: float):
         """다른 뉴런과 연결 생성"""
@@ -59,7 +125,12 @@ class KnowledgeNeuron:
 class NeuralBrain:
     """지식 뉴런 네트워크 - 오프라인 사고 가능"""
     
-    def __init__(self, storage_path: str = "data/knowledge/neural_brain.json"):
+    SCORERS = ('jaccard', 'bm25', 'ngram')
+    IMPORT_CHUNK = 1024  # 가져올 때 본문을 저장소로 넘기는 단위
+    
+    def __init__(self, storage_path: str = "data/knowledge/neural_brain.json",
+                 scorer: Optional[str] = None, ann_threshold: Optional[int] = None,
+                 ann_ef: Optional[int] = None):
         self.storage_path = storage_path
         self.neurons: Dict[int, KnowledgeNeuron] = {}
         self.next_id = 1
@@ -67,6 +138,50 @@ class NeuralBrain:
         self.growth_events = 0
         self.topics_learned = set()
         
+        # 역색인: 질의와 토큰을 공유하는 뉴런만 채점
+        self._content_index = TokenIndex()
+        self._topic_index = TokenIndex()
+        self._topic_buckets: Dict[str, set] = {}  # {주제: 뉴런ID 집합}
+        self.scorer = self._make_scorer(scorer or os.getenv('BRAIN_SCORER', 'jaccard'))
+        
+        # 검색은 뉴런을 수정하지 않고 활성화만 장부에 쌓아 두었다가 저장 직전에 반영
+        self.activations = ActivationLedger()
+        # 반복 질문용 검색 결과 캐시 (0이면 끔)
+        self._query_cache = QueryCache(int(os.getenv('BRAIN_QUERY_CACHE', '256')))
+        
+        # 뉴런 수가 임계값 이상이면 HNSW 근사 검색으로 후보를 뽑는다 (0 이하면 끔)
+        self.ann_threshold = (ann_threshold if ann_threshold is not None
+                              else int(os.getenv('BRAIN_ANN_THRESHOLD', '50000')))
+        self.ann_ef = ann_ef or int(os.getenv('BRAIN_ANN_EF', '64'))
+        self.ann_index: Optional[HNSWIndex] = None
+        self.ann_path = os.path.splitext(storage_path)[0] + '.hnsw.npz'
+        # 처음 구축은 백그라운드 스레드에서 - (세대, 스레드), 세대가 바뀌면 진행 중인 결과는 버림
+        self._ann_build: Optional[Tuple[int, threading.Thread]] = None
+        self._ann_generation = 0
+        
+        # 스냅샷 형식: binary(열 배열 + 역색인, 기본) / json(storage_path 그대로)
+        self.snapshot_format = os.getenv('BRAIN_SNAPSHOT_FORMAT', 'binary')
+        if self.snapshot_format not in ('binary', 'json'):
+            raise ValueError(f"알 수 없는 스냅샷 형식: {self.snapshot_format} (binary / json)")
+        self.snapshot_path = os.path.splitext(storage_path)[0] + '.nbrain'
+        # 바이너리 스냅샷의 뉴런 본문은 여기 두고 답변을 만들 때만 읽음
+        # BRAIN_CONTENT_COMPRESSION=zlib/zstd면 학습한 공유 사전으로 레코드별 압축
+        self.content_store = ContentStore(os.path.splitext(storage_path)[0] + '.content.bin',
+                                          os.getenv('BRAIN_CONTENT_COMPRESSION', 'off'))
+        # 버려진 본문(교체/가져오기 전 뉴런)이 살아 있는 본문과 이 값보다 많으면 저장할 때 새 파일로 옮겨 적음
+        self.content_compact_bytes = int(os.getenv('BRAIN_CONTENT_COMPACT_BYTES', str(1024 * 1024)))
+        
+        # 뉴런 추가는 저널에 한 줄씩 덧붙이고, 일정 개수마다 스냅샷으로 압축
+        # 동시에 들어온 기록은 fsync 한 번으로 묶음 (BRAIN_JOURNAL_FSYNC=0이면 fsync 생략)
+        self.journal_path = os.path.splitext(storage_path)[0] + '.journal.ndjson'
+        self.journal_compact_every = int(os.getenv('BRAIN_JOURNAL_COMPACT', '500'))
+        self.journal = GroupCommitLog(self.journal_path, os.getenv('BRAIN_JOURNAL_FSYNC', '1') != '0')
+        self._journal_records = 0
+        self._batch_state = threading.local()
+        # 설정되면 압축을 직접 하지 않고 이 콜백으로 지연 저장에 맡김
+        self.on_dirty: Optional[Callable[[], None]] = None
+        self._write_lock = threading.RLock()
+        
         self._ensure_directory()
         self._load_neurons()
 
@@ -74,35 +189,398 @@ class NeuralBrain:
         os.makedirs(os.path.dirname(self.storage_path), exist_ok=True)
 
     def _load_neurons(self):
-        """저장된 뉴런들 로드"""
+        """저장된 뉴런들 로드 (가장 최근의 온전한 스냅샷 + 저널 재생)"""
         try:
-            if os.path.exists(self.storage_path):
-                with open(self.storage_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                for neuron_data in data.get('neurons', []):
-                    neuron = KnowledgeNeuron.from_dict(neuron_data)
+            paths = [self.snapshot_path, self.storage_path]
+            candidates = checkpoint_candidates(paths)
+            newest = candidates[0] if candidates else None
+            checkpoint, path = load_checkpoint(paths, self._read_checkpoint)
+            if checkpoint is not None:
+                neurons, meta, postings, store = checkpoint
+                self.content_store = store
+                for neuron in neurons:
                     self.neurons[neuron.id] = neuron
+                self.growth_events = meta.get('growth_events', 0)
+                self.topics_learned = set(meta.get('topics_learned', []))
+                self._rebuild_index(postings)
+            # 가장 최근 체크포인트가 아닌 것으로 복구했으면 그 뒤 기록은 압축할 때 넘겨 둔 저널에 있음
+            # (.prev뿐 아니라 첫 바이너리 압축 전의 neural_brain.json으로 돌아간 경우도)
+            recovered = path is not None and path != newest
+            replayed, intact = 0, True
+            if recovered:
+                replayed, intact = self._replay_journal(self.journal_path + PREVIOUS_SUFFIX)
+                self._journal_records = 0
+            current, current_intact = self._replay_journal(self.journal_path)
+            replayed += current
+            intact = intact and current_intact
+            if checkpoint is not None or replayed:
+                self._load_ann()
                 if self.neurons:
                     self.next_id = max(self.neurons.keys()) + 1
-                self.growth_events = data.get('growth_events', 0)
-                self.topics_learned = set(data.get('topics_learned', []))
-                print(f"🧠 지식 뉴런 로드: {len(self.neurons)}개")
+                print(f"🧠 지식 뉴런 로드: {len(self.neurons)}개"
+                      + (f" (저널 {replayed}개 재생)" if replayed else "")
+                      + (f" - 직전 체크포인트 {os.path.basename(path)}에서 복구" if recovered else ""))
+            if not intact or recovered:
+                # 끊긴 줄 뒤에 이어 쓰지 않고 손상된 체크포인트 자리를 채우도록 바로 압축
+                self._save_neurons()
         except Exception as e:
             print(f"⚠️ 지식 뉴런 로드 실패: {e}")
 
-    def _save_neurons(self):
-        """뉴런들을 파일에 저장"""
+    def _read_checkpoint(self, path: str) -> Tuple[List[KnowledgeNeuron], Dict, Optional[Tuple], ContentStore]:
+        """스냅샷 파일 하나 읽기 → (뉴런 목록, 메타, 저장된 역색인, 본문 저장소) - 손상됐으면 예외
+
+        바이너리 스냅샷은 헤더에 적힌 세대의 본문 파일을 쓴다 (.prev는 이전 세대일 수 있음).
+        """
+        with open(path, 'rb') as f:
+            binary = f.read(len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC
+        if binary:
+            content_file = read_content_file(path)
+            store = self.content_store.sibling(content_file) if content_file else self.content_store
+            neurons, meta, content_data, topic_data = read_snapshot(path, KnowledgeNeuron, store)
+            return neurons, meta, (content_data, topic_data), store
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return ([KnowledgeNeuron.from_dict(neuron_data) for neuron_data in data.get('neurons', [])], data, None,
+                self.content_store)
+
+    def _replay_journal(self, path: str) -> Tuple[int, bool]:
+        """스냅샷 이후 저널에 쌓인 뉴런 추가를 재생 → (재생 수, 저널 온전 여부)"""
+        if not os.path.exists(path):
+            return 0, True
+        replayed, intact = 0, True
+        with open(path, 'rb') as f:
+            for line in f:
+                try:
+                    record = decode_record(line)
+                except ValueError:
+                    print(f"⚠️ {os.path.basename(path)} 기록이 끊기거나 손상되어 그 앞까지만 재생")
+                    intact = False
+                    break
+                self._journal_records += 1
+                if record.get('op') != 'neuron':
+                    continue
+                neuron = KnowledgeNeuron.from_dict(record['neuron'])
+                if neuron.id in self.neurons:
+                    continue  # 스냅샷 저장 후 저널을 지우기 전에 종료된 경우
+                self.neurons[neuron.id] = neuron
+                self._index_neuron(neuron)
+                # 기존 뉴런 쪽 역방향 연결은 저널에 따로 없으므로 복원
+                for other_id, weight in neuron.connections.items():
+                    other = self.neurons.get(int(other_id))
+                    if other is not None:
+                        other.connect_to(neuron.id, weight)
+                self.growth_events += 1
+                self.topics_learned.add(neuron.topic)
+                replayed += 1
+        return replayed, intact
+
+    def _append_journal(self, neuron: KnowledgeNeuron) -> Optional[int]:
+        """새 뉴런 한 줄을 저널 대기열에 넣고 커밋 번호 반환 (쓰기 락 안에서 불러 순서 유지)"""
+        ticket = self.journal.submit(encode_record({'op': 'neuron', 'neuron': neuron.to_dict()}))
+        self._journal_records += 1
+        return ticket
+
+    def _commit_journal(self, ticket: Optional[int]):
+        """저널 기록이 디스크에 내려갈 때까지 대기 - 저장 비용이 브레인 크기와 무관"""
+        if ticket is None:
+            return
+        try:
+            self.journal.commit(ticket)
+        except Exception as e:
+            print(f"❌ 저널 기록 실패: {e}")
+            self._save_neurons()
+            return
+        if self._journal_records >= self.journal_compact_every:
+            if self.on_dirty is not None:
+                self.on_dirty()
+            else:
+                self._save_neurons()
+
+    def _index_neuron(self, neuron: KnowledgeNeuron):
+        """뉴런을 역색인에 등록"""
+        self._content_index.add(neuron.id, neuron.content_tokens)
+        self._topic_index.add(neuron.id, neuron.topic_tokens)
+        self._topic_buckets.setdefault(neuron.topic, set()).add(neuron.id)
+        self.scorer.add(neuron)
+
+    def _rebuild_index(self, stored: Optional[Tuple] = None):
+        """전체 뉴런으로 역색인 재구성 (스냅샷에 저장된 역색인이 있으면 토큰화 생략)"""
+        self._content_index.clear()
+        self._topic_index.clear()
+        self._topic_buckets.clear()
+        if stored is None:
+            self.scorer.rebuild([])
+            for neuron_id in sorted(self.neurons):
+                self._index_neuron(self.neurons[neuron_id])
+        else:
+            self._content_index.load(*stored[0])
+            self._topic_index.load(*stored[1])
+            for neuron_id in sorted(self.neurons):
+                self._topic_buckets.setdefault(self.neurons[neuron_id].topic, set()).add(neuron_id)
+            self.scorer.rebuild(self.neurons[neuron_id] for neuron_id in sorted(self.neurons))
+        self._query_cache.invalidate_all()
+
+    def _make_scorer(self, name: str) -> KnowledgeScorer:
+        """이름으로 검색 채점기 생성"""
+        if name == 'jaccard':
+            return JaccardScorer(self.neurons, self._content_index, self._topic_index)
+        if name == 'bm25':
+            return BM25Scorer()
+        if name == 'ngram':
+            return NgramScorer()
+        raise ValueError(f"알 수 없는 채점기: {name} (지원: {', '.join(self.SCORERS)})")
+
+    def set_scorer(self, name: str):
+        """검색 채점기 교체 (jaccard / bm25 / ngram)"""
+        self.scorer = self._make_scorer(name)
+        self.scorer.rebuild(self.neurons[neuron_id] for neuron_id in sorted(self.neurons))
+        self._query_cache.invalidate_all()
+        print(f"🎯 검색 채점기: {name}")
+
+    def _ann_vector(self, neuron: KnowledgeNeuron) -> np.ndarray:
+        return hashed_vector(f"{neuron.topic} {neuron.content}")
+
+    def _load_ann(self):
+        """저장된 ANN 색인 로드 (빠진 뉴런은 이어서 삽입), 없으면 임계값 이상일 때 백그라운드 구축"""
+        if self.ann_threshold <= 0:
+            return
+        index = HNSWIndex.load(self.ann_path)
+        if index is not None and any(neuron_id not in self.neurons for neuron_id in index.neuron_ids):
+            index = None  # 직전 스냅샷으로 복구한 경우 - 없는 뉴런이 들어 있으면 다시 구축
+        if index is None:
+            if len(self.neurons) >= self.ann_threshold:
+                self._start_ann_build()
+            return
+        for neuron_id in sorted(self.neurons):
+            if neuron_id not in index:
+                index.add(neuron_id, self._ann_vector(self.neurons[neuron_id]))
+        index.ef_search = self.ann_ef
+        self.ann_index = index
+
+    def _update_ann(self, neuron: KnowledgeNeuron):
+        """새 뉴런을 ANN 색인에 반영 (임계값을 처음 넘으면 백그라운드 구축 시작)"""
+        if self.ann_index is not None:
+            self.ann_index.add(neuron.id, self._ann_vector(neuron))
+        elif 0 < self.ann_threshold <= len(self.neurons):
+            self._start_ann_build()
+
+    def _start_ann_build(self):
+        """ANN 색인 전체 구축을 요청 경로 밖에서 시작 - 준비될 때까지 검색은 채점기로 (쓰기 락 안에서 호출)"""
+        if self._ann_build is not None:
+            generation, thread = self._ann_build
+            if generation == self._ann_generation and thread.is_alive():
+                return
+        thread = threading.Thread(target=self._build_ann, args=(self._ann_generation,),
+                                  name='brain-ann-build', daemon=True)
+        self._ann_build = (self._ann_generation, thread)
+        thread.start()
+
+    def _build_ann(self, generation: int):
+        """뉴런 목록을 떠 두고 락 밖에서 그래프를 만든 뒤, 그 사이 추가된 뉴런만 락 안에서 넣고 교체"""
         try:
-            data = {
-                'neurons': [n.to_dict() for n in self.neurons.values()],
-                'growth_events': self.growth_events,
-                'topics_learned': list(self.topics_learned),
-                'last_updated': datetime.now().isoformat()
-            }
-            with open(self.storage_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with self._write_lock:
+                neuron_ids = sorted(self.neurons)
+            print(f"🕸️ ANN 색인 구축 중 (백그라운드): {len(neuron_ids)}개 뉴런")
+            index = HNSWIndex(ef_search=self.ann_ef)
+            for neuron_id in neuron_ids:
+                if generation != self._ann_generation:
+                    return
+                neuron = self.neurons.get(neuron_id)
+                if neuron is not None:
+                    index.add(neuron_id, self._ann_vector(neuron))
+            with self._write_lock:
+                if generation != self._ann_generation:
+                    return
+                for neuron_id in sorted(self.neurons):
+                    if neuron_id not in index:
+                        index.add(neuron_id, self._ann_vector(self.neurons[neuron_id]))
+                index.ef_search = self.ann_ef
+                self.ann_index = index
+                # 검색이 채점기 전체에서 ANN 후보 재채점으로 바뀌므로 캐시된 결과를 버림
+                self._query_cache.invalidate_all()
+            print(f"🕸️ ANN 색인 준비 완료: {len(index)}개 뉴런")
         except Exception as e:
-            print(f"❌ 뉴런 저장 실패: {e}")
+            print(f"❌ ANN 색인 구축 실패: {e}")
+
+    def wait_for_ann(self, timeout: Optional[float] = None) -> bool:
+        """진행 중인 ANN 구축이 끝날 때까지 대기 → ANN 검색 사용 가능 여부"""
+        if self._ann_build is not None:
+            self._ann_build[1].join(timeout)
+        return self.ann_index is not None
+
+    def set_ann_ef(self, ef: int):
+        """ANN 탐색 폭 조정 - 클수록 재현율↑ 속도↓"""
+        self.ann_ef = ef
+        if self.ann_index is not None:
+            self.ann_index.ef_search = ef
+        self._query_cache.invalidate_all()
+
+    def _save_neurons(self):
+        """뉴런 전체를 스냅샷으로 저장하고 저널을 .prev로 넘김 (압축)
+
+        스냅샷은 임시 파일 → fsync → rename으로 교체하고 직전 것은 .prev로 남긴다.
+        넘긴 저널에는 직전 스냅샷 이후 기록이 있어 .prev로 복구할 때 재생한다.
+        """
+        with self._write_lock:
+            try:
+                self.activations.flush(self.neurons)
+                replaced = os.path.exists(self.snapshot_path if self.snapshot_format == 'binary'
+                                          else self.storage_path)
+                if self.snapshot_format == 'binary':
+                    self._spill_content()
+                    self._compact_content()
+                    meta = {
+                        'growth_events': self.growth_events,
+                        'topics_learned': list(self.topics_learned),
+                        'last_updated': datetime.now().isoformat()
+                    }
+                    write_snapshot(self.snapshot_path, [self.neurons[i] for i in sorted(self.neurons)], meta,
+                                   self._content_index, self._topic_index, self.content_store)
+                    # 새 스냅샷과 .prev가 가리키는 본문 파일만 남김
+                    previous = self.snapshot_path + PREVIOUS_SUFFIX
+                    keep = read_content_file(previous) if os.path.exists(previous) else None
+                    self.content_store.remove_stale([keep] if keep else [])
+                else:
+                    self._write_json(self.storage_path)
+                if self.ann_index is not None:
+                    self.ann_index.save(self.ann_path)
+                # 교체된 스냅샷이 없으면 .prev가 그대로이므로 저널도 .prev 뒤에 이어 붙여 짝을 맞춤
+                self.journal.rotate(append=not replaced)
+                self._journal_records = 0
+            except Exception as e:
+                print(f"❌ 뉴런 저장 실패: {e}")
+
+    def _spill_content(self):
+        """메모리에 있는 본문을 저장소 끝에 덧붙이고 뉴런에는 위치만 남김"""
+        resident = [self.neurons[i] for i in sorted(self.neurons) if self.neurons[i].content_ref is None]
+        if not resident:
+            return
+        if self.content_store.needs_dictionary(len(self.neurons)):
+            self.content_store.train([self.neurons[i].content for i in sorted(self.neurons)])
+        self._store_contents(resident, self.content_store)
+
+    def _compact_content(self):
+        """버려진 본문이 많으면 살아 있는 본문만 다음 세대 파일로 옮기고 그 파일로 바꿈
+
+        예전 파일은 .prev 스냅샷이 가리킬 수 있어 바로 지우지 않는다 (remove_stale).
+        """
+        store = self.content_store
+        neurons = [self.neurons[i] for i in sorted(self.neurons)]
+        refs = [neuron.content_ref for neuron in neurons]
+        live = sum(ref[1] for ref in refs)
+        if store.size - live < max(live, self.content_compact_bytes):
+            return
+        compacted, moved = store.compact(refs)
+        for neuron, ref in zip(neurons, moved):
+            neuron.attach_content(compacted, *ref)
+        self.content_store = compacted
+        print(f"🧹 본문 저장소 정리: {store.size / 1024:.1f}KB → {compacted.size / 1024:.1f}KB "
+              f"({os.path.basename(compacted.path)})")
+
+    def _store_contents(self, neurons: List[KnowledgeNeuron], store: ContentStore):
+        refs = store.append_many([neuron.content for neuron in neurons])
+        for neuron, ref in zip(neurons, refs):
+            neuron.attach_content(store, *ref)
+
+    def _write_json(self, path: str):
+        data = {
+            'neurons': [n.to_dict() for n in self.neurons.values()],
+            'growth_events': self.growth_events,
+            'topics_learned': list(self.topics_learned),
+            'last_updated': datetime.now().isoformat()
+        }
+        atomic_write_json(path, data, keep_previous=(path == self.storage_path))
+
+    def export_json(self, path: Optional[str] = None):
+        """현재 브레인을 기존 JSON 형식으로 내보내기 (기본: storage_path)"""
+        with self._write_lock:
+            self.activations.flush(self.neurons)
+            self._write_json(path or self.storage_path)
+
+    def export_ndjson(self, path: str) -> int:
+        """뉴런을 한 줄씩 NDJSON으로 내보내기 (본문은 저장소에서 하나씩 읽음, .gz면 압축)"""
+        with self._write_lock:
+            self.activations.flush(self.neurons)
+            meta = {'next_id': self.next_id, 'growth_events': self.growth_events,
+                    'topics_learned': sorted(self.topics_learned), 'neurons': len(self.neurons)}
+            count = write_stream(path, 'brain', meta,
+                                 (('neuron', self.neurons[i].to_dict()) for i in sorted(self.neurons)))
+        print(f"📤 브레인 내보내기: {count}개 뉴런 → {path}")
+        return count
+
+    def import_ndjson(self, path: str, replace: bool = False) -> int:
+        """NDJSON 브레인 가져오기 - 연결은 파일에 있는 그대로 쓰고 색인은 끝에 한 번에 재구성
+
+        뉴런을 하나씩 create_neuron으로 다시 만들지 않으므로 유사도 계산이 없다.
+        바이너리 형식이면 본문을 IMPORT_CHUNK개씩 다음 세대의 새 저장소 파일로 넘겨 메모리에 쌓지 않는다
+        (교체되는 뉴런의 본문이 남은 예전 파일은 .prev 스냅샷이 더 이상 가리키지 않을 때 지워짐).
+        파일이 끝까지 온전해야 현재 브레인과 교체한다 (뉴런이 있으면 replace=True 필요).
+        """
+        with self._write_lock:
+            if self.neurons and not replace:
+                raise ValueError(f"브레인이 비어 있지 않음: {len(self.neurons)}개 뉴런 (replace=True로 교체)")
+            neurons: Dict[int, KnowledgeNeuron] = {}
+            pending: List[KnowledgeNeuron] = []
+            store = self.content_store.successor()
+            with StreamReader(path, 'brain') as reader:
+                for record_type, data in reader:
+                    if record_type != 'neuron':
+                        continue
+                    neuron = KnowledgeNeuron.from_dict(data)
+                    neurons[neuron.id] = neuron
+                    if self.snapshot_format == 'binary':
+                        pending.append(neuron)
+                        if len(pending) >= self.IMPORT_CHUNK:
+                            self._import_contents(pending, store)
+                            pending = []
+                meta = reader.meta
+            if pending:
+                self._import_contents(pending, store)
+
+            # 빠진 뉴런을 가리키는 연결만 정리 (양방향 연결은 파일에 이미 있음)
+            for neuron in neurons.values():
+                dangling = [target for target in neuron.connections if int(target) not in neurons]
+                for target in dangling:
+                    del neuron.connections[target]
+
+            # 채점기가 self.neurons를 참조하므로 같은 dict를 바꿔 채움
+            self.neurons.clear()
+            self.neurons.update(neurons)
+            if self.snapshot_format == 'binary':
+                self.content_store = store
+            self.next_id = max(meta.get('next_id', 1), max(neurons, default=0) + 1)
+            self.growth_events = meta.get('growth_events', len(neurons))
+            self.topics_learned = set(meta.get('topics_learned', [])) | {n.topic for n in neurons.values()}
+            self.activations = ActivationLedger()
+            self._rebuild_index()
+            self.ann_index = None
+            self._ann_generation += 1
+            if os.path.exists(self.ann_path):
+                os.remove(self.ann_path)
+            self._load_ann()
+            self._save_neurons()
+        print(f"📥 브레인 가져오기: {len(neurons)}개 뉴런 ← {path}")
+        return len(neurons)
+
+    def _import_contents(self, neurons: List[KnowledgeNeuron], store: ContentStore):
+        """가져오는 본문 묶음을 저장소로 (압축 설정이면 첫 묶음으로 사전 학습)"""
+        if store.needs_dictionary(len(neurons)):
+            store.train([neuron.content for neuron in neurons])
+        self._store_contents(neurons, store)
+
+    @contextmanager
+    def batch(self):
+        """여러 뉴런을 연달아 만들 때 저널 fsync를 끝에 한 번만 (그룹 커밋)"""
+        state = self._batch_state
+        depth = getattr(state, 'depth', 0)
+        state.depth = depth + 1
+        try:
+            yield self
+        finally:
+            state.depth = depth
+            if depth == 0:
+                ticket, state.ticket = getattr(state, 'ticket', None), None
+                self._commit_journal(ticket)
 
     def toggle_learning_mode(self, enabled: bool):
         """학습 모드 ON/OFF"""
@@ -111,49 +589,103 @@ class NeuralBrain:
 
     def calculate_similarity(self, text1: str, text2: str) -> float:
         """텍스트 유사도 계산 (Jaccard Index)"""
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
-        if not words1 or not words2: return 0.0
-        intersection = len(words1 & words2)
-        union = len(words1 | words2)
-        return intersection / union if union > 0 else 0.0
+        return jaccard(set(tokenize(text1)), set(tokenize(text2)))
 
-    def create_neuron(self, content: str, topic: str, source: str = "Hybrid", confidence: float = 0.8) -> KnowledgeNeuron:
-        """새로운 지식 뉴런 생성"""
-        neuron_id = self.next_id
-        self.next_id += 1
-        neuron = KnowledgeNeuron(neuron_id, content, topic, source, confidence)
+    def _find_connections(self, neuron: KnowledgeNeuron) -> List[Tuple[int, float]]:
+        """새 뉴런과 연결될 기존 뉴런들 (content_sim*0.7 + topic_sim*0.3 > 0.2)
+
+        내용 토큰을 하나도 공유하지 않으면 같은 주제여도 0.15가 최대라 연결될 수
+        없다. 그래서 역색인 포스팅으로 공유 토큰 수(교집합 크기)를 세고, 그 후보들만
+        주제 버킷 여부와 함께 채점한다. 교집합을 이미 알고 있으니 집합 연산은 없다.
+        """
+        overlap: Dict[int, int] = {}
+        postings = self._content_index.postings
+        for token in neuron.content_tokens:
+            for neuron_id in postings.get(token, ()):
+                overlap[neuron_id] = overlap.get(neuron_id, 0) + 1
         
-        # 기존 뉴런들과 연결 생성
-        for existing_neuron in self.neurons.values():
-            content_sim = self.calculate_similarity(content, existing_neuron.content)
-            topic_sim = 0.5 if topic == existing_neuron.topic else 0.0
+        same_topic = self._topic_buckets.get(neuron.topic, ())
+        size = len(neuron.content_tokens)
+        connections = []
+        for existing_id in sorted(overlap):
+            intersection = overlap[existing_id]
+            union = size + self._content_index.sizes[existing_id] - intersection
+            content_sim = intersection / union
+            topic_sim = 0.5 if existing_id in same_topic else 0.0
             total_sim = (content_sim * 0.7 + topic_sim * 0.3)
             if total_sim > 0.2:
-                neuron.connect_to(existing_neuron.id, total_sim)
-                existing_neuron.connect_to(neuron_id, total_sim)
+                connections.append((existing_id, total_sim))
+        return connections
+
+    def create_neuron(self, content: str, topic: str, source: str = "Hybrid", confidence: float = 0.8) -> KnowledgeNeuron:
+        """새로운 지식 뉴런 생성"""
+        with self._write_lock:
+            neuron_id = self.next_id
+            self.next_id += 1
+            neuron = KnowledgeNeuron(neuron_id, content, topic, source, confidence)
+        
+            # 기존 뉴런들과 연결 생성
+            for existing_id, total_sim in self._find_connections(neuron):
+                neuron.connect_to(existing_id, total_sim)
+                self.neurons[existing_id].connect_to(neuron_id, total_sim)
         
-        self.neurons[neuron_id] = neuron
-        self.growth_events += 1
-        self.topics_learned.add(topic)
-        self._save_neurons()
-        print(f"   🌱 뉴런 생성: ID-{neuron_id} (연결: {len(neuron.connections)}개)")
+            self.neurons[neuron_id] = neuron
+            self._index_neuron(neuron)
+            self._update_ann(neuron)
+            self._invalidate_cache(neuron)
+            self.growth_events += 1
+            self.topics_learned.add(topic)
+            ticket = self._append_journal(neuron)
+            print(f"   🌱 뉴런 생성: ID-{neuron_id} (연결: {len(neuron.connections)}개)")
+        # fsync는 락 밖에서 기다림 - 그 사이 다른 스레드의 기록이 다음 커밋에 묶임
+        if getattr(self._batch_state, 'depth', 0):
+            self._batch_state.ticket = ticket
+        else:
+            self._commit_journal(ticket)
         return neuron
 
+    def _use_ann(self) -> bool:
+        return self.ann_index is not None and len(self.neurons) >= self.ann_threshold
+
+    def _invalidate_cache(self, neuron: KnowledgeNeuron):
+        """새 뉴런으로 달라질 수 있는 캐시 결과 무효화"""
+        if self.scorer.insert_stable and not self._use_ann():
+            self._query_cache.invalidate_tokens(neuron.content_tokens | neuron.topic_tokens)
+        else:
+            # BM25/n-gram은 IDF·평균 길이가, ANN은 그래프가 바뀌므로 전부 버림
+            self._query_cache.invalidate_all()
+
+    def _retrieve(self, query: str, top_k: int, min_score: float) -> List[Tuple[int, float]]:
+        """상위 (뉴런ID, 점수) - 큰 브레인은 ANN 후보만 채점기로 재채점"""
+        if self._use_ann():
+            ef = max(self.ann_ef, top_k)
+            candidates = sorted(neuron_id for neuron_id, _ in
+                                self.ann_index.search(hashed_vector(query), ef, ef))
+            matches = [m for m in self.scorer.score_ids(query, candidates) if m[1] > min_score]
+            return heapq.nlargest(top_k, matches, key=lambda item: item[1])
+        return self.scorer.top_k(query, top_k, min_score)
+
     def query_knowledge(self, query: str, top_k: int = 3) -> List[Tuple[KnowledgeNeuron, float]]:
-        """관련 지식 검색"""
-        scored_neurons = []
-        for neuron in self.neurons.values():
-            content_sim = self.calculate_similarity(query, neuron.content)
-            topic_sim = self.calculate_similarity(query, neuron.topic)
-            total_score = content_sim * 0.7 + topic_sim * 0.3
-            
-            if total_score > 0.15:
-                neuron.activate()
-                scored_neurons.append((neuron, total_score))
-        
-        scored_neurons.sort(key=lambda x: x[1], reverse=True)
-        return scored_neurons[:top_k]
+        """관련 지식 검색 (읽기 전용 채점 후 돌려준 뉴런의 활성화만 장부에 기록)"""
+        normalized = normalize_query(query)
+        key = (normalized, self.scorer.name, top_k, 0.15)
+        generation = self._query_cache.generation
+        matches = self._query_cache.get(key)
+        if matches is None:
+            matches = self._retrieve(query, top_k, 0.15)
+            self._query_cache.put(key, token_set(normalized), matches, generation)
+        self.activations.record(neuron_id for neuron_id, _ in matches)
+        return [(self.neurons[neuron_id], score) for neuron_id, score in matches]
+
+    def query_many(self, queries: List[str], top_k: int = 3) -> List[List[Tuple[KnowledgeNeuron, float]]]:
+        """여러 질의 일괄 검색 - 토큰화/채점을 한 번에 (질의별 query_knowledge와 같은 결과)"""
+        if self._use_ann():
+            batches = [self._retrieve(query, top_k, 0.15) for query in queries]
+        else:
+            batches = self.scorer.top_k_many(queries, top_k, 0.15)
+        self.activations.record(neuron_id for matches in batches for neuron_id, _ in matches)
+        return [[(self.neurons[neuron_id], score) for neuron_id, score in matches]
+                for matches in batches]
 
     def get_direct_answer(self, query: str) -> Tuple[Optional[str], float]:
         """🧠 Alicia 오프라인 사고: 뇌에서 직접 답변 찾기"""
@@ -172,7 +704,7 @@ class NeuralBrain:
             # 여러 관련 기억 조합
             combined_knowledge = []
             for neuron, score in best_matches[:2]:
-                combined_knowledge.append(f"• {neuron.content[:200]}...")
+                combined_knowledge.append(f"• {neuron.excerpt(200)}...")
             
             response = (
                 f"내가 기억하기로는:\n" + 
@@ -187,12 +719,21 @@ class NeuralBrain:
     def get_status(self) -> Dict:
         """브레인 상태"""
         total_connections = sum(len(n.connections) for n in self.neurons.values())
+        resident = sum(1 for n in self.neurons.values() if n.content_ref is None)
         return {
             'total_neurons': len(self.neurons),
             'total_connections': total_connections,
             'growth_events': self.growth_events,
             'topics_learned': len(self.topics_learned),
             'learning_mode': self.learning_mode,
+            'scorer': self.scorer.name,
+            'ann_indexed': len(self.ann_index) if self.ann_index is not None else 0,
+            'ann_building': self._ann_build is not None and self._ann_build[1].is_alive(),
+            'pending_activations': self.activations.pending(),
+            'journal_records': self._journal_records,
+            'journal_commits': self.journal.get_status(),
+            'query_cache': self._query_cache.stats(),
+            'content_store': {**self.content_store.get_status(), 'resident_neurons': resident},
             'avg_connections': total_connections / len(self.neurons) if self.neurons else 0
         }
 
@@ -216,6 +757,16 @@ class SelfGrowingNeuralNetwork:
             'growth_events': [], 'total_conversations': 0, 'instant_growths': 0
         }
         
+        # 가중치/hidden_size/학습 기록을 바꾸거나 읽는 쪽(성장, 학습, 저장)이 모두 잡는 잠금
+        # - 저장은 write-behind 스레드에서 돌기 때문에 성장 도중 상태를 쓰면 안 됨
+        self.model_lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        # 마지막으로 저장한 가중치/설정/기록의 CRC - 같으면 save()가 쓰지 않고 넘어감
+        self._saved_signature: Optional[int] = None
+        self.save_stats = {'saves': 0, 'skipped': 0, 'bytes_written': 0,
+                           'last_bytes': 0, 'last_saved_at': None}
+        self._started_at = time.time()
+        
         self.knowledge_brain = NeuralBrain()
         print(f"🤖 신경망 초기화: 분류 {hidden_size}개 + 지식 {len(self.knowledge_brain.neurons)}개 뉴런")
     
@@ -225,11 +776,12 @@ class SelfGrowingNeuralNetwork:
         return exp_x / np.sum(exp_x, axis=1, keepdims=True)
     
     def forward(self, X):
-        self.z1 = np.dot(X, self.W1) + self.b1
-        self.a1 = self.relu(self.z1)
-        self.z2 = np.dot(self.a1, self.W2) + self.b2
-        self.a2 = self.softmax(self.z2)
-        return self.a2
+        with self.model_lock:
+            self.z1 = np.dot(X, self.W1) + self.b1
+            self.a1 = self.relu(self.z1)
+            self.z2 = np.dot(self.a1, self.W2) + self.b2
+            self.a2 = self.softmax(self.z2)
+            return self.a2
     
     def check_instant_growth(self, features, confidence):
         """즉시 성장 필요성 확인"""
@@ -246,36 +798,38 @@ class SelfGrowingNeuralNetwork:
                 should_grow = True
                 reason = f"높은 불확실성 (엔트로피: {entropy:.2f})"
         
-        if should_grow and self.hidden_size >= 100:
-            return False, "최대 크기 도달"
+        if not should_grow:
+            return False, "성장 불필요"
         
-        if should_grow:
+        with self.model_lock:
+            if self.hidden_size >= 100:
+                return False, "최대 크기 도달"
             print(f"\n⚡ 즉시 성장 트리거: {reason}")
             self.grow_network(2)
             self.training_history['instant_growths'] += 1
-            return True, reason
-        return False, "성장 불필요"
+        return True, reason
     
     def grow_network(self, new_neurons=2):
         """신경망 확장"""
-        print(f"🌱 신경망 성장: {self.hidden_size} → {self.hidden_size + new_neurons}개 뉴런")
-        old_size = self.hidden_size
-        self.hidden_size += new_neurons
-        
-        new_W1 = np.random.randn(self.input_size, self.hidden_size) * np.sqrt(2.0 / self.input_size)
-        new_b1 = np.zeros((1, self.hidden_size))
-        new_W2 = np.random.randn(self.hidden_size, self.output_size) * np.sqrt(2.0 / self.hidden_size)
-        
-        new_W1[:, :old_size] = self.W1
-        new_b1[:, :old_size] = self.b1
-        new_W2[:old_size, :] = self.W2
-        
-        self.W1, self.b1, self.W2 = new_W1, new_b1, new_W2
-        self.training_history['growth_events'].append({
-            'timestamp': datetime.now().isoformat(),
-            'old_size': old_size, 'new_size': self.hidden_size,
-            'added_neurons': new_neurons, 'trigger': 'instant_growth'
-        })
+        with self.model_lock:
+            print(f"🌱 신경망 성장: {self.hidden_size} → {self.hidden_size + new_neurons}개 뉴런")
+            old_size = self.hidden_size
+            self.hidden_size += new_neurons
+            
+            new_W1 = np.random.randn(self.input_size, self.hidden_size) * np.sqrt(2.0 / self.input_size)
+            new_b1 = np.zeros((1, self.hidden_size))
+            new_W2 = np.random.randn(self.hidden_size, self.output_size) * np.sqrt(2.0 / self.hidden_size)
+            
+            new_W1[:, :old_size] = self.W1
+            new_b1[:, :old_size] = self.b1
+            new_W2[:old_size, :] = self.W2
+            
+            self.W1, self.b1, self.W2 = new_W1, new_b1, new_W2
+            self.training_history['growth_events'].append({
+                'timestamp': datetime.now().isoformat(),
+                'old_size': old_size, 'new_size': self.hidden_size,
+                'added_neurons': new_neurons, 'trigger': 'instant_growth'
+            })
         print("✅ 신경망 확장 완료! 🧠✨")
     
     def get_contextual_knowledge(self, query: str) -> str:
@@ -284,7 +838,7 @@ class SelfGrowingNeuralNetwork:
         if not related_neurons: return ""
         context_parts = []
         for neuron, score in related_neurons:
-            context_parts.append(f"[관련도: {score:.2f}] {neuron.content[:200]}")
+            context_parts.append(f"[관련도: {score:.2f}] {neuron.excerpt(200)}")
         return "📚 관련 기억:\n" + "\n".join(context_parts)
     
     def get_brain_status(self):
@@ -304,36 +858,120 @@ class SelfGrowingNeuralNetwork:
             'topics_learned': knowledge_status['topics_learned'],
             'learning_mode': knowledge_status['learning_mode']
         })
+        hours = max(time.time() - self._started_at, 60.0) / 3600
+        base_status['model_persistence'] = {**self.save_stats,
+                                            'saves_per_hour': self.save_stats['saves'] / hours}
         return base_status
     
-    def save(self, filepath):
-        """모델 저장"""
-        data = {
-            'weights': {'W1': self.W1, 'b1': self.b1, 'W2': self.W2, 'b2': self.b2},
-            'config': {'input_size': self.input_size, 'hidden_size': self.hidden_size, 
+    WEIGHT_NAMES = ('W1', 'b1', 'W2', 'b2')
+    
+    @staticmethod
+    def _model_paths(filepath) -> Tuple[str, str]:
+        """MODEL_PATH(예: iro_brain.pkl) → (가중치 .npz, 설정/기록 .json)"""
+        base = os.path.splitext(filepath)[0]
+        return base + '.npz', base + '.json'
+    
+    def _sidecar(self) -> Dict:
+        return {
+            'config': {'input_size': self.input_size, 'hidden_size': self.hidden_size,
                        'output_size': self.output_size, 'learning_rate': self.learning_rate},
-            'history': self.training_history,
-            'metadata': {'saved_at': datetime.now().isoformat(), 'version': '6.0'}
+            'history': self.training_history
         }
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'wb') as f:
-            pickle.dump(data, f)
-        print(f"💾 신경망 저장: {filepath}")
+    
+    @classmethod
+    def _signature(cls, sidecar_json: str, weights: Dict[str, np.ndarray]) -> int:
+        crc = zlib.crc32(sidecar_json.encode('utf-8'))
+        for name in cls.WEIGHT_NAMES:
+            crc = zlib.crc32(np.ascontiguousarray(weights[name]).tobytes(), crc)
+        return crc
+    
+    def _snapshot(self) -> Tuple[str, Dict[str, np.ndarray], int]:
+        """model_lock 안에서 (설정/기록 JSON, 가중치 복사본, CRC)를 한 시점으로 떠 둠"""
+        with self.model_lock:
+            sidecar_json = json.dumps(self._sidecar(), sort_keys=True, default=_json_default)
+            weights = {name: getattr(self, name).copy() for name in self.WEIGHT_NAMES}
+        return sidecar_json, weights, self._signature(sidecar_json, weights)
+    
+    def is_dirty(self) -> bool:
+        """마지막 저장 이후 가중치나 학습 기록이 바뀌었는지"""
+        return self._snapshot()[2] != self._saved_signature
+    
+    def save(self, filepath):
+        """모델 저장 - 가중치는 .npz, 설정/기록은 .json (바뀐 게 없으면 건너뜀)
+
+        잠금 안에서는 스냅샷만 뜨고 파일 쓰기는 밖에서 한다 - 저장 중에도 성장/추론이 막히지 않음.
+        """
+        with self._save_lock:
+            sidecar_json, weights, signature = self._snapshot()
+            if signature == self._saved_signature:
+                self.save_stats['skipped'] += 1
+                return
+            
+            weights_path, sidecar_path = self._model_paths(filepath)
+            os.makedirs(os.path.dirname(weights_path) or '.', exist_ok=True)
+            atomic_write(weights_path, lambda f: np.savez(f, **weights))
+            sidecar = json.loads(sidecar_json)
+            sidecar['metadata'] = {'saved_at': datetime.now().isoformat(), 'version': '7.0',
+                                   'weights_file': os.path.basename(weights_path), 'signature': signature}
+            atomic_write_json(sidecar_path, sidecar, default=_json_default)
+            
+            written = os.path.getsize(weights_path) + os.path.getsize(sidecar_path)
+            self._saved_signature = signature
+            self.save_stats['saves'] += 1
+            self.save_stats['bytes_written'] += written
+            self.save_stats['last_bytes'] = written
+            self.save_stats['last_saved_at'] = sidecar['metadata']['saved_at']
+            print(f"💾 신경망 저장: {weights_path} ({written / 1024:.1f}KB)")
     
     @classmethod
     def load(cls, filepath):
-        """저장된 모델 로드"""
-        if not os.path.exists(filepath): return None
+        """저장된 모델 로드 (.npz + .json, 손상됐으면 직전 저장본, 없으면 기존 pickle)"""
+        weights_path, sidecar_path = cls._model_paths(filepath)
         try:
-            with open(filepath, 'rb') as f:
-                data = pickle.load(f)
+            data, legacy = None, False
+            for suffix in ('', PREVIOUS_SUFFIX):
+                if os.path.exists(weights_path + suffix) and os.path.exists(sidecar_path + suffix):
+                    try:
+                        data = cls._read_model(weights_path + suffix, sidecar_path + suffix)
+                        break
+                    except Exception as e:
+                        print(f"⚠️ 신경망 저장본 손상: {os.path.basename(weights_path + suffix)} ({e})")
+            if data is None:
+                if not (os.path.exists(filepath) and filepath.endswith('.pkl')):
+                    return None
+                with open(filepath, 'rb') as f:
+                    data = pickle.load(f)
+                legacy = True
             nn = cls(**data['config'])
             weights = data['weights']
             nn.W1, nn.b1 = weights['W1'], weights['b1']
             nn.W2, nn.b2 = weights['W2'], weights['b2']
             nn.training_history = data['history']
-            print(f"📂 신경망 로드: {nn.hidden_size}개 뉴런")
+            if not legacy:
+                # 방금 읽은 상태 그대로면 다시 쓰지 않도록
+                saved = data.get('metadata', {}).get('signature')
+                current = nn._snapshot()[2]
+                if saved != current:
+                    print("⚠️ 신경망 가중치와 설정/기록 파일의 저장 시점이 다름 - 다음 저장 때 다시 씀")
+                else:
+                    nn._saved_signature = current
+            print(f"📂 신경망 로드: {nn.hidden_size}개 뉴런" + (" (pickle → 다음 저장부터 .npz)" if legacy else ""))
             return nn
         except Exception as e:
             print(f"❌ 모델 로드 실패: {e}")
             return None
+    
+    @classmethod
+    def _read_model(cls, weights_path: str, sidecar_path: str) -> Dict:
+        with open(sidecar_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        with np.load(weights_path, allow_pickle=False) as arrays:
+            data['weights'] = {name: arrays[name] for name in cls.WEIGHT_NAMES}
+        return data
+
+
+def _json_default(value):
+    """학습 기록에 섞인 numpy 스칼라/배열을 JSON 값으로"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"JSON으로 저장할 수 없는 값: {type(value).__name__}")
@@ -0,0 +1,149 @@
+"""
+지식 뉴런 역색인 - 토큰 → 뉴런 ID 포스팅 리스트
+"""
+
+import bisect
+import itertools
+import re
+import sys
+from typing import AbstractSet, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """소문자 + 공백 기준 토큰화 (Jaccard 유사도와 동일한 규칙)"""
+    return text.lower().split()
+
+
+def token_set(text: str) -> FrozenSet[str]:
+    """intern된 토큰 frozenset - 뉴런마다 한 번만 만들어 재사용"""
+    return frozenset([sys.intern(token) for token in tokenize(text)])
+
+
+def word_ngrams(text: str, sizes: Sequence[int] = (2, 3)) -> List[Tuple[str, List[str]]]:
+    """단어별 (단어, 문자 n-gram 목록) - 목록의 첫 gram은 단어 앞머리(가장 짧은 n)
+
+    가장 작은 n보다 짧은 단어는 단어 자체를 하나의 gram으로 쓴다.
+    """
+    sizes = sorted(sizes)
+    words = []
+    for word in _WORD_PATTERN.findall(text.lower()):
+        if len(word) < sizes[0]:
+            words.append((word, [sys.intern(word)]))
+            continue
+        grams = [sys.intern(word[start:start + n]) for n in sizes for start in range(len(word) - n + 1)]
+        words.append((word, list(dict.fromkeys(grams))))
+    return words
+
+
+def char_ngrams(text: str, sizes: Sequence[int] = (2, 3)) -> Set[str]:
+    """단어별 문자 n-gram 집합 - 조사가 붙은 한국어도 어간 부분이 겹치도록
+
+    "양자컴퓨터는"과 "양자컴퓨터"는 공백 토큰으로는 다르지만 bigram/trigram은
+    대부분 공유한다.
+    """
+    return {gram for _, grams in word_ngrams(text, sizes) for gram in grams}
+
+
+def jaccard(words1: AbstractSet[str], words2: AbstractSet[str]) -> float:
+    """미리 만든 토큰 집합끼리의 Jaccard Index"""
+    if not words1 or not words2: return 0.0
+    intersection = len(words1 & words2)
+    union = len(words1) + len(words2) - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+class TokenIndex:
+    """토큰별로 해당 토큰을 가진 뉴런 ID를 모아두는 역색인"""
+
+    def __init__(self):
+        self.postings: Dict[str, List[int]] = {}
+        self.sizes: Dict[int, int] = {}  # {뉴런ID: 고유 토큰 수} - Jaccard 분모용
+
+    def add(self, neuron_id: int, tokens: Iterable[str]):
+        """뉴런의 토큰들을 색인에 추가 (ID는 증가 순으로 들어온다고 가정)
+
+        읽는 쪽은 잠금 없이 포스팅을 보므로 토큰 수를 먼저 기록한다. 그래야
+        포스팅에서 찾은 뉴런 ID의 Jaccard 분모가 항상 sizes에 있다.
+        """
+        tokens = set(tokens)
+        self.sizes[neuron_id] = len(tokens)
+        for token in tokens:
+            posting = self.postings.get(token)
+            if posting is None:
+                self.postings[token] = [neuron_id]
+            else:
+                posting.append(neuron_id)
+
+    def load(self, postings: Dict[str, List[int]], sizes: Optional[Dict[int, int]] = None):
+        """저장된 포스팅으로 교체 (토큰 수가 없으면 포스팅에서 셈)"""
+        self.clear()
+        self.postings.update(postings)
+        if sizes is None:
+            ids = np.fromiter(itertools.chain.from_iterable(postings.values()), dtype=np.int64,
+                              count=sum(len(posting) for posting in postings.values()))
+            counts = np.bincount(ids)
+            present = np.flatnonzero(counts)
+            sizes = dict(zip(present.tolist(), counts[present].tolist()))
+        self.sizes.update(sizes)
+
+    def overlap(self, tokens: Iterable[str]) -> Dict[int, int]:
+        """토큰을 공유하는 뉴런별 공유 토큰 수 (교집합 크기)"""
+        counts: Dict[int, int] = {}
+        for token in set(tokens):
+            for neuron_id in self.postings.get(token, ()):
+                counts[neuron_id] = counts.get(neuron_id, 0) + 1
+        return counts
+
+    def candidates(self, tokens: Iterable[str]) -> Set[int]:
+        """토큰을 하나 이상 공유하는 뉴런 ID 집합"""
+        result: Set[int] = set()
+        for token in set(tokens):
+            posting = self.postings.get(token)
+            if posting:
+                result.update(posting)
+        return result
+
+    def clear(self):
+        self.postings.clear()
+        self.sizes.clear()
+
+    def __len__(self) -> int:
+        return len(self.postings)
+
+
+class PostingMatrix:
+    """TokenIndex의 CSR 스냅샷 (행 = 토큰, 열 = 뉴런ID) - 여러 질의 일괄 채점용
+
+    limit을 주면 ID가 limit 미만인 뉴런만 담는다. 포스팅 dict는 한 번에 복사하고
+    각 포스팅은 뒤에 덧붙기만 하므로, 뉴런이 추가되는 중에 만들어도 순회 오류 없이
+    같은 시점의 스냅샷이 된다.
+    """
+
+    def __init__(self, index: TokenIndex, limit: Optional[int] = None):
+        postings = index.postings.copy()
+        self.vocab: Dict[str, int] = {token: row for row, token in enumerate(postings)}
+        if limit is None:
+            lengths = [len(p) for p in postings.values()]
+        else:
+            lengths = [bisect.bisect_left(p, limit) for p in postings.values()]
+        self.indptr = np.zeros(len(self.vocab) + 1, dtype=np.int64)
+        np.cumsum(np.array(lengths, dtype=np.int64), out=self.indptr[1:])
+        self.indices = np.fromiter(
+            itertools.chain.from_iterable(itertools.islice(p, n) for p, n in zip(postings.values(), lengths)),
+            dtype=np.int64, count=int(self.indptr[-1]))
+
+    def posting_length(self, token: str) -> int:
+        row = self.vocab.get(token)
+        return 0 if row is None else int(self.indptr[row + 1] - self.indptr[row])
+
+    def expand(self, query_rows: np.ndarray, token_rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(질의 번호, 토큰 행) 쌍을 포스팅으로 펼쳐 (질의 번호, 뉴런ID) 쌍으로"""
+        starts = self.indptr[token_rows]
+        lengths = self.indptr[token_rows + 1] - starts
+        total = int(lengths.sum())
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(total)
+        return np.repeat(query_rows, lengths), self.indices[offsets]
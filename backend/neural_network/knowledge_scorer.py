@@ -0,0 +1,579 @@
+"""
+지식 뉴런 채점기 - NeuralBrain 검색 점수 계산 (교체 가능)
+"""
+
+import bisect
+import heapq
+import math
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from .knowledge_index import PostingMatrix, TokenIndex, char_ngrams, tokenize, word_ngrams
+
+
+def _posting_index(posting: List[int], neuron_id: int) -> int:
+    """오름차순 포스팅에서 뉴런 위치 (없으면 -1)"""
+    position = bisect.bisect_left(posting, neuron_id)
+    if position < len(posting) and posting[position] == neuron_id:
+        return position
+    return -1
+
+
+class KnowledgeScorer:
+    """채점기 공통 인터페이스 - 점수는 0~1 범위로 정규화"""
+
+    name = "base"
+    # True면 새 뉴런이 기존 뉴런 점수를 바꾸지 않음 (질의와 토큰이 겹칠 때만 결과가 달라짐)
+    insert_stable = False
+
+    def add(self, neuron):
+        """새 뉴런 통계 반영 (증분 갱신)"""
+
+    def rebuild(self, neurons: Iterable):
+        """전체 뉴런으로 통계 재구성"""
+        for neuron in neurons:
+            self.add(neuron)
+
+    def iter_matches(self, query: str, min_score: float) -> Iterator[Tuple[int, float]]:
+        """min_score를 넘는 (뉴런ID, 점수)를 ID 오름차순으로"""
+        raise NotImplementedError
+
+    def score_ids(self, query: str, neuron_ids: Iterable[int]) -> List[Tuple[int, float]]:
+        """주어진 후보 뉴런만 채점 (ANN 후보 재채점용, iter_matches와 같은 점수)"""
+        raise NotImplementedError
+
+    def top_k(self, query: str, k: int, min_score: float = 0.0) -> List[Tuple[int, float]]:
+        """k 크기 힙으로 상위 k개 (동점이면 ID가 작은 쪽 우선)"""
+        return heapq.nlargest(k, self.iter_matches(query, min_score), key=lambda item: item[1])
+
+    def top_k_many(self, queries: Sequence[str], k: int,
+                   min_score: float = 0.0) -> List[List[Tuple[int, float]]]:
+        """여러 질의의 top_k를 한 번에 (기본은 질의별 반복)"""
+        return [self.top_k(query, k, min_score) for query in queries]
+
+
+class JaccardScorer(KnowledgeScorer):
+    """기본 채점기 - 내용 Jaccard * 0.7 + 주제 Jaccard * 0.3"""
+
+    name = "jaccard"
+    insert_stable = True
+
+    def __init__(self, neurons: Dict, content_index: TokenIndex, topic_index: TokenIndex):
+        # 색인은 NeuralBrain이 관리하는 것을 그대로 공유
+        self.neurons = neurons
+        self.content_index = content_index
+        self.topic_index = topic_index
+        # 일괄 채점용 (만들 때의 버전, CSR 스냅샷) - 뉴런이 추가되면 버전이 올라 다시 만듦
+        self._version = 0
+        self._matrices = None
+
+    def add(self, neuron):
+        self._version += 1
+        self._matrices = None
+
+    def rebuild(self, neurons: Iterable):
+        self._version += 1
+        self._matrices = None
+
+    def iter_matches(self, query: str, min_score: float) -> Iterator[Tuple[int, float]]:
+        query_tokens = set(tokenize(query))
+        # 토큰을 하나도 공유하지 않는 뉴런은 점수가 0이므로 포스팅에 나온 뉴런만 채점
+        content_hits = self.content_index.overlap(query_tokens)
+        topic_hits = self.topic_index.overlap(query_tokens)
+        for neuron_id in sorted(content_hits.keys() | topic_hits.keys()):
+            total_score = self._score(len(query_tokens), neuron_id, content_hits.get(neuron_id, 0),
+                                      topic_hits.get(neuron_id, 0))
+            if total_score > min_score:
+                yield neuron_id, total_score
+
+    def score_ids(self, query: str, neuron_ids: Iterable[int]) -> List[Tuple[int, float]]:
+        query_tokens = set(tokenize(query))
+        content_postings = [self.content_index.postings.get(token, []) for token in query_tokens]
+        topic_postings = [self.topic_index.postings.get(token, []) for token in query_tokens]
+        results = []
+        for neuron_id in neuron_ids:
+            content_inter = sum(_posting_index(p, neuron_id) >= 0 for p in content_postings)
+            topic_inter = sum(_posting_index(p, neuron_id) >= 0 for p in topic_postings)
+            results.append((neuron_id, self._score(len(query_tokens), neuron_id, content_inter, topic_inter)))
+        return results
+
+    def _score(self, query_size: int, neuron_id: int, content_inter: int, topic_inter: int) -> float:
+        """jaccard()와 같은 계산 - 뉴런 본문 대신 교집합 크기와 색인의 토큰 수 사용"""
+        content_sim = (content_inter / (query_size + self.content_index.sizes[neuron_id] - content_inter)
+                       if content_inter else 0.0)
+        topic_sim = (topic_inter / (query_size + self.topic_index.sizes[neuron_id] - topic_inter)
+                     if topic_inter else 0.0)
+        return content_sim * 0.7 + topic_sim * 0.3
+
+    # 한 묶음에서 펼칠 (질의, 뉴런) 쌍 수와 질의 수 * 뉴런 수(카운트 배열 크기) 상한
+    BATCH_PAIRS = 2_000_000
+    BATCH_KEYS = 4_000_000
+
+    def _build_matrices(self):
+        """내용/주제 역색인 CSR과 뉴런별 토큰 수 배열 - 모두 같은 뉴런 수 기준
+
+        뉴런은 ID 순으로 내용 → 주제 색인에 들어가고 토큰 수가 포스팅보다 먼저
+        기록되므로, 주제 토큰 수를 먼저 떠서 정한 size 미만의 뉴런은 두 색인의
+        토큰 수가 모두 있다. CSR도 size 미만 ID만 담아 쓰는 중에도 크기가 맞는다.
+        """
+        topic_counts = self.topic_index.sizes.copy()
+        content_counts = self.content_index.sizes.copy()
+        size = max(topic_counts, default=0) + 1
+        content_sizes = np.zeros(size, dtype=np.int64)
+        topic_sizes = np.zeros(size, dtype=np.int64)
+        for neuron_id, count in content_counts.items():
+            if neuron_id < size:
+                content_sizes[neuron_id] = count
+        for neuron_id, count in topic_counts.items():
+            topic_sizes[neuron_id] = count
+        return (PostingMatrix(self.content_index, size), PostingMatrix(self.topic_index, size),
+                content_sizes, topic_sizes)
+
+    def _snapshot(self):
+        """현재 버전의 CSR 스냅샷 (쓰는 스레드가 비워도 호출한 쪽은 받은 것을 끝까지 씀)"""
+        version = self._version
+        cached = self._matrices
+        if cached is None or cached[0] != version:
+            # 만드는 동안 뉴런이 추가되면 옛 버전으로 남아 다음 호출이 다시 만든다
+            cached = (version, self._build_matrices())
+            self._matrices = cached
+        return cached[1]
+
+    def top_k_many(self, queries: Sequence[str], k: int,
+                   min_score: float = 0.0) -> List[List[Tuple[int, float]]]:
+        """질의 묶음을 포스팅 조인 한 번으로 채점 - top_k와 같은 점수/순서"""
+        matrices = self._snapshot()
+        content, topic, content_sizes, _ = matrices
+        max_queries = max(1, self.BATCH_KEYS // len(content_sizes))
+        # 점수는 토큰 집합에만 의존하므로 같은 집합의 질의는 한 번만 채점
+        distinct: Dict[frozenset, int] = {}
+        slots = [distinct.setdefault(frozenset(tokenize(query)), len(distinct)) for query in queries]
+        query_tokens = list(distinct)
+        results: List[List[Tuple[int, float]]] = [[] for _ in query_tokens]
+
+        chunk: List[int] = []
+        pairs = 0
+        for position, tokens in enumerate(query_tokens):
+            if not tokens:
+                continue
+            cost = sum(content.posting_length(t) + topic.posting_length(t) for t in tokens)
+            if chunk and (pairs + cost > self.BATCH_PAIRS or len(chunk) >= max_queries):
+                self._score_chunk(matrices, chunk, query_tokens, k, min_score, results)
+                chunk, pairs = [], 0
+            chunk.append(position)
+            pairs += cost
+        if chunk:
+            self._score_chunk(matrices, chunk, query_tokens, k, min_score, results)
+        return [list(results[slot]) for slot in slots]
+
+    def _score_chunk(self, matrices: Tuple, chunk: List[int], query_tokens: List[frozenset], k: int,
+                     min_score: float, results: List[List[Tuple[int, float]]]):
+        content, topic, content_sizes, topic_sizes = matrices
+        stride = len(content_sizes)
+        span = len(chunk) * stride
+
+        def intersections(matrix: PostingMatrix) -> np.ndarray:
+            """(질의 번호 * stride + 뉴런ID) 위치별 공유 토큰 수"""
+            rows, token_rows = [], []
+            for local, position in enumerate(chunk):
+                for token in query_tokens[position]:
+                    row = matrix.vocab.get(token)
+                    if row is not None:
+                        rows.append(local)
+                        token_rows.append(row)
+            local_rows, neuron_ids = matrix.expand(np.array(rows, dtype=np.int64),
+                                                   np.array(token_rows, dtype=np.int64))
+            return np.bincount(local_rows * stride + neuron_ids, minlength=span)
+
+        content_counts = intersections(content)
+        topic_counts = intersections(topic)
+        keys = np.flatnonzero(content_counts | topic_counts)
+        if not len(keys):
+            return
+        content_inter = content_counts[keys]
+        topic_inter = topic_counts[keys]
+
+        local_rows, neuron_ids = np.divmod(keys, stride)
+        query_sizes = np.array([len(query_tokens[p]) for p in chunk], dtype=np.int64)[local_rows]
+        # jaccard()와 같은 정수 나눗셈/가중합 순서라 점수가 비트 단위로 같다
+        content_sim = content_inter / (query_sizes + content_sizes[neuron_ids] - content_inter)
+        topic_sim = topic_inter / (query_sizes + topic_sizes[neuron_ids] - topic_inter)
+        scores = content_sim * 0.7 + topic_sim * 0.3
+
+        keep = scores > min_score
+        local_rows, neuron_ids, scores = local_rows[keep], neuron_ids[keep], scores[keep]
+        # 질의별 점수 내림차순, 동점이면 ID 오름차순 (nlargest의 안정 정렬과 동일)
+        order = np.lexsort((neuron_ids, -scores, local_rows))
+        local_rows, neuron_ids, scores = local_rows[order], neuron_ids[order], scores[order]
+        rank = np.arange(len(local_rows)) - np.searchsorted(local_rows, local_rows)
+        top = rank < k
+        for local, neuron_id, score in zip(local_rows[top].tolist(), neuron_ids[top].tolist(),
+                                           scores[top].tolist()):
+            results[chunk[local]].append((neuron_id, score))
+
+
+class BM25Scorer(KnowledgeScorer):
+    """Okapi BM25 채점기 - 긴 분석 뉴런도 길이 정규화로 공정하게 채점
+
+    주제 토큰은 topic_boost 번 등장한 것으로 쳐서 내용과 한 필드로 합친다.
+    점수는 질의 토큰마다 가능한 최대 기여(idf * (k1 + 1))의 합으로 나눠
+    0~1로 정규화하므로 기존 임계값(0.15, 0.3)을 그대로 쓸 수 있다.
+    top_k는 토큰별 점수 상한으로 MaxScore 동적 가지치기를 한다.
+    """
+
+    name = "bm25"
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, topic_boost: int = 2):
+        self.k1 = k1
+        self.b = b
+        self.topic_boost = topic_boost
+        self.postings: Dict[str, List[int]] = {}   # {토큰: 뉴런ID 리스트 (오름차순)}
+        self.term_freqs: Dict[str, List[int]] = {}  # postings와 같은 순서의 tf
+        self.doc_lengths: Dict[int, int] = {}
+        self.total_length = 0
+        # MaxScore 상한용: 토큰별 최대 tf와 그 토큰을 가진 가장 짧은 문서 길이
+        self.max_tf: Dict[str, int] = {}
+        self.min_length: Dict[str, int] = {}
+        self._idf: Dict[str, float] = {}  # 문서 수가 바뀔 때마다 비움
+
+    def add(self, neuron):
+        counts = Counter(tokenize(neuron.content))
+        for token in tokenize(neuron.topic):
+            counts[token] += self.topic_boost
+        length = sum(counts.values())
+        # 읽는 쪽은 잠금 없이 포스팅부터 보므로 문서 길이, tf, 상한을 먼저 쓰고
+        # 뉴런 ID는 마지막에 포스팅에 올린다 (tf 리스트가 포스팅보다 짧아지지 않음)
+        self.doc_lengths[neuron.id] = length
+        self.total_length += length
+        for token, tf in counts.items():
+            posting = self.postings.get(token)
+            if posting is not None:
+                self.term_freqs[token].append(tf)
+                self.max_tf[token] = max(self.max_tf[token], tf)
+                self.min_length[token] = min(self.min_length[token], length)
+                posting.append(neuron.id)
+            else:
+                self.term_freqs[token] = [tf]
+                self.max_tf[token] = tf
+                self.min_length[token] = length
+                self.postings[token] = [neuron.id]
+        self._idf.clear()
+
+    def rebuild(self, neurons: Iterable):
+        self.postings.clear()
+        self.term_freqs.clear()
+        self.doc_lengths.clear()
+        self.total_length = 0
+        self.max_tf.clear()
+        self.min_length.clear()
+        self._idf.clear()
+        super().rebuild(neurons)
+
+    def idf(self, token: str) -> float:
+        """Lucene식 BM25 IDF (음수가 되지 않음)"""
+        value = self._idf.get(token)
+        if value is None:
+            num_docs = len(self.doc_lengths)
+            df = len(self.postings.get(token, ()))
+            value = math.log(1 + (num_docs - df + 0.5) / (df + 0.5))
+            self._idf[token] = value
+        return value
+
+    def _query_terms(self, query: str) -> Tuple[List[str], float]:
+        """질의 토큰과 정규화 분모 (사전에 없는 토큰도 분모에는 포함)"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        max_score = sum(self.idf(token) for token in terms) * (self.k1 + 1)
+        return terms, max_score
+
+    def iter_matches(self, query: str, min_score: float) -> Iterator[Tuple[int, float]]:
+        if not self.doc_lengths:
+            return
+        terms, max_score = self._query_terms(query)
+        if max_score <= 0:
+            return
+        avg_length = self.total_length / len(self.doc_lengths)
+        k1, b = self.k1, self.b
+        scores: Dict[int, float] = {}
+        for token in terms:
+            doc_ids = self.postings.get(token)
+            if not doc_ids:
+                continue
+            weight = self.idf(token) * (k1 + 1)
+            for neuron_id, tf in zip(doc_ids, self.term_freqs[token]):
+                norm = k1 * (1 - b + b * self.doc_lengths[neuron_id] / avg_length)
+                scores[neuron_id] = scores.get(neuron_id, 0.0) + weight * tf / (tf + norm)
+        for neuron_id in sorted(scores):
+            score = scores[neuron_id] / max_score
+            if score > min_score:
+                yield neuron_id, score
+
+    def score_ids(self, query: str, neuron_ids: Iterable[int]) -> List[Tuple[int, float]]:
+        neuron_ids = list(neuron_ids)
+        if not self.doc_lengths:
+            return [(neuron_id, 0.0) for neuron_id in neuron_ids]
+        terms, max_score = self._query_terms(query)
+        avg_length = self.total_length / len(self.doc_lengths)
+        k1, b = self.k1, self.b
+        results = []
+        for neuron_id in neuron_ids:
+            norm = k1 * (1 - b + b * self.doc_lengths[neuron_id] / avg_length)
+            score = 0.0
+            for token in terms:
+                doc_ids = self.postings.get(token)
+                position = _posting_index(doc_ids, neuron_id) if doc_ids else -1
+                if position >= 0:
+                    tf = self.term_freqs[token][position]
+                    score += self.idf(token) * (k1 + 1) * tf / (tf + norm)
+            results.append((neuron_id, score / max_score if max_score > 0 else 0.0))
+        return results
+
+    def _upper_bound(self, token: str, avg_length: float) -> float:
+        """토큰 하나가 어떤 문서에 줄 수 있는 최대 기여
+
+        tf / (tf + k1 * (1 - b + b * dl / avgdl)) 는 tf가 클수록, dl이 작을수록
+        커지므로 최대 tf와 최소 문서 길이를 넣으면 상한이 된다.
+        """
+        max_tf = self.max_tf[token]
+        return self.idf(token) * (self.k1 + 1) * max_tf / (max_tf + self._best_norm(token, avg_length))
+
+    def _best_norm(self, token: str, avg_length: float) -> float:
+        """토큰을 가진 가장 짧은 문서의 길이 정규화 값"""
+        return self.k1 * (1 - self.b + self.b * self.min_length[token] / avg_length)
+
+    def top_k(self, query: str, k: int, min_score: float = 0.0) -> List[Tuple[int, float]]:
+        """MaxScore 동적 가지치기 top-k (결과는 iter_matches + 힙과 동일)
+
+        토큰을 상한 오름차순으로 두고, 상한 누적합이 현재 k번째 점수(또는 min_score)를
+        넘지 못하는 앞쪽 토큰들은 '비필수'로 돌린다. 후보 문서는 필수 토큰의
+        포스팅에서만 뽑고, 비필수 토큰은 남은 상한으로 가망이 있을 때만 이진 탐색한다.
+        """
+        if k <= 0 or not self.doc_lengths:
+            return []
+        terms, max_score = self._query_terms(query)
+        if max_score <= 0:
+            return []
+        avg_length = self.total_length / len(self.doc_lengths)
+        k1, b = self.k1, self.b
+
+        lists = []  # (상한, 질의 내 위치, 포스팅, tf, 가중치, 최소 길이 정규화)
+        for position, token in enumerate(terms):
+            doc_ids = self.postings.get(token)
+            if doc_ids:
+                lists.append((self._upper_bound(token, avg_length), position, doc_ids,
+                              self.term_freqs[token], self.idf(token) * (k1 + 1),
+                              self._best_norm(token, avg_length)))
+        lists.sort(key=lambda item: item[0])
+        num_lists = len(lists)
+        positions = [item[1] for item in lists]
+        id_lists = [item[2] for item in lists]
+        tf_lists = [item[3] for item in lists]
+        weights = [item[4] for item in lists]
+        best_norms = [item[5] for item in lists]
+        bound_prefix = []
+        running = 0.0
+        for upper, *_ in lists:
+            running += upper
+            bound_prefix.append(running)
+
+        doc_lengths = self.doc_lengths
+        heap: List[Tuple[float, int]] = []  # (정규화 점수, -뉴런ID) 최소 힙
+        cursors = [0] * num_lists
+
+        def prune_limit() -> float:
+            # 부동소수점 오차로 정답을 잘라내지 않도록 살짝 느슨하게
+            kth = heap[0][0] if len(heap) >= k else 0.0
+            return max(min_score, kth) * max_score * (1 - 1e-9)
+
+        limit = prune_limit()
+        first_essential = 0
+        while first_essential < num_lists and bound_prefix[first_essential] <= limit:
+            first_essential += 1
+
+        while first_essential < num_lists:
+            doc = None
+            for i in range(first_essential, num_lists):
+                if cursors[i] < len(id_lists[i]):
+                    candidate = id_lists[i][cursors[i]]
+                    if doc is None or candidate < doc:
+                        doc = candidate
+            if doc is None:
+                break
+
+            # 문서 길이를 보기 전에 tf만으로 구한 상한으로 먼저 걸러낸다
+            matched = []
+            optimistic = bound_prefix[first_essential - 1] if first_essential else 0.0
+            for i in range(first_essential, num_lists):
+                cursor = cursors[i]
+                if cursor < len(id_lists[i]) and id_lists[i][cursor] == doc:
+                    tf = tf_lists[i][cursor]
+                    matched.append((i, tf))
+                    optimistic += weights[i] * tf / (tf + best_norms[i])
+                    cursors[i] = cursor + 1
+            if optimistic <= limit:
+                continue
+
+            norm = k1 * (1 - b + b * doc_lengths[doc] / avg_length)
+            contributions: Dict[int, float] = {}
+            partial = 0.0
+            for i, tf in matched:
+                value = weights[i] * tf / (tf + norm)
+                contributions[positions[i]] = value
+                partial += value
+
+            pruned = False
+            for i in range(first_essential - 1, -1, -1):
+                if partial + bound_prefix[i] <= limit:
+                    pruned = True
+                    break
+                doc_ids = id_lists[i]
+                j = bisect.bisect_left(doc_ids, doc, cursors[i])
+                cursors[i] = j
+                if j < len(doc_ids) and doc_ids[j] == doc:
+                    tf = tf_lists[i][j]
+                    value = weights[i] * tf / (tf + norm)
+                    contributions[positions[i]] = value
+                    partial += value
+            if pruned:
+                continue
+
+            # iter_matches와 같은 순서(질의 토큰 순)로 더해 점수를 비트 단위까지 맞춘다
+            total = 0.0
+            for position in sorted(contributions):
+                total += contributions[position]
+            score = total / max_score
+            if score <= min_score:
+                continue
+            entry = (score, -doc)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+            else:
+                continue
+            limit = prune_limit()
+            while first_essential < num_lists and bound_prefix[first_essential] <= limit:
+                first_essential += 1
+
+        return [(-neg_id, score) for score, neg_id in sorted(heap, key=lambda e: (-e[0], -e[1]))]
+
+
+class NgramScorer(KnowledgeScorer):
+    """문자 n-gram 채점기 - 조사가 붙은 한국어 질의용
+
+    질의 n-gram 중 뉴런이 가진 것의 IDF 가중 비율(커버리지)을 내용 0.7,
+    주제 0.3으로 합친다. 흔한 gram("니다", "있습")은 IDF가 낮아 거의 기여하지 않는다.
+    gram이 min_grams개보다 적은 짧은 질의("q", "안녕?")는 우연히 한 gram만
+    맞아도 만점이 되므로 그 비율만큼 점수를 깎는다.
+
+    gram은 단어 단위로 인정한다. 뉴런이 단어 앞머리 gram을 갖고 단어 gram 가중치의
+    min_word_coverage 이상을 덮어야 그 단어의 gram이 점수에 들어간다 ("what"의
+    "wh", "at"만 흩어져 맞는 경우 제외). min_ascii_word보다 짧은 영문 단어("are",
+    "you")는 다른 단어가 인정된 뉴런에서만 더한다.
+    """
+
+    name = "ngram"
+
+    def __init__(self, sizes: Tuple[int, ...] = (2, 3), min_grams: int = 3,
+                 min_word_coverage: float = 0.5, min_ascii_word: int = 4):
+        self.sizes = sizes
+        self.min_grams = min_grams
+        self.min_word_coverage = min_word_coverage
+        self.min_ascii_word = min_ascii_word
+        self.content_index = TokenIndex()
+        self.topic_index = TokenIndex()
+        self.num_docs = 0
+        self._idf: Dict[str, float] = {}
+
+    def add(self, neuron):
+        self.content_index.add(neuron.id, char_ngrams(neuron.content, self.sizes))
+        self.topic_index.add(neuron.id, char_ngrams(neuron.topic, self.sizes))
+        self.num_docs += 1
+        self._idf.clear()
+
+    def rebuild(self, neurons: Iterable):
+        self.content_index.clear()
+        self.topic_index.clear()
+        self.num_docs = 0
+        self._idf.clear()
+        super().rebuild(neurons)
+
+    def idf(self, gram: str) -> float:
+        value = self._idf.get(gram)
+        if value is None:
+            df = len(self.content_index.postings.get(gram, ()))
+            value = math.log(1 + (self.num_docs - df + 0.5) / (df + 0.5))
+            self._idf[gram] = value
+        return value
+
+    def _query_words(self, query: str) -> Tuple[List[Tuple[bool, Dict[str, float]]], float]:
+        """질의 단어별 (짧은 영문 단어 여부, {gram: IDF})와 정규화 분모"""
+        words = []
+        for word, grams in word_ngrams(query, self.sizes):
+            weak = word.isascii() and len(word) < self.min_ascii_word
+            words.append((weak, {gram: self.idf(gram) for gram in grams}))
+        num_grams = len({gram for _, weights in words for gram in weights})
+        total_weight = sum(sum(weights.values()) for _, weights in words)
+        return words, total_weight * max(1.0, self.min_grams / num_grams) if num_grams else 0.0
+
+    def _field_hits(self, index: TokenIndex, words: List[Tuple[bool, Dict[str, float]]]) -> Dict[int, float]:
+        """뉴런별 인정된 단어의 gram 가중치 합 (단어 순서대로 더함)"""
+        hits: Dict[int, float] = {}
+        strong = set()
+        for weak, weights in words:
+            anchor = set(index.postings.get(next(iter(weights)), ()))
+            if not anchor:
+                continue
+            word_hits: Dict[int, float] = {}
+            for gram, weight in weights.items():
+                for neuron_id in index.postings.get(gram, ()):
+                    if neuron_id in anchor:
+                        word_hits[neuron_id] = word_hits.get(neuron_id, 0.0) + weight
+            need = sum(weights.values()) * self.min_word_coverage
+            for neuron_id, value in word_hits.items():
+                if value >= need:
+                    hits[neuron_id] = hits.get(neuron_id, 0.0) + value
+                    if not weak:
+                        strong.add(neuron_id)
+        return {neuron_id: value for neuron_id, value in hits.items() if neuron_id in strong}
+
+    def _neuron_hit(self, index: TokenIndex, words: List[Tuple[bool, Dict[str, float]]], neuron_id: int) -> float:
+        """_field_hits와 같은 계산을 뉴런 하나에 대해"""
+        hit = 0.0
+        strong = False
+        for weak, weights in words:
+            value = 0.0
+            matched_anchor = False
+            for position, (gram, weight) in enumerate(weights.items()):
+                if _posting_index(index.postings.get(gram, []), neuron_id) >= 0:
+                    value += weight
+                    matched_anchor = matched_anchor or position == 0
+            if matched_anchor and value >= sum(weights.values()) * self.min_word_coverage:
+                hit += value
+                strong = strong or not weak
+        return hit if strong else 0.0
+
+    def iter_matches(self, query: str, min_score: float) -> Iterator[Tuple[int, float]]:
+        words, total_weight = self._query_words(query)
+        if not words or not self.num_docs:
+            return
+        content_hits = self._field_hits(self.content_index, words)
+        topic_hits = self._field_hits(self.topic_index, words)
+        for neuron_id in sorted(content_hits.keys() | topic_hits.keys()):
+            score = (content_hits.get(neuron_id, 0.0) * 0.7 +
+                     topic_hits.get(neuron_id, 0.0) * 0.3) / total_weight
+            if score > min_score:
+                yield neuron_id, score
+
+    def score_ids(self, query: str, neuron_ids: Iterable[int]) -> List[Tuple[int, float]]:
+        neuron_ids = list(neuron_ids)
+        words, total_weight = self._query_words(query)
+        if not words or not self.num_docs:
+            return [(neuron_id, 0.0) for neuron_id in neuron_ids]
+        results = []
+        for neuron_id in neuron_ids:
+            content_hit = self._neuron_hit(self.content_index, words, neuron_id)
+            topic_hit = self._neuron_hit(self.topic_index, words, neuron_id)
+            results.append((neuron_id, (content_hit * 0.7 + topic_hit * 0.3) / total_weight))
+        return results
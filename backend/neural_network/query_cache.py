@@ -0,0 +1,74 @@
+"""
+지식 검색 결과 캐시 - 같은 질문 반복 시 채점 생략 (LRU + 세대 무효화)
+"""
+
+import threading
+from collections import OrderedDict
+from typing import AbstractSet, Hashable, List, Optional, Tuple
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 질의 정규화 (소문자 + 공백 정리) - 채점기 토큰화 결과가 같은 질의끼리 묶임"""
+    return " ".join(query.lower().split())
+
+
+class QueryCache:
+    """(정규화 질의, 채점기 설정) → 상위 (뉴런ID, 점수) 목록
+
+    뉴런이 추가되면 invalidate_all()로 세대를 올려 전부 버리거나,
+    기존 점수가 변하지 않는 채점기라면 invalidate_tokens()로
+    새 뉴런과 토큰이 겹치는 질의만 버린다.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[AbstractSet[str], List[Tuple[int, float]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[List[Tuple[int, float]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, tokens: AbstractSet[str], results: List[Tuple[int, float]],
+            generation: int):
+        """조회 시작 시점의 세대가 그대로일 때만 저장 (도중에 뉴런이 추가됐으면 버림)"""
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (tokens, list(results))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def invalidate_tokens(self, tokens: AbstractSet[str]):
+        """토큰이 하나라도 겹치는 질의만 무효화"""
+        with self._lock:
+            self.generation += 1
+            stale = [key for key, (query_tokens, _) in self._entries.items()
+                     if not query_tokens.isdisjoint(tokens)]
+            for key in stale:
+                del self._entries[key]
+
+    def invalidate_all(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries),
+                'hit_rate': self.hits / total if total else 0.0}
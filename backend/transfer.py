@@ -0,0 +1,57 @@
+"""
+브레인/기억/대화 기록 NDJSON 내보내기·가져오기 - 호스트 간 이동용
+
+    cd backend
+    python transfer.py export brain brain.ndjson.gz
+    python transfer.py import brain brain.ndjson.gz --replace
+    python transfer.py export cortex cortex.ndjson
+    python transfer.py export conversations history.ndjson --backend sqlite
+
+레코드를 한 줄씩 읽고 쓰므로 파일 전체를 메모리에 올리지 않는다 (.gz면 gzip).
+가져오기는 서버를 멈춘 상태에서 실행해야 한다.
+"""
+
+import argparse
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(current_dir)
+
+
+def open_target(target: str, args):
+    if target == 'brain':
+        from neural_network.growing_network import NeuralBrain
+        return NeuralBrain(args.path) if args.path else NeuralBrain()
+    if target == 'cortex':
+        from alicia.neural_cortex import NeuralCortex
+        return NeuralCortex(args.path) if args.path else NeuralCortex()
+    from knowledge_base.database import create_database
+    return create_database(args.backend)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("target", choices=["brain", "cortex", "conversations"])
+    parser.add_argument("file", help="NDJSON 파일 (.gz면 gzip)")
+    parser.add_argument("--path", help="브레인/기억 저장 경로 (기본: 각 클래스의 기본 경로)")
+    parser.add_argument("--backend", help="대화 기록 백엔드 (sqlite / jsonl / json, 기본: KNOWLEDGE_DB_BACKEND)")
+    parser.add_argument("--replace", action="store_true", help="비어 있지 않은 브레인/기억을 교체")
+    args = parser.parse_args()
+
+    store = open_target(args.target, args)
+    try:
+        if args.command == "export":
+            store.export_ndjson(args.file)
+        elif args.target == "conversations":
+            store.import_ndjson(args.file)
+        else:
+            store.import_ndjson(args.file, replace=args.replace)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+원자적 체크포인트 + 그룹 커밋 로그
+
+    <path>        최신 체크포인트
+    <path>.prev   바로 앞 체크포인트 (최신이 손상되면 이것으로 복구)
+    <path>.tmp    쓰는 중인 파일 (fsync 후 <path>로 rename)
+
+체크포인트는 임시 파일에 다 쓰고 fsync한 뒤 rename하므로, 쓰는 도중 프로세스가
+죽어도 <path>는 예전 내용 전체이거나 새 내용 전체다. 읽을 때는 최근 저장 순으로
+하나씩 시도해 처음 온전한 것을 쓰고, 실패한 파일은 .corrupt-<시각>으로 옮겨
+다음 저장이 온전한 직전 체크포인트를 덮어쓰지 않게 한다. 복구 비용은 파일 두 개를
+읽는 것으로 끝난다.
+
+로그 기록은 한 줄씩 "<CRC32 16진수 8자리> <JSON>"으로 남겨 끊기거나 깨진 줄을 찾는다.
+"""
+
+import json
+import os
+import shutil
+import threading
+import zlib
+from datetime import datetime
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Sequence, Tuple
+
+PREVIOUS_SUFFIX = '.prev'
+TEMP_SUFFIX = '.tmp'
+
+
+def fsync_directory(directory: str):
+    """rename 결과를 디스크에 반영 (윈도우는 디렉토리를 열 수 없어 생략)"""
+    if os.name == 'nt':
+        return
+    fd = os.open(directory or '.', os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path: str, write: Callable[[BinaryIO], None], keep_previous: bool = True):
+    """write(f)로 임시 파일을 채우고 fsync 후 path로 교체 (기존 파일은 .prev로)"""
+    temp_path = path + TEMP_SUFFIX
+    try:
+        with open(temp_path, 'wb') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        if keep_previous and os.path.exists(path):
+            # 두 rename 사이에 죽으면 <path>가 없으므로 읽는 쪽이 .prev를 씀
+            os.replace(path, path + PREVIOUS_SUFFIX)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    fsync_directory(os.path.dirname(path))
+
+
+def atomic_write_json(path: str, data: Any, keep_previous: bool = True, **dump_kwargs):
+    """JSON 체크포인트 저장 - 형식은 기존 json.dump(indent=2)와 같음"""
+    text = json.dumps(data, ensure_ascii=False, indent=2, **dump_kwargs)
+    atomic_write(path, lambda f: f.write(text.encode('utf-8')), keep_previous)
+
+
+def checkpoint_candidates(paths: Sequence[str]) -> List[str]:
+    """각 경로와 그 .prev 중 있는 것을 최근 저장 순으로 (rename은 수정 시각을 유지)"""
+    found = [candidate for path in paths for candidate in (path, path + PREVIOUS_SUFFIX)
+             if os.path.exists(candidate)]
+    return sorted(found, key=os.path.getmtime, reverse=True)
+
+
+def quarantine(path: str) -> str:
+    """손상된 체크포인트를 지우지 않고 옆으로 치움"""
+    target = f"{path}.corrupt-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    os.replace(path, target)
+    return target
+
+
+def load_checkpoint(paths: Sequence[str], load: Callable[[str], Any]) -> Tuple[Any, Optional[str]]:
+    """최근 체크포인트부터 load(경로)를 시도 → (처음 성공한 결과, 그 경로) / 전부 실패하면 (None, None)
+
+    load는 실패할 때 예외를 내야 하고 호출한 쪽 상태를 건드리지 않아야 한다.
+    """
+    for candidate in checkpoint_candidates(paths):
+        try:
+            return load(candidate), candidate
+        except Exception as e:
+            print(f"⚠️ 체크포인트 손상: {candidate} ({e})")
+            try:
+                print(f"   ↪ {os.path.basename(quarantine(candidate))}로 옮기고 이전 체크포인트 시도")
+            except OSError as move_error:
+                print(f"   ↪ 옮기기 실패: {move_error}")
+    return None, None
+
+
+def encode_record(record: Dict) -> bytes:
+    """로그 한 줄 - CRC32 + JSON"""
+    body = json.dumps(record, ensure_ascii=False).encode('utf-8')
+    return b"%08x %s\n" % (zlib.crc32(body), body)
+
+
+def decode_record(line: bytes) -> Dict:
+    """로그 한 줄 해석 (체크섬 없는 예전 JSON 줄도 읽음) - 끊기거나 깨졌으면 ValueError"""
+    if not line.endswith(b"\n"):
+        raise ValueError("끊긴 기록")
+    line = line.rstrip(b"\r\n")
+    if line.startswith(b"{"):
+        return json.loads(line)
+    checksum, _, body = line.partition(b" ")
+    if len(checksum) != 8 or int(checksum, 16) != zlib.crc32(body):
+        raise ValueError("체크섬 불일치")
+    return json.loads(body)
+
+
+class GroupCommitLog:
+    """덧붙이기 전용 로그 + 그룹 커밋
+
+    submit()은 기록을 대기열에 넣고 번호만 돌려주며 (호출 순서 = 파일 순서),
+    commit(번호)은 그 번호까지 디스크에 내려갈 때까지 기다린다. 먼저 온 스레드가
+    쌓인 기록 전체를 한 번에 쓰고 fsync하므로, 한 fsync가 도는 동안 들어온 기록은
+    다음 fsync 한 번으로 묶인다.
+    """
+
+    def __init__(self, path: str, fsync: bool = True):
+        self.path = path
+        self.fsync = fsync
+        self._cond = threading.Condition()
+        self._pending: List[bytes] = []
+        self._submitted = 0
+        self._durable = 0
+        self._flushing = False
+        self.commits = 0  # 실제 쓰기(fsync) 횟수
+        self.records = 0  # 디스크에 내려간 기록 수
+
+    def submit(self, data: bytes) -> int:
+        with self._cond:
+            self._pending.append(data)
+            self._submitted += 1
+            return self._submitted
+
+    def commit(self, ticket: int):
+        """ticket 번호까지 fsync될 때까지 대기 (쓰기 실패는 예외로 전달)"""
+        with self._cond:
+            while self._durable < ticket:
+                if self._flushing:
+                    self._cond.wait()
+                    continue
+                batch, self._pending = self._pending, []
+                upto = self._submitted
+                self._flushing = True
+                self._cond.release()
+                try:
+                    self._write(batch)
+                except BaseException:
+                    self._cond.acquire()
+                    self._pending[:0] = batch
+                    self._flushing = False
+                    self._cond.notify_all()
+                    raise
+                self._cond.acquire()
+                self._durable = upto
+                self._flushing = False
+                self.commits += 1
+                self.records += len(batch)
+                self._cond.notify_all()
+
+    def _write(self, batch: List[bytes]):
+        with open(self.path, 'ab') as f:
+            f.write(b"".join(batch))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+    def flush(self):
+        """대기 중인 기록 전부 커밋"""
+        with self._cond:
+            ticket = self._submitted
+        self.commit(ticket)
+
+    def rotate(self, append: bool = False):
+        """대기 중인 기록을 내려쓴 뒤 현재 로그를 .prev로 넘김 (새 기록은 빈 파일부터)
+
+        append=True면 기존 .prev를 바꾸지 않고 뒤에 이어 붙인다.
+        호출하는 쪽이 submit()과 겹치지 않게 막아야 한다.
+        """
+        self.flush()
+        if not os.path.exists(self.path):
+            return
+        previous = self.path + PREVIOUS_SUFFIX
+        if append and os.path.exists(previous):
+            with open(self.path, 'rb') as source, open(previous, 'ab') as target:
+                shutil.copyfileobj(source, target)
+                target.flush()
+                os.fsync(target.fileno())
+            os.remove(self.path)
+        else:
+            os.replace(self.path, previous)
+        fsync_directory(os.path.dirname(self.path))
+
+    def get_status(self) -> Dict:
+        with self._cond:
+            return {'records': self.records, 'commits': self.commits,
+                    'pending': self._submitted - self._durable, 'fsync': self.fsync}
@@ -0,0 +1,12 @@
+"""
+프로세스와 무관하게 항상 같은 값을 내는 해시 (feature hashing용)
+
+파이썬 내장 hash()는 실행마다 salt가 바뀌어 저장된 벡터를 재사용할 수 없다.
+"""
+
+import zlib
+
+
+def stable_hash(text: str, seed: int = 0) -> int:
+    """고정 seed CRC32 해시 (0 ~ 2^32-1)"""
+    return zlib.crc32(text.encode('utf-8'), seed)
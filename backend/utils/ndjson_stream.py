@@ -0,0 +1,108 @@
+"""
+NDJSON 스트리밍 내보내기/가져오기 - 한 줄에 레코드 하나, 파일 전체를 메모리에 올리지 않음
+
+    {"type": "header", "kind": "brain", "version": 1, "exported_at": "...", "meta": {...}}
+    {"type": "neuron", "data": {...}}
+    ...
+    {"type": "end", "records": 1234}
+
+마지막 end 줄의 레코드 수로 전송 중 잘린 파일을 알아챈다. 경로가 .gz로 끝나면 gzip으로 읽고 쓴다.
+"""
+
+import gzip
+import json
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Tuple
+
+from .atomic_io import atomic_write
+
+FORMAT_VERSION = 1
+
+
+class StreamFormatError(ValueError):
+    """내보내기 파일이 아니거나 종류가 다르거나 잘린 파일"""
+
+
+def _line(record: Dict) -> bytes:
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def write_stream(path: str, kind: str, meta: Dict, records: Iterable[Tuple[str, Dict]]) -> int:
+    """(레코드 종류, 내용)을 한 줄씩 기록 → 레코드 수 (임시 파일에 다 쓴 뒤 rename)"""
+    count = 0
+
+    def write(f):
+        nonlocal count
+        out = gzip.GzipFile(fileobj=f, mode="wb") if path.endswith(".gz") else f
+        out.write(_line({"type": "header", "kind": kind, "version": FORMAT_VERSION,
+                         "exported_at": datetime.now().isoformat(), "meta": meta}))
+        for record_type, data in records:
+            out.write(_line({"type": record_type, "data": data}))
+            count += 1
+        out.write(_line({"type": "end", "records": count}))
+        if out is not f:
+            out.close()
+
+    atomic_write(path, write, keep_previous=False)
+    return count
+
+
+class StreamReader:
+    """내보내기 파일을 한 줄씩 읽음 - for record_type, data in reader
+
+    끝까지 읽었는데 end 줄이 없거나 레코드 수가 다르면 StreamFormatError.
+    """
+
+    def __init__(self, path: str, kind: str):
+        self.path = path
+        self._file = gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")
+        try:
+            header = self._read_header(kind)
+        except BaseException:
+            self._file.close()
+            raise
+        self.meta: Dict = header.get("meta", {})
+        self.exported_at = header.get("exported_at")
+
+    def _read_header(self, kind: str) -> Dict:
+        try:
+            header = json.loads(self._file.readline() or "null")
+        except (ValueError, OSError) as e:
+            raise StreamFormatError(f"헤더를 읽을 수 없음: {self.path} ({e})")
+        if not isinstance(header, dict) or header.get("type") != "header":
+            raise StreamFormatError(f"내보내기 파일이 아님: {self.path}")
+        if header.get("kind") != kind:
+            raise StreamFormatError(f"종류가 다름: {header.get('kind')} (필요: {kind})")
+        if header.get("version") != FORMAT_VERSION:
+            raise StreamFormatError(f"지원하지 않는 버전: {header.get('version')}")
+        return header
+
+    def __iter__(self) -> Iterator[Tuple[str, Dict]]:
+        count = 0
+        for number, line in enumerate(self._file, 2):
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                raise StreamFormatError(f"{number}번째 줄이 손상됨: {self.path}")
+            if record.get("type") == "end":
+                if record.get("records") != count:
+                    raise StreamFormatError(f"레코드 수가 다름: {count} (기록: {record.get('records')})")
+                return
+            count += 1
+            yield record["type"], record["data"]
+        raise StreamFormatError(f"파일이 중간에 끊김: {self.path} ({count}개까지 읽음)")
+
+    def verify(self) -> int:
+        """끝까지 읽어 온전한지만 확인 → 레코드 수 (되돌릴 수 없는 가져오기 전에)"""
+        return sum(1 for _ in self)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self) -> 'StreamReader':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
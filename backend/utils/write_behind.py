@@ -0,0 +1,120 @@
+"""
+지연 저장(write-behind) - 요청 경로에서 디스크 쓰기를 빼고 백그라운드에서 모아 저장
+
+구성요소는 변경 시 mark_dirty()만 부르고, 백그라운드 스레드가
+마지막 변경 후 debounce초 동안 조용하거나 첫 변경 후 max_latency초가
+지나면 등록된 저장 함수를 호출한다. 종료 시에는 stop()이 남은 것을 즉시 저장한다.
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class WriteBehindFlusher:
+    """이름별 저장 함수 + dirty 표시를 모아 백그라운드에서 저장"""
+
+    def __init__(self, debounce: Optional[float] = None, max_latency: Optional[float] = None):
+        self.debounce = debounce if debounce is not None else float(os.getenv('PERSIST_DEBOUNCE', '2.0'))
+        self.max_latency = (max_latency if max_latency is not None
+                            else float(os.getenv('PERSIST_MAX_LATENCY', '10.0')))
+        self._savers: Dict[str, Callable[[], None]] = {}
+        self._save_locks: Dict[str, threading.Lock] = {}
+        self._first_dirty: Dict[str, float] = {}
+        self._last_dirty: Dict[str, float] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.flushes = 0
+        self.failures = 0
+
+    def register(self, name: str, save_fn: Callable[[], None]):
+        """저장 함수 등록 (같은 이름이면 교체)"""
+        with self._cond:
+            self._savers[name] = save_fn
+            self._save_locks.setdefault(name, threading.Lock())
+
+    def mark_dirty(self, name: str):
+        """변경 표시 - 디스크 I/O 없이 바로 반환"""
+        now = time.monotonic()
+        with self._cond:
+            self._first_dirty.setdefault(name, now)
+            self._last_dirty[name] = now
+            self._cond.notify()
+
+    def pending(self) -> List[str]:
+        with self._cond:
+            return list(self._first_dirty)
+
+    def _due(self, now: float):
+        """지금 저장할 이름들과 다음 확인까지 대기 시간"""
+        due, wait = [], None
+        for name, first in self._first_dirty.items():
+            deadline = min(self._last_dirty[name] + self.debounce, first + self.max_latency)
+            if deadline <= now:
+                due.append(name)
+            else:
+                wait = deadline - now if wait is None else min(wait, deadline - now)
+        return due, wait
+
+    def flush(self, name: str):
+        """한 구성요소 즉시 저장 - 저장 중 들어온 변경은 다음 차례로 남긴다"""
+        with self._cond:
+            first = self._first_dirty.pop(name, None)
+            self._last_dirty.pop(name, None)
+            save_fn = self._savers.get(name)
+        if first is None or save_fn is None:
+            return
+        with self._save_locks[name]:
+            try:
+                save_fn()
+                self.flushes += 1
+            except Exception as e:
+                self.failures += 1
+                print(f"❌ 지연 저장 실패 ({name}): {e}")
+                with self._cond:
+                    # 처음 dirty 시각을 유지해 max_latency 안에 다시 시도
+                    self._first_dirty.setdefault(name, first)
+                    self._last_dirty.setdefault(name, time.monotonic())
+
+    def flush_all(self):
+        """dirty 표시된 것 전부 즉시 저장"""
+        for name in self.pending():
+            self.flush(name)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running:
+                    due, wait = self._due(time.monotonic())
+                    if due:
+                        break
+                    self._cond.wait(wait)
+                if not self._running:
+                    return
+            for name in due:
+                self.flush(name)
+
+    def start(self):
+        """백그라운드 저장 스레드 시작"""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """스레드 정지 후 남은 변경 전부 동기 저장 (종료 처리용)"""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        self.flush_all()
+
+    def get_status(self) -> Dict:
+        return {'pending': self.pending(), 'flushes': self.flushes, 'failures': self.failures,
+                'debounce': self.debounce, 'max_latency': self.max_latency}
@@ -0,0 +1,84 @@
+"""
+NeuralBrain 뉴런 삽입 비용 벤치마크 - 브레인 크기별 연결 생성 시간
+
+    python benchmarks/bench_brain_insert.py --sizes 500 1000 2000 4000 8000
+
+색인 기반 후보 채점(_find_connections)과 기존 전체 스캔 방식을
+같은 브레인, 같은 탐침(probe) 문서로 비교한다. 디스크 저장 비용은 제외.
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from neural_network.growing_network import KnowledgeNeuron, NeuralBrain
+
+
+def make_corpus(num_docs: int, vocab_size: int = 20000, seed: int = 42):
+    """Zipf 분포 어휘로 합성 문서 생성"""
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(vocab_size)]
+    weights = [1.0 / (rank + 1) for rank in range(vocab_size)]
+    topics = [f"topic{i}" for i in range(30)]
+    docs = []
+    for _ in range(num_docs):
+        length = rng.randint(20, 200)
+        docs.append((" ".join(rng.choices(vocab, weights, k=length)), rng.choice(topics)))
+    return docs
+
+
+def full_scan_connections(brain: NeuralBrain, content: str, topic: str):
+    """색인 도입 전 방식: 모든 기존 뉴런과 텍스트 유사도 계산"""
+    connections = []
+    for existing in brain.neurons.values():
+        content_sim = brain.calculate_similarity(content, existing.content)
+        topic_sim = 0.5 if topic == existing.topic else 0.0
+        total_sim = (content_sim * 0.7 + topic_sim * 0.3)
+        if total_sim > 0.2:
+            connections.append((existing.id, total_sim))
+    return connections
+
+
+def build_brain(docs) -> NeuralBrain:
+    storage = os.path.join(tempfile.mkdtemp(), "brain.json")
+    with redirect_stdout(io.StringIO()):
+        brain = NeuralBrain(storage)
+        brain._append_journal = lambda neuron: None
+        for content, topic in docs:
+            brain.create_neuron(content, topic)
+    return brain
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000, 4000])
+    parser.add_argument("--probes", type=int, default=100)
+    args = parser.parse_args()
+
+    probes = make_corpus(args.probes, seed=7)
+    print(f"{'neurons':>8} {'indexed ms/insert':>18} {'full scan ms/insert':>20} {'speedup':>8}")
+    for size in args.sizes:
+        brain = build_brain(make_corpus(size))
+        probe_neurons = [KnowledgeNeuron(brain.next_id, c, t) for c, t in probes]
+
+        start = time.perf_counter()
+        indexed = [brain._find_connections(n) for n in probe_neurons]
+        indexed_ms = (time.perf_counter() - start) * 1000 / len(probes)
+
+        start = time.perf_counter()
+        scanned = [full_scan_connections(brain, c, t) for c, t in probes]
+        scan_ms = (time.perf_counter() - start) * 1000 / len(probes)
+
+        assert indexed == scanned, "색인 결과가 전체 스캔과 다릅니다"
+        print(f"{size:>8} {indexed_ms:>18.3f} {scan_ms:>20.3f} {scan_ms / indexed_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
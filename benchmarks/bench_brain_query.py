@@ -0,0 +1,72 @@
+"""
+NeuralBrain 검색 지연 벤치마크 - BM25 전체 채점 vs MaxScore 가지치기
+
+    python benchmarks/bench_brain_query.py --sizes 10000 30000 100000
+
+브레인 크기별로 같은 질의 집합의 p50/p99 지연(ms)을 잰다.
+채점기만 따로 만들어 측정하므로 연결 생성/디스크 저장 비용은 없다.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from neural_network.growing_network import KnowledgeNeuron
+from neural_network.knowledge_scorer import BM25Scorer, KnowledgeScorer
+
+
+def zipf_sampler(vocab_size: int, seed: int):
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(vocab_size)]
+    cumulative = []
+    total = 0.0
+    for rank in range(vocab_size):
+        total += 1.0 / (rank + 1)
+        cumulative.append(total)
+    return lambda k: " ".join(rng.choices(vocab, cum_weights=cumulative, k=k)), rng
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def measure(search, queries):
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return percentile(latencies, 0.5), percentile(latencies, 0.99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 30000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=3)
+    args = parser.parse_args()
+
+    sample, rng = zipf_sampler(50000, seed=42)
+    topics = [f"topic{i}" for i in range(50)]
+    scorer = BM25Scorer()
+    query_sample, query_rng = zipf_sampler(50000, seed=7)
+    queries = [query_sample(query_rng.randint(2, 6)) for _ in range(args.queries)]
+
+    print(f"{'neurons':>8} {'full p50':>9} {'full p99':>9} {'maxscore p50':>13} {'maxscore p99':>13}")
+    next_id = 1
+    for size in sorted(args.sizes):
+        while next_id <= size:
+            scorer.add(KnowledgeNeuron(next_id, sample(rng.randint(10, 60)), rng.choice(topics)))
+            next_id += 1
+        full = measure(lambda q: KnowledgeScorer.top_k(scorer, q, args.top_k, 0.15), queries)
+        pruned = measure(lambda q: scorer.top_k(q, args.top_k, 0.15), queries)
+        print(f"{size:>8} {full[0]:>9.3f} {full[1]:>9.3f} {pruned[0]:>13.3f} {pruned[1]:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
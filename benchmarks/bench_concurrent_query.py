@@ -0,0 +1,103 @@
+"""
+동시 읽기/쓰기 점검 - 뉴런을 만드는 동안 잠금 없이 검색해도 예외가 없는지
+
+    python benchmarks/bench_concurrent_query.py --neurons 3000 --readers 3
+
+쓰기 스레드 하나가 create_neuron을 반복하는 동안 읽기 스레드들이
+query_knowledge와 query_many를 번갈아 부른다 (Flask 스레드 서버와 같은 상황).
+채점기별로 읽기 횟수와 예외를 세고, 예외가 하나라도 나면 종료 코드 1.
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from collections import Counter
+from contextlib import redirect_stdout
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from neural_network.growing_network import NeuralBrain
+from bench_brain_insert import make_corpus
+
+
+def run(scorer: str, docs, queries, num_readers: int, batch: int, seed: int):
+    """한 채점기로 동시 부하 실행 → (읽기 횟수, 예외 Counter, 첫 traceback들)"""
+    errors: Counter = Counter()
+    samples = []
+    reads = [0] * num_readers
+    done = threading.Event()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 검색 캐시와 ANN을 꺼서 채점기를 매번 직접 타게 하고, 쓰기가 fsync에 묶이지 않게 한다
+        os.environ['BRAIN_QUERY_CACHE'] = '0'
+        os.environ['BRAIN_JOURNAL_FSYNC'] = '0'
+        brain = NeuralBrain(os.path.join(tmp, 'neural_brain.json'), scorer=scorer, ann_threshold=0)
+
+        def writer():
+            try:
+                for content, topic in docs:
+                    brain.create_neuron(content, topic)
+            finally:
+                done.set()
+
+        def reader(slot: int):
+            rng = random.Random(seed + slot)
+            while not done.is_set():
+                try:
+                    if rng.random() < 0.5:
+                        brain.query_knowledge(rng.choice(queries))
+                    else:
+                        brain.query_many(rng.sample(queries, batch))
+                except Exception as e:
+                    errors[type(e).__name__] += 1
+                    if len(samples) < 3:
+                        samples.append(traceback.format_exc())
+                reads[slot] += 1
+
+        threads = [threading.Thread(target=reader, args=(i,)) for i in range(num_readers)]
+        threads.append(threading.Thread(target=writer))
+        with redirect_stdout(io.StringIO()):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        brain.content_store.close()
+    return sum(reads), errors, samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scorers", nargs="+", default=list(NeuralBrain.SCORERS))
+    parser.add_argument("--neurons", type=int, default=3000)
+    parser.add_argument("--readers", type=int, default=3)
+    parser.add_argument("--batch", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    docs = make_corpus(args.neurons, vocab_size=2000, seed=args.seed)
+    queries = [" ".join(content.split()[:5]) for content, _ in docs[:500]]
+
+    failed = False
+    print(f"뉴런 {args.neurons}개 생성 중 읽기 스레드 {args.readers}개")
+    print(f"{'scorer':>8} {'reads':>8} {'seconds':>8} {'errors':>8}")
+    for name in args.scorers:
+        start = time.perf_counter()
+        reads, errors, samples = run(name, docs, queries, args.readers, args.batch, args.seed)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>8} {reads:>8} {elapsed:>8.2f} {sum(errors.values()):>8}")
+        for error, count in errors.most_common():
+            print(f"         {error}: {count}")
+        for sample in samples:
+            print(sample)
+        failed = failed or bool(errors)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
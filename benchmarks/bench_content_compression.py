@@ -0,0 +1,82 @@
+"""
+뉴런 본문 압축 벤치마크 - 공유 사전 유무/방식별 디스크·메모리 절감
+
+    python benchmarks/bench_content_compression.py
+
+neural_brain.json의 본문을 레코드 단위로 압축해 크기를 비교한다.
+사전이 학습 데이터를 외워 버리는 효과를 빼기 위해 짝수/홀수 번째 뉴런으로
+나눠 한쪽으로 학습하고 다른 쪽을 압축한 결과(교차)도 함께 보여 준다.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import zlib
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+sys.path.append(BACKEND_DIR)
+
+from neural_network.content_codec import ZSTD_AVAILABLE, ContentCodec
+
+
+def record_size(codec, raw: bytes) -> int:
+    """저장소와 같은 규칙 - 압축이 더 크면 원문 그대로"""
+    if codec is None:
+        return len(raw)
+    return min(len(raw), len(codec.compress(raw)))
+
+
+class PlainDeflate:
+    """사전 없는 raw deflate (비교 기준)"""
+
+    def compress(self, data: bytes) -> bytes:
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+        return compressor.compress(data) + compressor.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--brain", default=os.path.join(BACKEND_DIR, "data/knowledge/neural_brain.json"))
+    args = parser.parse_args()
+
+    with open(args.brain, 'r', encoding='utf-8') as f:
+        texts = [n['content'] for n in json.load(f).get('neurons', [])]
+    raw = [text.encode('utf-8') for text in texts]
+    total = sum(len(item) for item in raw)
+    halves = (texts[0::2], texts[1::2])
+    raw_halves = (raw[0::2], raw[1::2])
+
+    methods = ['zlib'] + (['zstd'] if ZSTD_AVAILABLE else [])
+    print(f"뉴런 {len(texts)}개, 본문 {total / 1024:.1f}KB (UTF-8)")
+    print(f"{'method':>12} {'dict KB':>8} {'stored KB':>10} {'ratio':>6} {'cross':>6} {'read us':>8}")
+    print(f"{'raw':>12} {0:>8.1f} {total / 1024:>10.1f} {1:>6.2f} {1:>6.2f} {'-':>8}")
+    plain = sum(record_size(PlainDeflate(), item) for item in raw)
+    print(f"{'deflate':>12} {0:>8.1f} {plain / 1024:>10.1f} {total / plain:>6.2f} {total / plain:>6.2f} {'-':>8}")
+
+    for method in methods:
+        codec = ContentCodec.train(method, texts)
+        packed = [codec.compress(item) for item in raw]
+        stored = sum(min(len(a), len(b)) for a, b in zip(raw, packed))
+        # 교차: 절반으로 학습한 사전으로 나머지 절반 압축
+        cross = 0
+        for train, test in ((0, 1), (1, 0)):
+            half_codec = ContentCodec.train(method, halves[train])
+            cross += sum(record_size(half_codec, item) for item in raw_halves[test])
+        start = time.perf_counter()
+        for item in packed:
+            codec.decompress(item)
+        read_us = (time.perf_counter() - start) / len(packed) * 1e6
+        print(f"{method + '+dict':>12} {len(codec.dictionary) / 1024:>8.1f} {stored / 1024:>10.1f} "
+              f"{total / stored:>6.2f} {total / cross:>6.2f} {read_us:>8.1f}")
+
+    # 메모리: JSON 로드 시에는 본문 str이 전부 상주, 저장소 사용 시에는 (위치, 길이, 코덱)만
+    resident = sum(sys.getsizeof(text) for text in texts)
+    refs = sum(sys.getsizeof((0, len(item), 1)) for item in raw)
+    print(f"\n상주 메모리: 본문 str {resident / 1024:.1f}KB → 저장소 참조 {refs / 1024:.1f}KB "
+          f"(해제는 반환된 뉴런을 렌더링할 때만)")
+
+
+if __name__ == "__main__":
+    main()
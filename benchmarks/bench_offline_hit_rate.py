@@ -0,0 +1,82 @@
+"""
+오프라인 적중률 벤치마크 - 채점기별 get_direct_answer 적중률과 검색 지연
+
+    python benchmarks/bench_offline_hit_rate.py
+
+database.json에 쌓인 실제 사용자 질문을 neural_brain.json에 던져
+신뢰도 0.3을 넘어 LLM 호출 없이 답한 비율을 채점기별로 비교한다.
+offline_hit_labels.json에 질문별로 답해도 되는 뉴런 주제를 손으로 적어 두었고
+(빈 목록 = 브레인에 답이 없음), 다른 주제의 뉴런으로 답하면 적중이 아니라 오답으로 센다.
+원본 파일은 건드리지 않도록 임시 복사본으로 측정한다.
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+sys.path.append(BACKEND_DIR)
+
+from neural_network.growing_network import NeuralBrain
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--brain", default=os.path.join(BACKEND_DIR, "data/knowledge/neural_brain.json"))
+    parser.add_argument("--database", default=os.path.join(BACKEND_DIR, "data/knowledge/database.json"))
+    parser.add_argument("--labels", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                         "offline_hit_labels.json"))
+    parser.add_argument("--scorers", nargs="+", default=list(NeuralBrain.SCORERS))
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with open(args.database, 'r', encoding='utf-8') as f:
+        questions = [c['user_input'] for c in json.load(f).get('conversations', [])]
+    with open(args.labels, 'r', encoding='utf-8') as f:
+        labels = json.load(f)
+    unlabeled = sorted({q for q in questions if q not in labels})
+    if unlabeled:
+        parser.error(f"라벨 없는 질문 {len(unlabeled)}개: {unlabeled[:3]}")
+
+    storage = os.path.join(tempfile.mkdtemp(), "neural_brain.json")
+    shutil.copy(args.brain, storage)
+
+    print(f"질문 {len(questions)}개")
+    print(f"{'scorer':>8} {'offline hits':>13} {'wrong':>6} {'hit rate':>9} {'precision':>10} "
+          f"{'p50 ms':>8} {'p99 ms':>8}")
+    for name in args.scorers:
+        hits = wrong = 0
+        with redirect_stdout(io.StringIO()):
+            brain = NeuralBrain(storage, scorer=name)
+            for q in questions:
+                # get_direct_answer와 같은 기준 - 1위 뉴런 점수가 0.3을 넘으면 그 뉴런으로 답함
+                matches = brain.query_knowledge(q, top_k=3)
+                if not matches or matches[0][1] <= 0.3:
+                    continue
+                if matches[0][0].topic in labels[q]:
+                    hits += 1
+                else:
+                    wrong += 1
+
+        latencies = []
+        for _ in range(args.repeat):
+            for q in questions:
+                start = time.perf_counter()
+                brain.scorer.top_k(q, 3, 0.15)
+                latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2]
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        precision = hits / (hits + wrong) if hits + wrong else 1.0
+        print(f"{name:>8} {hits:>13} {wrong:>6} {hits / len(questions):>8.1%} {precision:>9.1%} "
+              f"{p50:>8.3f} {p99:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+일괄 검색 벤치마크 - 질의별 top_k 반복 vs top_k_many 한 번
+
+    python benchmarks/bench_query_many.py --queries 5000
+
+database.json의 사용자 질문을 지정 개수만큼 반복해 회귀 질의 집합을 만들고
+채점기별로 두 경로의 전체 시간과 결과 일치 여부를 잰다.
+질의 캐시를 거치지 않도록 채점기를 직접 호출한다.
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+sys.path.append(BACKEND_DIR)
+
+from neural_network.growing_network import NeuralBrain
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--brain", default=os.path.join(BACKEND_DIR, "data/knowledge/neural_brain.json"))
+    parser.add_argument("--database", default=os.path.join(BACKEND_DIR, "data/knowledge/database.json"))
+    parser.add_argument("--scorers", nargs="+", default=list(NeuralBrain.SCORERS))
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--top-k", type=int, default=3)
+    args = parser.parse_args()
+
+    with open(args.database, 'r', encoding='utf-8') as f:
+        questions = [c['user_input'] for c in json.load(f).get('conversations', [])]
+    queries = [questions[i % len(questions)] for i in range(args.queries)]
+
+    print(f"질의 {len(queries)}개")
+    print(f"{'scorer':>8} {'loop s':>8} {'batch s':>8} {'speedup':>8} {'same':>5}")
+    for name in args.scorers:
+        with redirect_stdout(io.StringIO()):
+            # 원본을 덮어쓰지 않도록 저장 없이 로드만 한다
+            scorer = NeuralBrain(args.brain, scorer=name).scorer
+
+        start = time.perf_counter()
+        looped = [scorer.top_k(q, args.top_k, 0.15) for q in queries]
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batched = scorer.top_k_many(queries, args.top_k, 0.15)
+        batch_time = time.perf_counter() - start
+
+        print(f"{name:>8} {loop_time:>8.3f} {batch_time:>8.3f} "
+              f"{loop_time / batch_time:>7.1f}x {str(looped == batched):>5}")
+
+
+if __name__ == "__main__":
+    main()